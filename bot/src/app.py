@@ -3,20 +3,37 @@ import datetime
 
 from aiogram import Bot, Dispatcher
 from aiogram.exceptions import TelegramConflictError, TelegramNetworkError
-from aiogram.fsm.storage.memory import MemoryStorage
 
+from bot.core.cache_settings import create_fsm_storage
 from bot.core.errors import error_router
+from bot.core.history_writer import history_writer
 from bot.core.middlewares import RetryMiddleware, SaveUserHistoryMiddleware
+from bot.crud.cache_methods import lookup_registry
 from bot.scenes.help_info import help_info_router
 from bot.scenes.main import main_router
+from db.core import async_session
 from logs.config import bot_logger
 from settings import settings
 
-dp = Dispatcher(storage=MemoryStorage())
+dp = Dispatcher(storage=create_fsm_storage())
 dp.update.middleware(RetryMiddleware())
 dp.update.middleware(SaveUserHistoryMiddleware())
 
 
+@dp.startup()
+async def on_startup() -> None:
+    """Загружает справочники и запускает запись истории."""
+    async with async_session() as session:
+        await lookup_registry.load(session)
+    history_writer.start()
+
+
+@dp.shutdown()
+async def on_shutdown() -> None:
+    """Дописывает историю перед остановкой."""
+    await history_writer.close()
+
+
 @bot_logger.catch()
 async def main() -> None:
     bot = Bot(token=settings.telegram_token)
@@ -1,24 +1,62 @@
-from redis.asyncio import Redis
+import json
+from functools import partial
+
+from aiogram.fsm.storage.base import BaseStorage, DefaultKeyBuilder
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.fsm.storage.redis import RedisStorage
+from redis.asyncio import BlockingConnectionPool, Redis
 from redis.exceptions import (
     ConnectionError,
     RedisError,
     TimeoutError,
 )
 
+from bot.enums.setting_enums import RedisSettings
 from logs.config import bot_logger
 from settings import settings
 
 
 def create_redis() -> Redis:
+    """Клиент Redis бота поверх общего пула соединений.
+    Пул делят FSM-хранилище сцен и кэши. Когда все соединения заняты,
+    запрос ждёт свободное до POOL_TIMEOUT секунд, а не падает сразу.
+    """
     try:
-        return Redis(
+        pool = BlockingConnectionPool(
             host=settings.get_redis_host,
             port=settings.redis_port,
+            db=settings.redis_bot_db,
+            max_connections=RedisSettings.MAX_CONNECTIONS.value,
+            timeout=RedisSettings.POOL_TIMEOUT.value,
             decode_responses=True,
         )
+        return Redis(connection_pool=pool)
     except (ConnectionError, TimeoutError, RedisError) as e:
         bot_logger.error(f'Ошибка подключения к Redis: {str(e)}')
         return None
 
 
 redis_client = create_redis()
+
+
+def create_fsm_storage() -> BaseStorage:
+    """FSM-хранилище Dispatcher.
+    При FSM_REDIS_STORAGE состояния сцен хранятся в Redis с TTL,
+    что позволяет запускать несколько реплик бота и переживать
+    перезапуск. with_destiny разделяет ключи состояния сцены и
+    истории сцен. Данные сцен сериализуются в компактный JSON.
+    """
+    if not settings.fsm_redis_storage or redis_client is None:
+        return MemoryStorage()
+    return RedisStorage(
+        redis=redis_client,
+        key_builder=DefaultKeyBuilder(with_destiny=True),
+        state_ttl=RedisSettings.FSM_STATE_TTL.value,
+        data_ttl=RedisSettings.FSM_DATA_TTL.value,
+        json_dumps=partial(
+            json.dumps,
+            ensure_ascii=False,
+            separators=(',', ':'),
+        ),
+        json_loads=json.loads,
+    )
@@ -0,0 +1,335 @@
+import asyncio
+import json
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+import aiofiles
+import aiofiles.os
+from aiogram.types import Message
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.crud.cache_methods import user_identity_cache
+from bot.crud.user import user_crud
+from bot.enums.setting_enums import HistoryWriterSettings
+from db.core import async_session
+from db.models.models import UserHistory, UserProfile
+from logs.config import bot_logger
+from settings import HISTORY_DEAD_LETTER_PATH, HISTORY_SPILL_PATH
+
+EVENT_FIELDS = (
+    'telegram_id',
+    'chat_id',
+    'message_id',
+    'message_content',
+    'state',
+    'created_at',
+)
+
+
+@dataclass
+class HistoryWriter:
+    """Фоновая пакетная запись истории действий пользователей.
+
+    Middleware только кладёт событие в ограниченную очередь, фоновая
+    задача пишет события в user_history одним INSERT на пакет:
+    каждые batch_size событий или flush_interval_ms миллисекунд.
+    user_id по telegram_id берётся из user_identity_cache, промахи
+    добираются одним запросом на пакет.
+
+    Если очередь переполнена или запись пакета в БД упала, события
+    повторяются по одному, а не записанные дописываются в spill_path
+    и повторно записываются после следующей успешной записи пакета.
+    События, не записанные max_replays раз, и битые строки spill-файла
+    уходят в dead_letter_path. Ошибки фонового цикла логируются,
+    цикл продолжает работу.
+    """
+
+    queue_size: int = HistoryWriterSettings.QUEUE_SIZE.value
+    batch_size: int = HistoryWriterSettings.BATCH_SIZE.value
+    flush_interval_ms: int = HistoryWriterSettings.FLUSH_INTERVAL_MS.value
+    max_replays: int = HistoryWriterSettings.MAX_REPLAYS.value
+    error_delay_ms: int = HistoryWriterSettings.ERROR_DELAY_MS.value
+    spill_path: Path = HISTORY_SPILL_PATH
+    dead_letter_path: Path = HISTORY_DEAD_LETTER_PATH
+    queue: asyncio.Queue = None
+    pending: list[dict] = field(default_factory=list)
+    task: asyncio.Task = None
+    spill_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    def __post_init__(self) -> None:
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+
+    @staticmethod
+    def build_event(message: Message, state: str | None) -> dict:
+        """Событие истории из сообщения."""
+        return dict(
+            telegram_id=str(message.from_user.id),
+            chat_id=message.chat.id,
+            message_id=message.message_id,
+            message_content=message.text,
+            state=state,
+            created_at=datetime.now().isoformat(),
+        )
+
+    async def submit(self, message: Message, state: str | None = '') -> None:
+        """Ставит событие в очередь без ожидания БД."""
+        event = self.build_event(message, state)
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            await self.spill([event])
+
+    async def append_lines(self, path: Path, lines: list[str]) -> None:
+        """Дописывает строки в файл под блокировкой."""
+        async with self.spill_lock:
+            await aiofiles.os.makedirs(path.parent, exist_ok=True)
+            async with aiofiles.open(path, 'a', encoding='utf-8') as file:
+                await file.write(''.join(lines))
+
+    async def spill(
+            self,
+            events: list[dict],
+            path: Path | None = None,
+    ) -> None:
+        """Дописывает события в spill-файл или в path."""
+        if not events:
+            return
+        path = path or self.spill_path
+        try:
+            await self.append_lines(path, [
+                json.dumps(event, ensure_ascii=False) + '\n'
+                for event in events
+            ])
+        except OSError as e:
+            bot_logger.critical(
+                f'{e.__class__.__name__} !ERROR! история потеряна '
+                f'({len(events)} событий): {str(e)}',
+            )
+        else:
+            bot_logger.warning(
+                f'История отложена на диск ({path.name}): '
+                f'{len(events)} событий.',
+            )
+
+    @staticmethod
+    async def resolve_user_ids(
+            session: AsyncSession,
+            telegram_ids: set[str],
+    ) -> dict[str, int]:
+        """Добирает отсутствующие в кэше user_id одним запросом,
+        новых пользователей создаёт.
+        """
+        user_ids = {}
+        for telegram_id in telegram_ids:
+            user_id = user_identity_cache.get(telegram_id)
+            if user_id is not None:
+                user_ids[telegram_id] = user_id
+        missing = telegram_ids - user_ids.keys()
+        if missing:
+            result = await session.execute(
+                select(UserProfile).where(
+                    UserProfile.telegram_id.in_(missing),
+                ),
+            )
+            for user in result.scalars().all():
+                user_identity_cache.remember(session, user)
+                user_ids[user.telegram_id] = user.id
+        for telegram_id in telegram_ids - user_ids.keys():
+            user = await user_crud.get_or_create_user(session, telegram_id)
+            user_ids[telegram_id] = user.id
+        return user_ids
+
+    async def write_batch(self, events: list[dict]) -> None:
+        """Записывает пакет событий одной транзакцией."""
+        async with async_session() as session:
+            user_ids = await self.resolve_user_ids(
+                session,
+                {event['telegram_id'] for event in events},
+            )
+            rows = [
+                dict(
+                    user_id=user_ids[event['telegram_id']],
+                    chat_id=event['chat_id'],
+                    message_id=event['message_id'],
+                    message_content=event['message_content'],
+                    state=event['state'],
+                    created_at=datetime.fromisoformat(event['created_at']),
+                )
+                for event in events
+            ]
+            await session.execute(insert(UserHistory), rows)
+            await session.commit()
+
+    async def retry_one_by_one(self, events: list[dict]) -> list[dict]:
+        """Пишет события пакета по одному, возвращает не записанные."""
+        failed = []
+        for event in events:
+            try:
+                await self.write_batch([event])
+            except Exception:
+                failed.append(event)
+        return failed
+
+    async def flush(self, events: list[dict]) -> bool:
+        """Пишет пакет; при ошибке повторяет события по одному.
+        Не записанные события откладываются на диск, после max_replays
+        неудачных попыток — в dead-letter файл.
+        Возвращает True, если записаны все события.
+        """
+        if not events:
+            return True
+        try:
+            await self.write_batch(events)
+        except Exception as e:
+            bot_logger.critical(
+                f'{e.__class__.__name__} !ERROR! save user\'s history: '
+                f'{str(e)}',
+            )
+        else:
+            return True
+        for telegram_id in {event['telegram_id'] for event in events}:
+            user_identity_cache.invalidate(telegram_id)
+        failed = await self.retry_one_by_one(events)
+        for event in failed:
+            event['replays'] = event.get('replays', 0) + 1
+        await self.spill([
+            event for event in failed
+            if event['replays'] < self.max_replays
+        ])
+        await self.spill(
+            [
+                event for event in failed
+                if event['replays'] >= self.max_replays
+            ],
+            self.dead_letter_path,
+        )
+        return not failed
+
+    @staticmethod
+    def parse_spill_line(line: str) -> dict | None:
+        """Событие из строки spill-файла или None, если строка битая."""
+        try:
+            event = json.loads(line)
+        except ValueError:
+            return None
+        if not isinstance(event, dict) or any(
+            name not in event for name in EVENT_FIELDS
+        ):
+            return None
+        return event
+
+    async def take_spill(self) -> Path | None:
+        """Переименовывает spill-файл для повторной записи.
+        Файл, оставшийся от прерванного повтора, берётся первым.
+        """
+        replay_path = self.spill_path.with_suffix('.replay')
+        async with self.spill_lock:
+            if await aiofiles.os.path.exists(replay_path):
+                return replay_path
+            if not await aiofiles.os.path.exists(self.spill_path):
+                return None
+            await aiofiles.os.replace(self.spill_path, replay_path)
+        return replay_path
+
+    async def replay_spill(self) -> None:
+        """Переносит отложенные на диск события в БД пакетами.
+        Строки разбираются по одной, битые уходят в dead-letter файл.
+        """
+        replay_path = await self.take_spill()
+        if replay_path is None:
+            return
+        events, bad_lines = [], []
+        async with aiofiles.open(replay_path, encoding='utf-8') as file:
+            async for line in file:
+                if not line.strip():
+                    continue
+                event = self.parse_spill_line(line)
+                if event is None:
+                    bad_lines.append(line.rstrip('\n') + '\n')
+                else:
+                    events.append(event)
+        if bad_lines:
+            bot_logger.error(
+                f'Битые строки отложенной истории: {len(bad_lines)}, '
+                f'перенесены в {self.dead_letter_path.name}.',
+            )
+            await self.append_lines(self.dead_letter_path, bad_lines)
+        await aiofiles.os.remove(replay_path)
+        bot_logger.info(f'Повторная запись истории: {len(events)} событий.')
+        for start in range(0, len(events), self.batch_size):
+            batch = events[start:start + self.batch_size]
+            if not await self.flush(batch):
+                await self.spill(events[start + self.batch_size:])
+                return
+
+    async def collect_batch(self) -> None:
+        """Ждёт первое событие и добирает в self.pending пакет
+        до batch_size или до истечения flush_interval_ms.
+        """
+        self.pending.append(await self.queue.get())
+        deadline = time.monotonic() + self.flush_interval_ms / 1000
+        while len(self.pending) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                self.pending.append(
+                    await asyncio.wait_for(self.queue.get(), timeout),
+                )
+            except asyncio.TimeoutError:
+                break
+
+    def drain_queue(self) -> list[dict]:
+        """Забирает все события из очереди без ожидания."""
+        events = []
+        while not self.queue.empty():
+            events.append(self.queue.get_nowait())
+        return events
+
+    async def write_pending(self) -> None:
+        """Один шаг цикла: собрать пакет, записать, повторить отложенное."""
+        await self.collect_batch()
+        is_written = await self.flush(self.pending)
+        self.pending = []
+        if is_written and self.queue.empty():
+            await self.replay_spill()
+
+    async def supervised(self, step: Callable[[], Awaitable[None]]) -> None:
+        """Выполняет шаг цикла; ошибка логируется, цикл не останавливается."""
+        try:
+            await step()
+        except Exception as e:
+            bot_logger.critical(
+                f'{e.__class__.__name__} !ERROR! фоновая запись истории: '
+                f'{str(e)}',
+            )
+            await asyncio.sleep(self.error_delay_ms / 1000)
+
+    async def run(self) -> None:
+        """Повторяет отложенное и пишет очередь до остановки."""
+        await self.supervised(self.replay_spill)
+        while True:
+            await self.supervised(self.write_pending)
+
+    def start(self) -> None:
+        """Запускает фоновую задачу, если она не запущена."""
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+
+    async def close(self) -> None:
+        """Останавливает фоновую задачу и дописывает остаток очереди."""
+        if self.task is not None:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+        events = self.pending + self.drain_queue()
+        self.pending = []
+        for start in range(0, len(events), self.batch_size):
+            await self.flush(events[start:start + self.batch_size])
+
+
+history_writer = HistoryWriter()
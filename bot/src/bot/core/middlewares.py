@@ -6,8 +6,7 @@ from aiogram.exceptions import TelegramNetworkError, TelegramRetryAfter
 from aiogram.types import Update
 from typing_extensions import Awaitable
 
-from bot.crud.user_history import user_history_crud
-from db.core import async_session
+from bot.core.history_writer import history_writer
 from logs.config import bot_logger
 
 
@@ -28,9 +27,10 @@ class SaveUserHistoryMiddleware(CustomBaseMiddleware):
     """Middleware для автоматического сохранения истории действий пользователя в дб.
 
     Описание:
-        - Каждый раз при обработке события (сообщения пользователя) сохраняет
+        - Каждый раз при обработке события (сообщения пользователя) ставит
         ключевую информацию (user_id, chat_id, message_id, текст сообщения,
-        состояние пользователя) в таблицу истории.
+        состояние пользователя) в очередь history_writer, который пишет
+        историю в БД пакетами в фоне.
         - В случае возникновения ошибок сохраняет подробное сообщение
         в лог (уровень CRITICAL), не прерывая обработку запроса.
 
@@ -62,13 +62,7 @@ class SaveUserHistoryMiddleware(CustomBaseMiddleware):
             data_state = data.get('state', '')
             user_state = await data_state.get_state()  # noqa
             if from_user and message:
-                async with async_session() as session:
-                    await user_history_crud.write_history(
-                        session=session,
-                        message=message,
-                        state=user_state,
-                    )
-                    await session.commit()
+                await history_writer.submit(message, user_state)
         except Exception as e:
             bot_logger.critical(
                 f'{e.__class__.__name__} !ERROR! save user\'s history: {str(e)}',
@@ -11,13 +11,7 @@ from bot.crud.user import user_crud
 from bot.crud.utility import utility_crud
 from bot.enums.setting_enums import Status
 from bot.enums.utility_enums import UtilityName
-from db.models.models import (
-    City,
-    StatusType,
-    UserAccount,
-    UserProfile,
-    UtilityType,
-)
+from db.models.models import UserAccount, UserProfile
 from settings import DEFAULT_UTILITIES
 
 
@@ -29,20 +23,16 @@ class CRUDUserAccount(CRUDBase):
             utility: UtilityName,
     ) -> Optional[UserAccount]:
         """Получение счета пользователя по utility_name и telegram_id."""
-        user: UserProfile = await user_crud.get_user_by_tg_id(
-            session, telegram_id,
-        )
-        utility_obj: UtilityType = await utility_crud.get_utility_by_name(
-            session, utility,
-        )
-        if not user or not utility_obj:
+        user_id = await user_crud.get_user_id(session, telegram_id)
+        utility_id = await utility_crud.get_id_by_name(session, utility)
+        if not user_id or not utility_id:
             return None
         user_id_field = getattr(self.model, 'user_id')
         utility_type_id_field = getattr(self.model, 'utility_type_id')
         account = await session.execute(
             select(self.model).where(
-                (user_id_field == user.id) &
-                (utility_type_id_field == utility_obj.id),
+                (user_id_field == user_id) &
+                (utility_type_id_field == utility_id),
             ),
         )
         return account.scalars().first()
@@ -65,14 +55,10 @@ class CRUDUserAccount(CRUDBase):
         user_obj: UserProfile = await user_crud.get_or_create_user(
             session, telegram_id,
         )
-        utility_obj: UtilityType = await utility_crud.get_or_create_utility(
-            session, utility_name,
-        )
-        status_obj: StatusType = await status_crud.get_or_create_status(
-            session, account_status,
-        )
-        city_obj: City = await city_crud.get_or_create_city(
-            session, city_name,
+        utility_id = await utility_crud.get_or_create_id(utility_name)
+        status_id = await status_crud.get_or_create_id(account_status)
+        city_id = (
+            await city_crud.get_or_create_id(city_name) if city_name else None
         )
         return await self.create(
             session,
@@ -80,13 +66,13 @@ class CRUDUserAccount(CRUDBase):
                 user_id=user_obj.id,
                 account=account,
                 account_info=account_info,
-                utility_type_id=utility_obj.id,
-                city_id=city_obj.id,
+                utility_type_id=utility_id,
+                city_id=city_id,
                 address=address,
                 traffic=traffic,
                 credit=credit,
                 debit=debit,
-                status_id=status_obj.id,
+                status_id=status_id,
             ),
         )
 
@@ -101,13 +87,11 @@ class CRUDUserAccount(CRUDBase):
         """
         account_objects = []
         for utility_name in default_utilities:
-            utility_obj: UtilityType = await utility_crud.get_or_create_utility(
-                session,
-                utility_name,
-            )
             account_objects.append(self.model(
                 user_id=user_id,
-                utility_type_id=utility_obj.id,
+                utility_type_id=await utility_crud.get_or_create_id(
+                    utility_name,
+                ),
             ))
         session.add_all(account_objects)
         return account_objects
@@ -135,13 +119,11 @@ class CRUDUserAccount(CRUDBase):
             telegram_id: str,
     ) -> list[UserAccount]:
         """Получение всех счетов пользователя по telegram_id."""
-        user: UserProfile = await user_crud.get_user_by_tg_id(
-            session, telegram_id,
-        )
-        if not user:
+        user_id = await user_crud.get_user_id(session, telegram_id)
+        if not user_id:
             return []
         result = await session.execute(
-            select(self.model).where(self.model.user_id == user.id),
+            select(self.model).where(self.model.user_id == user_id),
         )
         return result.scalars().all()
 
@@ -4,6 +4,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from bot.core.handle_errors import handle_db_errors
+from bot.crud.cache_methods import lookup_registry
 from db.core import Base
 
 ModelType = TypeVar('ModelType', bound=Base)
@@ -117,3 +118,51 @@ class CRUDBase(Generic[ModelType]):
         if db_obj:
             await session.delete(db_obj)
             await session.flush()
+
+
+class CRUDLookup(CRUDBase):
+    """Базовый класс справочников с NameMixin.
+    id по имени берутся из lookup_registry без запроса в БД.
+    """
+
+    async def get_id_by_name(
+            self,
+            session: AsyncSession,
+            name: str,
+    ) -> Optional[int]:
+        """Получение id объекта по имени."""
+        return await lookup_registry.read_id(session, self.model, name)
+
+    async def get_or_create_id(self, name: str) -> int:
+        """Получение id объекта по имени, если obj=None => создает."""
+        return await lookup_registry.get_or_create_id(self.model, name)
+
+    async def get_name_by_id(
+            self,
+            session: AsyncSession,
+            obj_id: Optional[int],
+    ) -> Optional[str]:
+        """Получение имени объекта по id, промах читается из БД."""
+        return await lookup_registry.read_name(session, self.model, obj_id)
+
+    async def get_by_name(
+            self,
+            session: AsyncSession,
+            name: str,
+    ) -> Optional[ModelType]:
+        """Получение объекта по имени."""
+        obj_id = await self.get_id_by_name(session, name)
+        if obj_id is None:
+            return None
+        return await self.get_by_id(session, obj_id)
+
+    async def get_or_create_by_name(
+            self,
+            session: AsyncSession,
+            name: str,
+    ) -> ModelType:
+        """Получение объекта по имени, если obj=None => создает."""
+        return await self.get_by_id(
+            session,
+            await self.get_or_create_id(name),
+        )
@@ -0,0 +1,208 @@
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from sqlalchemy import event, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from bot.enums.setting_enums import UserCacheSettings
+from db.core import async_session
+from db.models.models import (
+    City,
+    EndNoticeInterval,
+    NoticeType,
+    StartNoticeInterval,
+    StatusType,
+    UserProfile,
+    UtilityType,
+)
+from logs.config import bot_logger
+
+# Ключ session.info с telegram_id пользователей, созданных в ещё
+# не закоммиченной транзакции сессии.
+PENDING_USERS_KEY = 'pending_user_identities'
+
+
+@dataclass
+class UserIdentityCache:
+    """LRU-кэш telegram_id → id пользователя в памяти процесса.
+
+    Хранит только неизменяемую связку telegram_id → id, поэтому
+    обновления профиля кэш не затрагивают, а общий уровень в Redis
+    не нужен. Записи живут ttl секунд и сбрасываются при удалении
+    пользователя. Созданный пользователь попадает в кэш только после
+    успешного commit, чтобы откат не оставил в кэше несуществующий id.
+    """
+
+    size: int = UserCacheSettings.SIZE.value
+    ttl: int = UserCacheSettings.TTL.value
+    entries: OrderedDict = field(default_factory=OrderedDict)
+
+    def get(self, telegram_id: str) -> int | None:
+        """Id пользователя по telegram_id или None при промахе."""
+        telegram_id = str(telegram_id)
+        entry = self.entries.get(telegram_id)
+        if entry is None:
+            return None
+        user_id, expires_at = entry
+        if expires_at < time.monotonic():
+            del self.entries[telegram_id]
+            return None
+        self.entries.move_to_end(telegram_id)
+        return user_id
+
+    def set(self, telegram_id: str, user_id: int) -> None:
+        """Запоминает id пользователя на ttl секунд."""
+        telegram_id = str(telegram_id)
+        self.entries[telegram_id] = (user_id, time.monotonic() + self.ttl)
+        self.entries.move_to_end(telegram_id)
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+    def remember(self, session: AsyncSession, user: UserProfile) -> None:
+        """Кладёт в кэш пользователя, прочитанного из БД.
+        Пользователь, созданный в незакоммиченной транзакции сессии,
+        попадёт в кэш после commit через remember_after_commit.
+        """
+        telegram_id = str(user.telegram_id)
+        if telegram_id in session.info.get(PENDING_USERS_KEY, ()):
+            return
+        self.set(telegram_id, user.id)
+
+    def remember_after_commit(
+            self,
+            session: AsyncSession,
+            user: UserProfile,
+    ) -> None:
+        """Кладёт в кэш созданного пользователя после commit сессии."""
+        telegram_id, user_id = str(user.telegram_id), user.id
+        pending = session.info.setdefault(PENDING_USERS_KEY, set())
+        pending.add(telegram_id)
+
+        def on_commit(_session: Session) -> None:
+            pending.discard(telegram_id)
+            self.set(telegram_id, user_id)
+
+        event.listen(
+            session.sync_session,
+            'after_commit',
+            on_commit,
+            once=True,
+        )
+
+    def invalidate(self, telegram_id: str) -> None:
+        """Сбрасывает запись пользователя."""
+        self.entries.pop(str(telegram_id), None)
+
+
+user_identity_cache = UserIdentityCache()
+
+
+@dataclass
+class LookupRegistry:
+    """Справочники name ↔ id для таблиц с NameMixin.
+
+    Все строки загружаются одним проходом при старте бота, после этого
+    поиск id по имени и имени по id не обращается к БД. Промах в обе
+    стороны читается из БД, недостающая строка создаётся одним
+    INSERT ... ON CONFLICT в отдельной транзакции, чтобы откат
+    вызывающей сессии не оставил в реестре несуществующий id.
+    """
+
+    models: tuple = (
+        StatusType,
+        NoticeType,
+        StartNoticeInterval,
+        EndNoticeInterval,
+        City,
+        UtilityType,
+    )
+    ids: dict = field(default_factory=dict)
+    names: dict = field(default_factory=dict)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    def remember(self, model: type, name: str, obj_id: int) -> None:
+        """Запоминает соответствие имени и id."""
+        self.ids.setdefault(model, {})[str(name)] = obj_id
+        self.names.setdefault(model, {})[obj_id] = str(name)
+
+    def get_id(self, model: type, name: str) -> int | None:
+        """Id строки справочника по имени."""
+        return self.ids.get(model, {}).get(str(name))
+
+    def get_name(self, model: type, obj_id: int | None) -> str | None:
+        """Имя строки справочника по id."""
+        return self.names.get(model, {}).get(obj_id)
+
+    async def load(self, session: AsyncSession) -> None:
+        """Загружает все строки справочников."""
+        for model in self.models:
+            result = await session.execute(select(model.id, model.name))
+            for obj_id, name in result.all():
+                self.remember(model, name, obj_id)
+        bot_logger.info(
+            f'Справочники загружены: {sum(map(len, self.ids.values()))} '
+            f'записей.',
+        )
+
+    async def read_id(
+            self,
+            session: AsyncSession,
+            model: type,
+            name: str,
+    ) -> int | None:
+        """Возвращает id по имени, при промахе читает его из БД."""
+        obj_id = self.get_id(model, name)
+        if obj_id is not None:
+            return obj_id
+        obj_id = (await session.execute(
+            select(model.id).where(model.name == str(name)),
+        )).scalar_one_or_none()
+        if obj_id is not None:
+            self.remember(model, name, obj_id)
+        return obj_id
+
+    async def read_name(
+            self,
+            session: AsyncSession,
+            model: type,
+            obj_id: int | None,
+    ) -> str | None:
+        """Возвращает имя по id, при промахе читает его из БД."""
+        if obj_id is None:
+            return None
+        name = self.get_name(model, obj_id)
+        if name is not None:
+            return name
+        name = (await session.execute(
+            select(model.name).where(model.id == obj_id),
+        )).scalar_one_or_none()
+        if name is not None:
+            self.remember(model, name, obj_id)
+        return name
+
+    async def get_or_create_id(self, model: type, name: str) -> int:
+        """Возвращает id по имени, отсутствующую строку создаёт."""
+        obj_id = self.get_id(model, name)
+        if obj_id is not None:
+            return obj_id
+        async with self.lock:
+            obj_id = self.get_id(model, name)
+            if obj_id is not None:
+                return obj_id
+            stmt = insert(model).values(name=str(name))
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[model.name],
+                set_=dict(name=stmt.excluded.name),
+            ).returning(model.id)
+            async with async_session() as session:
+                obj_id = (await session.execute(stmt)).scalar_one()
+                await session.commit()
+            self.remember(model, name, obj_id)
+            return obj_id
+
+
+lookup_registry = LookupRegistry()
@@ -2,12 +2,12 @@ from typing import Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from bot.crud.base import CRUDBase
+from bot.crud.base import CRUDLookup
 from bot.enums.city_enums import CityName
 from db.models.models import City
 
 
-class CRUDUCity(CRUDBase):
+class CRUDUCity(CRUDLookup):
     async def get_city_by_id(
             self,
             session: AsyncSession,
@@ -22,7 +22,7 @@ class CRUDUCity(CRUDBase):
             city_name: CityName,
     ) -> Optional[City]:
         """Получение объекта модели City по названию."""
-        return await self.get_by_field(session, 'name', city_name)
+        return await self.get_by_name(session, city_name)
 
     async def create_city(
             self,
@@ -38,10 +38,7 @@ class CRUDUCity(CRUDBase):
             city_name: CityName,
     ) -> City:
         """Возвращает объект модели City, если obj=None => создает."""
-        city_obj: City = await self.get_city_by_name(session, city_name)
-        if city_obj is None:
-            return await self.create_city(session, city_name)
-        return city_obj
+        return await self.get_or_create_by_name(session, city_name)
 
 
 city_crud = CRUDUCity(City)
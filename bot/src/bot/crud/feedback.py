@@ -2,7 +2,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from bot.crud.base import CRUDBase
 from bot.crud.user import user_crud
-from db.models.models import Feedback, UserProfile
+from db.models.models import Feedback
 
 
 class CRUDFeedback(CRUDBase):
@@ -15,11 +15,11 @@ class CRUDFeedback(CRUDBase):
             feedback_status: str = None,
     ) -> Feedback:
         """Сохраняет отзыв пользователя."""
-        user: UserProfile = user_crud.get_user_by_tg_id(session, telegram_id)
+        user_id = await user_crud.get_user_id(session, telegram_id)
         return await self.create(
             session,
             dict(
-                user_id=str(user.id),
+                user_id=user_id,
                 feedback_type=feedback_type,
                 text=feedback_text,
                 status=feedback_status or 'new',
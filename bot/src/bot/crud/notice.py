@@ -2,12 +2,12 @@ from typing import Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from bot.crud.base import CRUDBase
+from bot.crud.base import CRUDLookup
 from bot.enums.notice_enums import NoticeTypeEnum
 from db.models import EndNoticeInterval, NoticeType, StartNoticeInterval
 
 
-class CRUDNotice(CRUDBase):
+class CRUDNotice(CRUDLookup):
     async def get_notice_type_by_id(
             self,
             session: AsyncSession,
@@ -22,7 +22,7 @@ class CRUDNotice(CRUDBase):
             notice_type_name: str,
     ) -> Optional[NoticeType]:
         """Получаем тип оповещения по имени."""
-        return await self.get_by_field(session, 'name', notice_type_name)
+        return await self.get_by_name(session, notice_type_name)
 
     async def create_notice_type(
             self,
@@ -38,22 +38,17 @@ class CRUDNotice(CRUDBase):
             notice_type: NoticeTypeEnum,
     ) -> NoticeType:
         """Возвращает объект модели NoticeType, если obj=None => создает."""
-        notice_type_obj: NoticeType = await self.get_notice_type_by_name(
-            session, notice_type,
-        )
-        if notice_type_obj is None:
-            return await self.create_notice_type(session, notice_type)
-        return notice_type_obj
+        return await self.get_or_create_by_name(session, notice_type)
 
 
-class CRUDBaseNoticeInterval(CRUDBase):
+class CRUDBaseNoticeInterval(CRUDLookup):
     async def get_interval_by_name(
             self,
             session: AsyncSession,
             notice_interval: str,
     ) -> Optional[StartNoticeInterval]:
         """Получаем тип оповещения по имени."""
-        return await self.get_by_field(session, 'name', notice_interval)
+        return await self.get_by_name(session, notice_interval)
 
     async def create_interval(
             self,
@@ -0,0 +1,132 @@
+from dataclasses import dataclass
+from decimal import Decimal
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from bot.core.handle_errors import handle_db_errors
+from bot.crud.cache_methods import user_identity_cache
+from db.models.models import UserAccount, UserProfile
+
+
+@dataclass(frozen=True, slots=True)
+class AccountSnapshot:
+    """Счет пользователя с названиями услуги, города и статуса."""
+
+    id: int
+    utility: str | None
+    account: str | None
+    account_info: str | None
+    city: str | None
+    address: str | None
+    traffic: str | None
+    credit: Decimal | None
+    debit: Decimal | None
+    status: str | None
+
+    @classmethod
+    def from_account(cls, account: UserAccount) -> 'AccountSnapshot':
+        """Снимок счета из модели."""
+        return cls(
+            id=account.id,
+            utility=(
+                account.utility_type.name if account.utility_type else None
+            ),
+            account=account.account,
+            account_info=account.account_info,
+            city=account.city.name if account.city else None,
+            address=account.address,
+            traffic=account.traffic,
+            credit=account.credit,
+            debit=account.debit,
+            status=(
+                account.status_type.name if account.status_type else None
+            ),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class UserSnapshot:
+    """Профиль пользователя, его настройки оповещений и счета.
+    Сцены отрисовываются по снимку без дополнительных запросов в БД.
+    """
+
+    id: int
+    telegram_id: str
+    status: str | None
+    notice_state: str
+    notice_type: str | None
+    start_notice_interval: str | None
+    end_notice_interval: str | None
+    is_delivery_blocked: bool
+    accounts: tuple[AccountSnapshot, ...]
+
+    @classmethod
+    def from_user(cls, user: UserProfile) -> 'UserSnapshot':
+        """Снимок пользователя из модели с загруженными связями."""
+        return cls(
+            id=user.id,
+            telegram_id=user.telegram_id,
+            status=user.status_type.name if user.status_type else None,
+            notice_state=user.notice_state,
+            notice_type=user.notice_type.name if user.notice_type else None,
+            start_notice_interval=(
+                user.start_notice_interval.name
+                if user.start_notice_interval else None
+            ),
+            end_notice_interval=(
+                user.end_notice_interval.name
+                if user.end_notice_interval else None
+            ),
+            is_delivery_blocked=user.is_delivery_blocked,
+            accounts=tuple(
+                AccountSnapshot.from_account(account)
+                for account in user.user_account
+            ),
+        )
+
+    def get_account(self, utility: str) -> AccountSnapshot | None:
+        """Возвращает счет пользователя по имени услуги."""
+        for account in self.accounts:
+            if account.utility == utility:
+                return account
+        return None
+
+    def notice_info(self) -> dict:
+        """Настройки оповещений в формате
+        CRUDUser.get_user_all_notice_info.
+        """
+        return dict(
+            notice_state=self.notice_state,
+            notice_type=self.notice_type,
+            start_notice_interval=self.start_notice_interval,
+            end_notice_interval=self.end_notice_interval,
+        )
+
+
+@handle_db_errors
+async def load_user_snapshot(
+        session: AsyncSession,
+        telegram_id: str,
+) -> UserSnapshot | None:
+    """Загружает снимок пользователя одним запросом: профиль, статус,
+    настройки оповещений и счета с названиями услуг и городов.
+    """
+    query = select(UserProfile).options(
+        joinedload(UserProfile.status_type),
+        joinedload(UserProfile.notice_type),
+        joinedload(UserProfile.start_notice_interval),
+        joinedload(UserProfile.end_notice_interval),
+        joinedload(UserProfile.user_account).options(
+            joinedload(UserAccount.utility_type),
+            joinedload(UserAccount.city),
+            joinedload(UserAccount.status_type),
+        ),
+    ).where(UserProfile.telegram_id == str(telegram_id))
+    result = await session.execute(query)
+    user: UserProfile | None = result.unique().scalar_one_or_none()
+    if user is None:
+        return None
+    user_identity_cache.remember(session, user)
+    return UserSnapshot.from_user(user)
@@ -2,12 +2,12 @@ from typing import Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from bot.crud.base import CRUDBase
+from bot.crud.base import CRUDLookup
 from bot.enums.setting_enums import Status
 from db.models import StatusType
 
 
-class CRUDStatus(CRUDBase):
+class CRUDStatus(CRUDLookup):
     async def get_status_by_id(
             self,
             session: AsyncSession,
@@ -22,7 +22,7 @@ class CRUDStatus(CRUDBase):
             status_name: Status,
     ) -> Optional[StatusType]:
         """Возвращает статус по имени."""
-        return await self.get_by_field(session, 'name', status_name)
+        return await self.get_by_name(session, status_name)
 
     async def create_status(
             self,
@@ -38,10 +38,7 @@ class CRUDStatus(CRUDBase):
             status_name: Status,
     ) -> StatusType:
         """Возвращает статус по имени, если obj=None => создает."""
-        status_obj: StatusType = await self.get_status_by_name(session, status_name)
-        if status_obj is None:
-            return await self.create_status(session, status_name)
-        return status_obj
+        return await self.get_or_create_by_name(session, status_name)
 
 
 status_crud = CRUDStatus(StatusType)
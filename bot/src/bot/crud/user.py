@@ -7,6 +7,7 @@ from sqlalchemy.orm import selectinload
 from bot.core.exceptions import EndNoticeInterval404, StartNoticeInterval404
 from bot.core.handle_errors import handle_db_errors
 from bot.crud.base import CRUDBase
+from bot.crud.cache_methods import user_identity_cache
 from bot.crud.notice import (
     end_notice_interval_crud,
     notice_type_crud,
@@ -15,7 +16,7 @@ from bot.crud.notice import (
 from bot.crud.status import status_crud
 from bot.enums.notice_enums import NoticeFlag
 from bot.enums.setting_enums import Status, UserPersonalSettings
-from db.models.models import StatusType, UserProfile
+from db.models.models import UserProfile
 from logs.config import bot_logger
 from settings import DEFAULT_PERSONAL_SETTINGS
 
@@ -26,12 +27,36 @@ class CRUDUser(CRUDBase):
             session: AsyncSession,
             telegram_id: str,
     ) -> UserProfile | None:
-        """Получение 'user' по 'telegram_id'."""
-        return await self.get_by_field(
+        """Получение 'user' по 'telegram_id'.
+        id берётся из user_identity_cache, поэтому повторные вызовы
+        в одной сессии отдаются из identity map без запроса в БД.
+        """
+        user_id = user_identity_cache.get(telegram_id)
+        if user_id is not None:
+            user = await self.get_by_id(session, user_id)
+            if user is not None and user.telegram_id == str(telegram_id):
+                return user
+            user_identity_cache.invalidate(telegram_id)
+        user = await self.get_by_field(
             session,
             'telegram_id',
             str(telegram_id),
         )
+        if user is not None:
+            user_identity_cache.remember(session, user)
+        return user
+
+    async def get_user_id(
+            self,
+            session: AsyncSession,
+            telegram_id: str,
+    ) -> int | None:
+        """Получение id 'user' по 'telegram_id', из кэша без запроса в БД."""
+        user_id = user_identity_cache.get(telegram_id)
+        if user_id is not None:
+            return user_id
+        user = await self.get_user_by_tg_id(session, telegram_id)
+        return user.id if user else None
 
     async def remove_user_by_tg_id(
             self,
@@ -46,6 +71,7 @@ class CRUDUser(CRUDBase):
         )
         if user_profile:
             await self.remove_by_id(session, user_profile.id)
+        user_identity_cache.invalidate(telegram_id)
 
     async def create_user(
             self,
@@ -53,13 +79,12 @@ class CRUDUser(CRUDBase):
             telegram_id: str,
     ) -> UserProfile:
         """Создание нового user с telegram_id."""
-        notice_type = await notice_type_crud.get_or_create_notice_type(
-            session,
+        notice_type_id = await notice_type_crud.get_or_create_id(
             DEFAULT_PERSONAL_SETTINGS.get(
                 UserPersonalSettings.NOTICE_TYPE.value,
             ),
         )
-        return await self.create(session, {
+        user = await self.create(session, {
             'telegram_id': str(telegram_id),
             'is_delivery_blocked': DEFAULT_PERSONAL_SETTINGS.get(
                 UserPersonalSettings.IS_DELIVERY_BLOCKED.value,
@@ -67,8 +92,10 @@ class CRUDUser(CRUDBase):
             'notice_state': DEFAULT_PERSONAL_SETTINGS.get(
                 UserPersonalSettings.NOTICE_STATE.value,
             ),
-            'notice_type_id': notice_type.id,
+            'notice_type_id': notice_type_id,
         })
+        user_identity_cache.remember_after_commit(session, user)
+        return user
 
     async def get_or_create_user(
             self,
@@ -93,15 +120,15 @@ class CRUDUser(CRUDBase):
             session: AsyncSession,
             telegram_id: str,
             status: str,
+            user: UserProfile | None = None,
     ) -> UserProfile:
-        """Обновляет статус пользователя."""
-        user = await self.get_user_by_tg_id(session, telegram_id)
+        """Обновляет статус пользователя.
+        Уже полученный user можно передать, чтобы не искать его снова.
+        """
+        user = user or await self.get_user_by_tg_id(session, telegram_id)
         if not user:
             raise ValueError('Пользователь не найден')
-        status_obj = await status_crud.get_status_by_name(session, status)
-        if not status_obj:
-            status_obj = await status_crud.create_status(session, status)
-        user.status_id = status_obj.id
+        user.status_id = await status_crud.get_or_create_id(status)
         await session.flush()
         return user
 
@@ -110,19 +137,15 @@ class CRUDUser(CRUDBase):
             session: AsyncSession,
             telegram_id: str,
             notice_type_value: str,
+            user: UserProfile | None = None,
     ) -> UserProfile:
         """Обновляет тип оповещения пользователя."""
-        user = await self.get_user_by_tg_id(session, telegram_id)
+        user = user or await self.get_user_by_tg_id(session, telegram_id)
         if not user:
             raise ValueError('Пользователь не найден')
-        notice_type = await notice_type_crud.get_notice_type_by_name(
-            session, notice_type_value,
+        user.notice_type_id = await notice_type_crud.get_or_create_id(
+            notice_type_value,
         )
-        if not notice_type:
-            notice_type = await notice_type_crud.create_notice_type(
-                session, notice_type_value,
-            )
-        user.notice_type_id = notice_type.id
         await session.flush()
         return user
 
@@ -131,9 +154,10 @@ class CRUDUser(CRUDBase):
             session: AsyncSession,
             telegram_id: str,
             notice_state: str,
+            user: UserProfile | None = None,
     ) -> UserProfile:
         """Обновляет состояние оповещения пользователя."""
-        user = await self.get_user_by_tg_id(session, telegram_id)
+        user = user or await self.get_user_by_tg_id(session, telegram_id)
         if not user:
             raise ValueError('Пользователь не найден')
         user.notice_state = (str(notice_state))
@@ -144,15 +168,13 @@ class CRUDUser(CRUDBase):
             self,
             session: AsyncSession,
             telegram_id: str,
-    ) -> StatusType:
-        """Получает статус пользователя."""
-        user: UserProfile = await self.get_user_by_tg_id(session, telegram_id)
+            user: UserProfile | None = None,
+    ) -> str | None:
+        """Получает название статуса пользователя."""
+        user = user or await self.get_user_by_tg_id(session, telegram_id)
         if not user:
             raise ValueError('Пользователь не найден')
-        user_status: StatusType = await status_crud.get_status_by_id(
-            session, user.status_id,
-        )
-        return user_status
+        return await status_crud.get_name_by_id(session, user.status_id)
 
     async def change_user_status_after_first_add_account(
             self,
@@ -161,12 +183,13 @@ class CRUDUser(CRUDBase):
     ) -> UserProfile | None:
         """Изменяет статус пользователя после добавления первого счета."""
         user: UserProfile = await self.get_user_by_tg_id(session, telegram_id)
-        user_status_obj = status_crud.get_status_by_id(session, user.status_id)
-        if user_status_obj and user_status_obj.name == Status.NEW.value:
+        status = await status_crud.get_name_by_id(session, user.status_id)
+        if status == Status.NEW.value:
             return await self.update_status(
                 session,
                 telegram_id,
                 Status.ACTIVE.value,
+                user=user,
             )
         return None
 
@@ -269,15 +292,7 @@ class CRUDUser(CRUDBase):
         )
         if not user:
             raise ValueError('Пользователь не найден')
-        notice_interval = await notice_crud.get_interval_by_name(
-            session, value,
-        )
-        if not notice_interval:
-            notice_interval = await notice_crud.create_interval(
-                session, value,
-            )
-            await session.flush()
-        setattr(user, attr_name, notice_interval.id)
+        setattr(user, attr_name, await notice_crud.get_or_create_id(value))
         await session.flush()
         return user
 
@@ -2,12 +2,12 @@ from typing import Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from bot.crud.base import CRUDBase
+from bot.crud.base import CRUDLookup
 from bot.enums.utility_enums import UtilityName
 from db.models.models import UtilityType
 
 
-class CRUDUtility(CRUDBase):
+class CRUDUtility(CRUDLookup):
     async def get_utility_by_id(
             self,
             session: AsyncSession,
@@ -22,7 +22,7 @@ class CRUDUtility(CRUDBase):
             utility_name: UtilityName,
     ) -> Optional[UtilityType]:
         """Получение объекта коммунальной услуги по названию."""
-        return await self.get_by_field(session, 'name', utility_name)
+        return await self.get_by_name(session, utility_name)
 
     async def create_utility(
             self,
@@ -38,10 +38,7 @@ class CRUDUtility(CRUDBase):
             utility_name: UtilityName,
     ) -> UtilityType:
         """Возвращает коммунальную услугу имени, если obj=None => создает."""
-        utility_obj: UtilityType = await self.get_utility_by_name(session, utility_name)
-        if utility_obj is None:
-            return await self.create_utility(session, utility_name)
-        return utility_obj
+        return await self.get_or_create_by_name(session, utility_name)
 
 
 utility_crud = CRUDUtility(UtilityType)
@@ -30,6 +30,32 @@ class FieldLength(IntEnum):
     DELIVERY_ERROR = 30
 
 
+class HistoryWriterSettings(IntEnum):
+    """Параметры фоновой записи истории."""
+
+    QUEUE_SIZE = 10_000
+    BATCH_SIZE = 200
+    FLUSH_INTERVAL_MS = 500
+    MAX_REPLAYS = 3
+    ERROR_DELAY_MS = 1_000
+
+
+class UserCacheSettings(IntEnum):
+    """Параметры кэша id пользователей."""
+
+    SIZE = 10_000
+    TTL = 60 * 5
+
+
+class RedisSettings(IntEnum):
+    """Параметры подключения и хранения FSM в Redis."""
+
+    MAX_CONNECTIONS = 50
+    POOL_TIMEOUT = 5
+    FSM_STATE_TTL = 60 * 60 * 24 * 30
+    FSM_DATA_TTL = 60 * 60 * 24 * 30
+
+
 class SendTelegramError(Enum):
     LITE_ERRORS = (
         exc.TelegramNetworkError,
@@ -4,12 +4,10 @@ from aiogram.types import (
 )
 
 from bot.core.exceptions import EmptyUserAccountList
-from bot.crud.account import user_account_crud
+from bot.crud.snapshot import UserSnapshot
 from bot.enums.scene_enums import SceneName
 from bot.enums.utility_enums import UtilityLabel
 from bot.keyboards.enums import KeyboardIcon, KeyboardText
-from db.core import async_session
-from db.models import UserAccount
 
 CALLBACK_DATA_ACCOUNT_KEYBOARD = [
     SceneName.DATA.check,
@@ -57,8 +55,9 @@ def check_or_add_or_request_account() -> InlineKeyboardMarkup:
     )
 
 
-async def get_icon_status_button(
+def get_icon_status_button(
         scene_name: str,
+        snapshot: UserSnapshot,
 ) -> KeyboardIcon | None:
     """Определяет статус кнопки для заданного типа счета.
     SceneName.editor_to_utility_name(scene_name) - получаем имя услуги (UtilityName).
@@ -69,40 +68,30 @@ async def get_icon_status_button(
             - KeyboardIcon.FILLED.value ('✅'), если счет заполнен.
 
     """
-    button_name = SceneName.editor_to_utility_name(scene_name)
-
-    for account_name, account_value in account_values.items():
-        if button_name == account_name:
-            if account_value is None:
-                return KeyboardIcon.EMPTY.value
-            return KeyboardIcon.FILLED.value
+    account = snapshot.get_account(
+        SceneName.editor_to_utility_name(scene_name),
+    )
+    if account is None:
         return None
-    return None
+    if account.account is None:
+        return KeyboardIcon.EMPTY.value
+    return KeyboardIcon.FILLED.value
 
 
-async def display_accounts_list(user_id: str) -> InlineKeyboardMarkup:
-    """Формирует клавиатуру с кнопками для редактирования счетов пользователя.
-    pass
+def display_accounts_list(snapshot: UserSnapshot) -> InlineKeyboardMarkup:
+    """Формирует клавиатуру с кнопками для редактирования счетов пользователя
+    по снимку пользователя из load_user_snapshot.
     """
-    async with async_session() as session:
-        user_accounts: UserAccount = await user_account_crud.get_all_accounts(
-            session,
-            str(user_id),
-        )
-        if not user_accounts:
-            raise EmptyUserAccountList
-
-    # todo
-    #  получаем данные счетов + под них статусы
-    #  наименования счетов + под них кнопки
-    user_account_buttons = [
-
-    ]
+    if not snapshot.accounts:
+        raise EmptyUserAccountList
 
     result_keyboard = [
             [
                 InlineKeyboardButton(
-                    text=await get_icon_status_button(scene_name) + ' ' + utility_label,
+                    text=' '.join(filter(None, (
+                        get_icon_status_button(scene_name, snapshot),
+                        utility_label,
+                    ))),
                     callback_data=scene_name,
                 ),
             ] for utility_label, scene_name in EDITOR_ACCOUNT_BUTTONS
@@ -3,9 +3,11 @@ from aiogram.fsm.scene import Scene, on
 from aiogram.types import CallbackQuery, Message
 
 from bot.core.exceptions import EmptyUserAccountList
+from bot.crud.snapshot import load_user_snapshot
 from bot.enums.profile_enums import BotMessage
 from bot.enums.scene_enums import EDITOR_AVAILABLE_SCENE_NAMES, SceneName
 from bot.keyboards.accounts import display_accounts_list
+from db.core import async_session
 from logs.config import bot_logger
 
 
@@ -20,16 +22,21 @@ class ListUtilitiesAccountsScene(
     async def handle_list(self, event: Message | CallbackQuery) -> None:
         user_id = str(event.from_user.id)
         try:
+            async with async_session() as session:
+                snapshot = await load_user_snapshot(session, user_id)
+            if snapshot is None:
+                raise EmptyUserAccountList
+            reply_markup = display_accounts_list(snapshot)
             if isinstance(event, CallbackQuery):
                 await event.answer()
                 await event.message.answer(
                     BotMessage.CHOOSE_ACCOUNTS_IN_LIST.value,
-                    reply_markup=await display_accounts_list(user_id),
+                    reply_markup=reply_markup,
                 )
             else:
                 await event.answer(
                     BotMessage.CHOOSE_ACCOUNTS_IN_LIST.value,
-                    reply_markup=await display_accounts_list(user_id),
+                    reply_markup=reply_markup,
                 )
         except EmptyUserAccountList as e:
             error_name = e.__class__.__name__
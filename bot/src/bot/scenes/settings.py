@@ -2,6 +2,7 @@ from aiogram import F
 from aiogram.fsm.scene import Scene, on
 from aiogram.types import CallbackQuery, Message
 
+from bot.crud.snapshot import load_user_snapshot
 from bot.crud.user import user_crud
 from bot.enums.notice_enums import (
     NoticeFlag,
@@ -36,38 +37,38 @@ class SettingScene(Scene, state=SceneName.SETTING.display):
 
         """
         async with async_session() as session:
-            user_id = message.from_user.id
-            notice_info: dict = await user_crud.get_user_all_notice_info(
-                session, user_id,
+            snapshot = await load_user_snapshot(
+                session, str(message.from_user.id),
             )
-            notice_type = notice_info.get(
-                'notice_type', BotMessage.UNKNOWN_NOTICE_TYPE.value,
+        notice_info: dict = snapshot.notice_info() if snapshot else {}
+        notice_type = notice_info.get(
+            'notice_type', BotMessage.UNKNOWN_NOTICE_TYPE.value,
+        )
+        notice_state = notice_info.get(
+            'notice_state', BotMessage.UNKNOWN_NOTICE_STATE.value,
+        )
+        if notice_type == NoticeTypeEnum.PERIOD.value:
+            start_hour = notice_info.get('start_notice_interval', 'error')
+            end_hour = notice_info.get('end_notice_interval', 'error')
+            await message.answer(
+                BotMessage.PERSONAL_SETTING_NOTICE_PERIOD.value.format(
+                    notice_state=NoticeStateEnum.to_human(notice_state),
+                    notice_type=NoticeTypeEnum.to_human(notice_type),
+                    start_period=NoticeInterval.to_human(start_hour),
+                    end_period=NoticeInterval.to_human(end_hour),
+                ),
+                parse_mode='Markdown',
+                reply_markup=change_setting_interval_notice(),
             )
-            notice_state = notice_info.get(
-                'notice_state', BotMessage.UNKNOWN_NOTICE_STATE.value,
+        else:
+            await message.answer(
+                BotMessage.PERSONAL_SETTING_NOTICE_ALL.value.format(
+                    notice_state=NoticeStateEnum.to_human(notice_state),
+                    notice_type=NoticeTypeEnum.to_human(notice_type),
+                ),
+                parse_mode='Markdown',
+                reply_markup=change_setting_interval_notice(),
             )
-            if notice_type == NoticeTypeEnum.PERIOD.value:
-                start_hour = notice_info.get('start_notice_interval', 'error')
-                end_hour = notice_info.get('end_notice_interval', 'error')
-                await message.answer(
-                    BotMessage.PERSONAL_SETTING_NOTICE_PERIOD.value.format(
-                        notice_state=NoticeStateEnum.to_human(notice_state),
-                        notice_type=NoticeTypeEnum.to_human(notice_type),
-                        start_period=NoticeInterval.to_human(start_hour),
-                        end_period=NoticeInterval.to_human(end_hour),
-                    ),
-                    parse_mode='Markdown',
-                    reply_markup=change_setting_interval_notice(),
-                )
-            else:
-                await message.answer(
-                    BotMessage.PERSONAL_SETTING_NOTICE_ALL.value.format(
-                        notice_state=NoticeStateEnum.to_human(notice_state),
-                        notice_type=NoticeTypeEnum.to_human(notice_type),
-                    ),
-                    parse_mode='Markdown',
-                    reply_markup=change_setting_interval_notice(),
-                )
 
     @on.callback_query(F.data == SceneName.NOTICE_INTERVAL.editor)
     @on.callback_query(F.data == SceneName.NOTICE_STATE.editor)
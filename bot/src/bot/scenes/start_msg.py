@@ -1,8 +1,10 @@
 from aiogram import F
 from aiogram.fsm.scene import Scene, on
 from aiogram.types import CallbackQuery, Message
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from bot.crud.account import user_account_crud
+from bot.crud.snapshot import UserSnapshot, load_user_snapshot
 from bot.crud.user import user_crud
 from bot.enums.profile_enums import BotMessage
 from bot.enums.scene_enums import SceneName
@@ -10,7 +12,7 @@ from bot.enums.setting_enums import Status, UserPersonalSettings
 from bot.keyboards.accounts import CALLBACK_DATA_ACCOUNT_KEYBOARD, add_accounts
 from bot.keyboards.main import display_debt, main_kb, mini_main_kb
 from db.core import async_session
-from db.models.models import StatusType, UserAccount, UserProfile
+from db.models.models import UserProfile
 from settings import DEFAULT_PERSONAL_SETTINGS
 
 
@@ -20,6 +22,57 @@ class StartMsgScene(Scene, state=SceneName.START_MSG.value):
     Создает для новых пользователей дефолтные счета и настройки.
     """
 
+    @staticmethod
+    async def prepare_user(
+            session: AsyncSession,
+            user_telegram_id: str,
+            snapshot: UserSnapshot | None,
+    ) -> str | None:
+        """Создает пользователя, дефолтные счета и настройки,
+        если их еще нет. Возвращает название статуса пользователя.
+        """
+        user_obj: UserProfile = await user_crud.get_or_create_user(
+            session,
+            user_telegram_id,
+        )
+        await session.flush()
+        if snapshot is None or not snapshot.accounts:
+            await user_account_crud.create_default_accounts(
+                session,
+                user_obj.id,
+            )
+        if not user_obj.status_id:
+            await user_crud.update_status(
+                session,
+                user_telegram_id,
+                DEFAULT_PERSONAL_SETTINGS.get(
+                    UserPersonalSettings.STATUS.value,
+                ),
+                user=user_obj,
+            )
+            await user_crud.update_notice_state(
+                session,
+                user_telegram_id,
+                DEFAULT_PERSONAL_SETTINGS.get(
+                    UserPersonalSettings.NOTICE_STATE.value,
+                ),
+                user=user_obj,
+            )
+            await user_crud.update_notice_type(
+                session,
+                user_telegram_id,
+                DEFAULT_PERSONAL_SETTINGS.get(
+                    UserPersonalSettings.NOTICE_TYPE.value,
+                ),
+                user=user_obj,
+            )
+        await session.commit()
+        return await user_crud.get_user_status(
+            session,
+            user_telegram_id,
+            user=user_obj,
+        )
+
     @on.message.enter()
     async def handle_enter(self, message: Message) -> None:
         user_name = (
@@ -28,51 +81,15 @@ class StartMsgScene(Scene, state=SceneName.START_MSG.value):
                 or 'пользователь'
         )
         async with async_session() as session:
-            user_telegram_id = message.from_user.id
-            user_obj: UserProfile = await user_crud.get_or_create_user(
-                session,
-                str(user_telegram_id),
-            )
-            await session.flush()
-            user_accounts: UserAccount = await user_account_crud.get_all_accounts(
-                session,
-                str(user_telegram_id),
-            )
-            if not user_accounts:
-                await user_account_crud.create_default_accounts(
-                    session,
-                    user_obj.id,
-                )
-            user_status_id = user_obj.status_id
-            if not user_status_id:
-                await user_crud.update_status(
-                    session,
-                    user_telegram_id,
-                    DEFAULT_PERSONAL_SETTINGS.get(
-                        UserPersonalSettings.STATUS.value,
-                    ),
-                )
-                await user_crud.update_notice_state(
-                    session,
-                    user_telegram_id,
-                    DEFAULT_PERSONAL_SETTINGS.get(
-                        UserPersonalSettings.NOTICE_STATE.value,
-                    ),
-                )
-                await user_crud.update_notice_type(
-                    session,
-                    user_telegram_id,
-                    DEFAULT_PERSONAL_SETTINGS.get(
-                        UserPersonalSettings.NOTICE_TYPE.value,
-                    ),
+            user_telegram_id = str(message.from_user.id)
+            snapshot = await load_user_snapshot(session, user_telegram_id)
+            if snapshot and snapshot.accounts and snapshot.status:
+                user_status = snapshot.status
+            else:
+                user_status = await self.prepare_user(
+                    session, user_telegram_id, snapshot,
                 )
-                await session.commit()
-
-            user_status: StatusType = await user_crud.get_user_status(
-                session,
-                str(user_telegram_id),
-            )
-            if user_status.name == Status.NEW.value:
+            if user_status == Status.NEW.value:
                 await message.answer(
                     BotMessage.START.value.format(user_name=user_name),
                     parse_mode='Markdown',
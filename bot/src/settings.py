@@ -19,6 +19,8 @@ LOGS_PATH.parent.mkdir(parents=True, exist_ok=True)
 BOT_LOG_PATH = LOGS_PATH / 'bot/bot_logs.log'
 PROVIDERS_LOG_PATH = LOGS_PATH / 'providers/providers_logs.log'
 WORKER_LOG_PATH = LOGS_PATH / 'providers/worker_logs.log'
+HISTORY_SPILL_PATH = LOGS_PATH / 'bot/history_spill.jsonl'
+HISTORY_DEAD_LETTER_PATH = LOGS_PATH / 'bot/history_dead_letter.jsonl'
 
 
 class Settings(BaseSettings):
@@ -45,6 +47,8 @@ class Settings(BaseSettings):
     api_url: str
     api_test_url: str
 
+    fsm_redis_storage: bool = False
+
     @property
     def telegram_token(self) -> str:
         """Получение телеграм токена."""
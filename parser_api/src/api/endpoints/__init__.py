@@ -1 +1,2 @@
+from .metrics import router as metrics_router  # noqa
 from .parser import router as parser_router  # noqa
@@ -0,0 +1,13 @@
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from services.metrics import render_metrics
+
+router = APIRouter()
+
+
+@router.get('/metrics', include_in_schema=False)
+async def get_metrics() -> Response:
+    """Метрики API в формате Prometheus."""
+    content, media_type = render_metrics()
+    return Response(content=content, media_type=media_type)
@@ -1,7 +1,6 @@
-import json
 import uuid
 
-from fastapi import APIRouter, Body, Depends, status
+from fastapi import APIRouter, Body, Depends, Query, status
 from fastapi.responses import JSONResponse
 
 from api.enums import EndpointDescription, EndpointSummary, ResponseMessages
@@ -9,14 +8,29 @@ from api.validators import check_duplicate_accounts, get_token
 from core.exceptions import RedisTaskNotFound
 from core.logger_settings import logger
 from schemas.message import BaseMessageData, ResultOutPutMessageData
-from services.enums import LoggerMessage, StatusType
-from services.utils import create_new_task, get_redis_task
+from services.enums import LoggerMessage, ResultWait, StatusType
+from services.parser.app import Parser
+from services.parser.config import BULK_PARSING_ENABLED
+from services.utils import (
+    create_new_task,
+    get_redis_task,
+    wait_for_task_completion,
+)
 from workers.tasks import check_all_task_for_completion
 from workers.worker_app import rq_worker
 
 router = APIRouter()
 
 
+def split_task_accounts(accounts: list[dict]) -> list[list[dict]]:
+    """Делит счета задачи на элементы очереди: счета одного сайта
+    уходят одним пакетом, чтобы воркер обработал их в одной сессии.
+    """
+    if not BULK_PARSING_ENABLED:
+        return [[account] for account in accounts]
+    return Parser.group_by_site(accounts)
+
+
 @router.post(
     '/start_task',
     summary=EndpointSummary.START_TASK.value,
@@ -39,10 +53,17 @@ async def start_task(
         try:
             check_duplicate_accounts(message_data_account)
             await create_new_task(task_id, message_data)
-            for data_account in message_data_account:
+            for data_accounts in split_task_accounts(message_data_account):
+                if len(data_accounts) > 1:
+                    queue_data = dict(accounts=data_accounts)
+                else:
+                    queue_data = dict(data_accounts[0])
                 await rq_worker.set_task_in_queue(
                     task_id=task_id,
-                    data=data_account,
+                    data=dict(
+                        queue_data,
+                        force_refresh=message.force_refresh,
+                    ),
                 )
             return JSONResponse(
                 status_code=status.HTTP_200_OK,
@@ -82,10 +103,19 @@ async def start_task(
 )
 async def get_result(
         task_id: str,
+        wait: int = Query(
+            0,
+            ge=0,
+            le=ResultWait.MAX_SECONDS.value,
+            description=EndpointDescription.RESULT_WAIT.value,
+        ),
         token: str = Depends(get_token),
 ):
     try:
-        if not await check_all_task_for_completion(task_id):
+        is_complete = await check_all_task_for_completion(task_id)
+        if not is_complete and wait:
+            is_complete = await wait_for_task_completion(task_id, wait)
+        if not is_complete:
             return JSONResponse(
                 status_code=status.HTTP_202_ACCEPTED,
                 content=dict(
@@ -95,7 +125,7 @@ async def get_result(
                     ),
                 ),
             )
-        data = json.loads(await get_redis_task(task_id))
+        data = await get_redis_task(task_id)
     except RedisTaskNotFound as e:
         logger.error(ResponseMessages.TASK_NOT_FOUND.format(task_id=task_id))
         return JSONResponse(
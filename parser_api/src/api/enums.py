@@ -21,13 +21,20 @@ class EndpointDescription(str, Enum):
         'Получить результат выполнения задачи по `task_id`.\n\n'
         'Если задача ещё не завершена — возвращается статус 202 (Accepted).\n'
         'Если задача завершена — возвращается результат в формате `ResultOutPutMessageData`.\n'
-        'Если задача не найдена или произошла ошибка — возвращается сообщение об ошибке.\n\n'
+        'Если задача не найдена или произошла ошибка — '
+        'возвращается сообщение об ошибке.\n'
+        'Параметр `wait` позволяет дождаться завершения задачи '
+        'до указанного числа секунд вместо повторных запросов.\n\n'
         '**Возможные коды ответов:**\n'
         '- `200 OK` — задача завершена, возвращён результат\n'
         '- `202 Accepted` — задача в процессе, результат недоступен\n'
         '- `404 Not Found` — задача с таким `task_id` не найдена\n'
         '- `502 Bad Gateway` — внутренняя ошибка при обработке'
     )
+    RESULT_WAIT = (
+        'Сколько секунд ждать завершения задачи перед ответом 202 '
+        '(0 — ответить сразу)'
+    )
 
 
 class ResponseMessages(str, Enum):
@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from api.endpoints import parser_router
+from api.endpoints import metrics_router, parser_router
 
 main_router = APIRouter()
 
@@ -9,3 +9,4 @@ main_router.include_router(
     prefix='/parser',
     tags=['parser'],
 )
+main_router.include_router(metrics_router)
@@ -0,0 +1,122 @@
+"""Микро-бенчмарк извлечения карточек результата ITF.
+
+Сравнивает прежнее извлечение (query_selector/text_content на каждый
+элемент) с одним вызовом eval_on_selector_all и считает число
+обращений к браузеру.
+
+Запуск из parser_api/src:
+    python -m benchmarks.itf_extraction --iterations 50
+"""
+import argparse
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+
+from playwright.async_api import Page, async_playwright
+
+from services.parser.sites.ITF.UI_text import ITFDataGasNameSelector
+from services.parser.sites.ITF.parser import (
+    EXTRACT_CARDS_SCRIPT,
+    ITF_CARD_SELECTOR,
+    ITF_RESULT_SELECTORS,
+    map_result_data,
+)
+
+CARD_TEMPLATE = (
+    '<div class="col-md-4">'
+    '<p class="text-black">{label}</p>'
+    '<h6 class="hint-text">{value}</h6>'
+    '</div>'
+)
+EMPTY_CARD = '<div class="col-md-4"><span>-</span></div>'
+Extraction = Callable[[Page, str], Awaitable[tuple[dict, int]]]
+
+
+def build_page(empty_cards: int) -> str:
+    """Страница с карточками результата и пустыми карточками."""
+    cards = [
+        CARD_TEMPLATE.format(label=selector.value, value=index)
+        for index, selector in enumerate(ITFDataGasNameSelector)
+    ]
+    cards.extend([EMPTY_CARD] * empty_cards)
+    return f'<div id="resultcard">{"".join(cards)}</div>'
+
+
+async def legacy_extraction(
+        page: Page,
+        selector_type: str,
+) -> tuple[dict, int]:
+    """Прежняя реализация get_result_data со счётчиком обращений."""
+    round_trips = 1
+    result_dict = {}
+    elements = await page.query_selector_all(ITF_CARD_SELECTOR)
+    for el in elements:
+        p_tag = await el.query_selector('p.text-black')
+        round_trips += 1
+        if not p_tag:
+            continue
+        p_text = (await p_tag.text_content()).strip()
+        round_trips += 1
+        for selector in ITF_RESULT_SELECTORS.get(selector_type):
+            if p_text == selector.value:
+                h6_tag = await el.query_selector('h6.hint-text')
+                result_dict[selector.name.lower()] = (
+                    (await h6_tag.text_content()).strip()
+                )
+                round_trips += 2
+    return result_dict, round_trips
+
+
+async def batched_extraction(
+        page: Page,
+        selector_type: str,
+) -> tuple[dict, int]:
+    """Извлечение одним вызовом в браузер."""
+    cards = await page.eval_on_selector_all(
+        ITF_CARD_SELECTOR,
+        EXTRACT_CARDS_SCRIPT,
+    )
+    return map_result_data(selector_type, cards), 1
+
+
+async def measure(
+        page: Page,
+        extraction: Extraction,
+        iterations: int,
+) -> tuple[float, int]:
+    """Среднее время извлечения в мс и число вызовов в браузер."""
+    round_trips = 0
+    started = time.perf_counter()
+    for _ in range(iterations):
+        _, round_trips = await extraction(page, 'gas')
+    elapsed = (time.perf_counter() - started) / iterations
+    return elapsed * 1000, round_trips
+
+
+async def main(iterations: int, empty_cards: int) -> None:
+    """Сверяет результаты обоих способов и печатает замеры."""
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        page = await browser.new_page()
+        await page.set_content(build_page(empty_cards))
+        legacy, _ = await legacy_extraction(page, 'gas')
+        batched, _ = await batched_extraction(page, 'gas')
+        assert legacy == batched, (legacy, batched)
+        for name, extraction in (
+                ('legacy', legacy_extraction),
+                ('batched', batched_extraction),
+        ):
+            elapsed, round_trips = await measure(page, extraction, iterations)
+            print(
+                f'{name:>8}: {round_trips:>3} обращений к браузеру, '
+                f'{elapsed:.2f} мс на извлечение',
+            )
+        await browser.close()
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument('--iterations', type=int, default=50)
+    arg_parser.add_argument('--empty-cards', type=int, default=6)
+    args = arg_parser.parse_args()
+    asyncio.run(main(args.iterations, args.empty_cards))
@@ -0,0 +1,142 @@
+"""Локальная заглушка сайта ITF для бенчмарков и тестов.
+
+Отдаёт страницы с разметкой ITF без личных данных из tests/fixtures/itf
+(те же, что у тестов HTTP-парсера): GET — форму услуги,
+POST — страницу результата.
+Страница результата выбирается по номеру счёта:
+    404...  — счёт не найден (видимый alert-danger);
+    500...  — карточка результата скрыта (класс hide);
+    остальные — успешный результат {utility}_result.html.
+Стили и скрипты сайта (/css, /js) отдаются из fixtures/itf/static:
+правила видимости и заглушка select2 с той же разметкой выпадающего
+списка, что и на сайте, чтобы по страницам мог пройти и ParserITF.
+
+Путь содержит 'itfllc', чтобы Parser.detect_url_flag выбрал ParserITF.
+
+Запуск из parser_api/src:
+    python -m benchmarks.itf_stub --port 8089
+"""
+import argparse
+import asyncio
+from pathlib import Path
+
+from aiohttp import web
+
+STUB_PATH = '/itfllc/{utility}'
+FIXTURES_PATH = (
+    Path(__file__).resolve().parents[1] / 'tests' / 'fixtures' / 'itf'
+)
+STATIC_PATH = FIXTURES_PATH / 'static'
+NOT_FOUND_PREFIX = '404'
+HIDDEN_PREFIX = '500'
+NOT_FOUND_PAGE = 'not_found.html'
+HIDDEN_PAGE = 'hidden_result.html'
+ACCOUNT_FIELDS = ('customer_id', 'agreement_number')
+# Без импорта services: настройки читаются при импорте, а бенчмарк
+# задаёт адреса заглушки в окружении уже после импорта этого модуля.
+UTILITIES = ('gas', 'water', 'electricity')
+
+
+def read_page(name: str) -> str:
+    """Текст сохранённой страницы ITF."""
+    return (FIXTURES_PATH / name).read_text(encoding='utf-8')
+
+
+def result_page_name(utility: str, account: str) -> str:
+    """Страница результата по сценарию номера счёта."""
+    if account.startswith(NOT_FOUND_PREFIX):
+        return NOT_FOUND_PAGE
+    if account.startswith(HIDDEN_PREFIX):
+        return HIDDEN_PAGE
+    return f'{utility}_result.html'
+
+
+def build_app(
+        delay_ms: int = 0,
+        requests: list | None = None,
+) -> web.Application:
+    """Приложение заглушки; delay_ms имитирует сетевую задержку сайта.
+    Если передан requests, в него складываются поля отправленных форм.
+    """
+    pages = {
+        name: read_page(name)
+        for name in (
+            [f'{utility}_form.html' for utility in UTILITIES]
+            + [f'{utility}_result.html' for utility in UTILITIES]
+            + [NOT_FOUND_PAGE, HIDDEN_PAGE]
+        )
+    }
+
+    def utility_of(request: web.Request) -> str:
+        utility = request.match_info['utility']
+        if utility not in UTILITIES:
+            raise web.HTTPNotFound()
+        return utility
+
+    async def form_page(request: web.Request) -> web.Response:
+        utility = utility_of(request)
+        if delay_ms:
+            await asyncio.sleep(delay_ms / 1000)
+        return web.Response(
+            text=pages[f'{utility}_form.html'],
+            content_type='text/html',
+        )
+
+    async def result_page(request: web.Request) -> web.Response:
+        utility = utility_of(request)
+        form = await request.post()
+        if requests is not None:
+            requests.append(dict(form))
+        if delay_ms:
+            await asyncio.sleep(delay_ms / 1000)
+        account = next(
+            (form[name] for name in ACCOUNT_FIELDS if name in form),
+            '',
+        )
+        return web.Response(
+            text=pages[result_page_name(utility, account)],
+            content_type='text/html',
+        )
+
+    app = web.Application()
+    app.router.add_get(STUB_PATH.format(utility='{utility}'), form_page)
+    app.router.add_post(STUB_PATH.format(utility='{utility}'), result_page)
+    app.router.add_static('/css', STATIC_PATH)
+    app.router.add_static('/js', STATIC_PATH)
+    return app
+
+
+async def start_stub(
+        port: int,
+        delay_ms: int = 0,
+        host: str = '127.0.0.1',
+        requests: list | None = None,
+) -> web.AppRunner:
+    """Поднимает заглушку на host:port и возвращает её runner."""
+    runner = web.AppRunner(build_app(delay_ms, requests), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
+
+
+def stub_url(port: int, utility: str, host: str = '127.0.0.1') -> str:
+    """Адрес формы услуги на заглушке."""
+    return f'http://{host}:{port}' + STUB_PATH.format(utility=utility)
+
+
+async def main(port: int, delay_ms: int) -> None:
+    """Держит заглушку запущенной до остановки процесса."""
+    runner = await start_stub(port, delay_ms)
+    print(f'Заглушка ITF: {stub_url(port, "gas")}')
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument('--port', type=int, default=8089)
+    arg_parser.add_argument('--delay-ms', type=int, default=0)
+    args = arg_parser.parse_args()
+    asyncio.run(main(args.port, args.delay_ms))
@@ -0,0 +1,263 @@
+r"""Офлайн-бенчмарк конвейера парсинга на локальной заглушке ITF.
+
+Поднимает benchmarks.itf_stub, направляет на неё ITF_URL_* и гоняет
+задачи одним из режимов:
+    parser   — Parser(...).run() на каждый счёт;
+    pipeline — create_new_task + start_parsing через локальный Redis.
+Счета распределяются по сценариям заглушки (успех, счёт не найден,
+скрытая карточка). Прокси отключены, кэш результатов обходится
+через force_refresh.
+
+Выводит p50/p95 задержки, задач в секунду, ошибки по классам
+и RSS каждого воркера (вместе с процессами браузера).
+
+Запуск из parser_api/src (нужен Redis из настроек):
+    python -m benchmarks.parser_pipeline --mode pipeline \
+        --tasks 200 --workers 2 --concurrency 4
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+from benchmarks.itf_stub import (
+    HIDDEN_PREFIX,
+    NOT_FOUND_PREFIX,
+    UTILITIES,
+    start_stub,
+    stub_url,
+)
+
+STUB_CITY = 'ереван'
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def point_itf_to_stub(port: int) -> None:
+    """ITFUrl читается из настроек при импорте, поэтому переменные
+    окружения задаются до запуска воркеров: они наследуют окружение
+    и импортируют настройки уже с адресами заглушки.
+    """
+    for utility in UTILITIES:
+        os.environ[f'ITF_URL_{utility.upper()}'] = stub_url(port, utility)
+
+
+def build_accounts(
+        count: int,
+        not_found_share: float,
+        hidden_share: float,
+        seed: int,
+) -> list[dict]:
+    """Аккаунты нагрузки с заданными долями ошибочных счетов."""
+    rnd = random.Random(seed)
+    accounts = []
+    for index in range(count):
+        roll = rnd.random()
+        if roll < not_found_share:
+            account = f'{NOT_FOUND_PREFIX}{index:06d}'
+        elif roll < not_found_share + hidden_share:
+            account = f'{HIDDEN_PREFIX}{index:06d}'
+        else:
+            account = f'{index:09d}'
+        utility = UTILITIES[index % len(UTILITIES)]
+        accounts.append(dict(
+            account=account,
+            account_type='code',
+            utility=utility,
+            city=STUB_CITY if utility == 'gas' else None,
+            force_refresh=True,
+        ))
+    return accounts
+
+
+def process_tree_rss_mb(pid: int) -> float:
+    """RSS процесса и всех его потомков (Linux, /proc)."""
+    children: dict[int, list[int]] = {}
+    for entry in Path('/proc').iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / 'stat').read_text()
+        except OSError:
+            continue
+        ppid = int(stat.rsplit(')', 1)[1].split()[1])
+        children.setdefault(ppid, []).append(int(entry.name))
+    total_pages, stack = 0, [pid]
+    while stack:
+        current = stack.pop()
+        try:
+            total_pages += int(
+                Path(f'/proc/{current}/statm').read_text().split()[1],
+            )
+        except OSError:
+            continue
+        stack.extend(children.get(current, []))
+    return total_pages * PAGE_SIZE / 1024 / 1024
+
+
+async def run_parser_item(data: dict) -> None:
+    """Парсинг одного аккаунта напрямую через Parser."""
+    from services.parser.app import Parser
+
+    await Parser(message_data=data).run()
+
+
+async def run_pipeline_item(data: dict) -> None:
+    """Парсинг одного аккаунта через задачу в Redis."""
+    from services.utils import create_new_task
+    from workers.tasks import start_parsing
+
+    task_id = f'bench-{uuid.uuid4().hex[:8]}'
+    await create_new_task(task_id, dict(
+        tg_id='bench',
+        job_status='processing',
+        data=[{
+            key: value for key, value in data.items()
+            if key != 'force_refresh'
+        }],
+    ))
+    await start_parsing(task_id, data)
+
+
+async def run_load(
+        accounts: list[dict],
+        mode: str,
+        concurrency: int,
+        http_enabled: bool,
+) -> dict:
+    """Прогоняет аккаунты с ограничением конкурентности."""
+    import services.parser.config as conf
+    from services.parser.browser_pool import browser_pool
+
+    conf.PROXY_ENABLED = False
+    conf.ITF_HTTP_ENABLED = http_enabled
+    run_item = run_parser_item if mode == 'parser' else run_pipeline_item
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    errors: Counter = Counter()
+
+    async def timed(data: dict) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await run_item(data)
+            except Exception as e:
+                errors[e.__class__.__name__] += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*[timed(data) for data in accounts])
+    finally:
+        rss_mb = process_tree_rss_mb(os.getpid())
+        await browser_pool.close()
+    return dict(
+        latencies=latencies,
+        errors=dict(errors),
+        elapsed=time.perf_counter() - started,
+        rss_mb=rss_mb,
+    )
+
+
+def worker_main(
+        accounts: list[dict],
+        mode: str,
+        concurrency: int,
+        http_enabled: bool,
+) -> dict:
+    """Точка входа процесса-воркера бенчмарка."""
+    return asyncio.run(run_load(accounts, mode, concurrency, http_enabled))
+
+
+def percentile(values: list[float], percent: int) -> float:
+    """Перцентиль выборки; для одного значения — само значение."""
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100)[percent - 1]
+
+
+def print_report(args: argparse.Namespace, results: list[dict]) -> None:
+    """Печатает задержки, пропускную способность и ошибки."""
+    latencies = [value for result in results for value in result['latencies']]
+    errors: Counter = Counter()
+    for result in results:
+        errors.update(result['errors'])
+    elapsed = max(result['elapsed'] for result in results)
+    print(
+        f'режим: {args.mode}, http: {args.http}, воркеров: {args.workers}, '
+        f'конкурентность: {args.concurrency}, задач: {len(latencies)}',
+    )
+    print(
+        f'p50: {percentile(latencies, 50):.0f} мс, '
+        f'p95: {percentile(latencies, 95):.0f} мс, '
+        f'задач/с: {len(latencies) / elapsed:.2f}',
+    )
+    print(f'ошибки: {dict(errors) or "нет"}')
+    for number, result in enumerate(results, start=1):
+        print(f'воркер {number}: RSS {result["rss_mb"]:.0f} МБ')
+
+
+async def main(args: argparse.Namespace) -> None:
+    """Поднимает заглушку и запускает воркеры бенчмарка."""
+    point_itf_to_stub(args.port)
+    runner = await start_stub(args.port, args.delay_ms)
+    accounts = build_accounts(
+        args.tasks,
+        args.not_found_share,
+        args.hidden_share,
+        args.seed,
+    )
+    chunks = [accounts[index::args.workers] for index in range(args.workers)]
+    loop = asyncio.get_running_loop()
+    try:
+        with ProcessPoolExecutor(
+                max_workers=args.workers,
+                mp_context=get_context('spawn'),
+        ) as executor:
+            results = await asyncio.gather(*[
+                loop.run_in_executor(
+                    executor,
+                    worker_main,
+                    chunk,
+                    args.mode,
+                    args.concurrency,
+                    args.http,
+                )
+                for chunk in chunks
+            ])
+    finally:
+        await runner.cleanup()
+    print_report(args, results)
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    arg_parser.add_argument(
+        '--mode',
+        choices=('parser', 'pipeline'),
+        default='pipeline',
+    )
+    arg_parser.add_argument('--tasks', type=int, default=60)
+    arg_parser.add_argument('--workers', type=int, default=1)
+    arg_parser.add_argument('--concurrency', type=int, default=2)
+    arg_parser.add_argument('--port', type=int, default=8089)
+    arg_parser.add_argument('--delay-ms', type=int, default=0)
+    arg_parser.add_argument('--not-found-share', type=float, default=0.1)
+    arg_parser.add_argument('--hidden-share', type=float, default=0.05)
+    arg_parser.add_argument('--seed', type=int, default=0)
+    arg_parser.add_argument(
+        '--http',
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help='пробовать HTTP-парсер ITF до Playwright',
+    )
+    asyncio.run(main(arg_parser.parse_args()))
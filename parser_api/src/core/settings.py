@@ -1,3 +1,4 @@
+from enum import Enum
 from pathlib import Path
 
 from pydantic_settings import BaseSettings
@@ -10,6 +11,17 @@ LOGS_PATH = BASEDIR_PROJECT / 'logs' / 'logs.log'
 LOGS_PATH.parent.mkdir(parents=True, exist_ok=True)
 
 
+class InputStrategy(str, Enum):
+    """Стратегия ввода текста в поля формы.
+    Объявлена здесь, а не в services.enums, чтобы настройки проверяли
+    значение при старте; services.enums реэкспортирует её.
+    """
+
+    TYPE = 'type'  # посимвольный ввод с задержкой
+    FILL = 'fill'  # одно событие input
+    HYBRID = 'hybrid'  # fill, последние символы посимвольно
+
+
 class Settings(BaseSettings):
     """Конфигурация приложения."""
 
@@ -18,6 +30,11 @@ class Settings(BaseSettings):
     redis_port: str
     redis_parser_db: int
 
+    parser_worker_concurrency: int = 1
+    parser_worker_reliable_queue: bool = True
+    parser_worker_metrics_port: int = 0
+    parser_itf_input_strategy: InputStrategy = InputStrategy.TYPE
+
     webshare_token: str
     webshare_login: str
     webshare_password: str
@@ -6,6 +6,7 @@ EXAMPLE_FULL_REQUEST = {
         'job_status': 'new',
         'notify': '1',
         'first_check': '1',
+        'force_refresh': False,
         'data': [
             {
                 'account': '123',
@@ -42,6 +43,7 @@ class SchemaTitle(str, Enum):
     DATA = 'Данные по лицевым счетам'
     NOTIFY = 'Признак уведомлений'
     FIRST_CHECK = 'Первичная проверка'
+    FORCE_REFRESH = 'Принудительное обновление'
     ACCOUNT = 'Номер лицевого счёта'
     CITY = 'Город'
     ACCOUNT_TYPE = 'Тип счёта'
@@ -56,6 +58,7 @@ class SchemaDescription(str, Enum):
     DATA = 'Список лицевых счетов, которые необходимо обработать'
     NOTIFY = 'Уведомлять пользователя о завершении задачи (1 - да, 0 - нет)'
     FIRST_CHECK = 'Флаг первичной проверки (1 - да, 0 - нет)'
+    FORCE_REFRESH = 'Игнорировать кэш результатов и запустить парсинг заново'
     ACCOUNT = 'Номер лицевого счёта в системе коммунальных служб'
     CITY = 'Название города, к которому относится лицевой счёт'
     ACCOUNT_TYPE = 'Тип счёта (например, "code" или "phone")'
@@ -69,6 +72,7 @@ class SchemaExample(str, Enum):
     JOB_STATUS = 'new'
     NOTIFY = '1'
     FIRST_CHECK = '1'
+    FORCE_REFRESH = 'false'
     ACCOUNT = '0390315'
     CITY = 'Ереван'
     ACCOUNT_TYPE = 'code'
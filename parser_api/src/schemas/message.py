@@ -82,6 +82,12 @@ class BaseMessageData(BaseModel):
         description=SchemaDescription.FIRST_CHECK.value,
         example=SchemaExample.FIRST_CHECK.value,
     )
+    force_refresh: bool = Field(
+        False,
+        title=SchemaTitle.FORCE_REFRESH.value,
+        description=SchemaDescription.FORCE_REFRESH.value,
+        example=SchemaExample.FORCE_REFRESH.value,
+    )
 
     class Config:
         extra = 'forbid'
@@ -1,13 +1,12 @@
 from enum import Enum
 
-from core.settings import settings
+from core.settings import InputStrategy, settings  # noqa: F401
 
 
 class ProxySettings(Enum):
     PROXY_TEMPLATE = 'http://{proxy_address}:{port}'
     PROXY_ATTEMPT = 5
     RETRY_TIMEOUT_PROXY_LIST = 5
-    GOOD_FAILURES = 3
 
 
 class ProxyMessage(str, Enum):
@@ -16,14 +15,47 @@ class ProxyMessage(str, Enum):
     API_ERROR = 'Ошибка при работе с API: ({e})'
     BAD_RESPONSE = 'Некорректная структура ответа: ({data})'
     PROXY_LIST_OK = 'Добавлен новый прокси лист в кэш'
-    PROXY_EMPTY_LIST_OK = 'Добавлен пустой прокси лист в кэш'
     PROXY_LIST_VALID_ERROR = 'Нет валидных прокси в списке: {proxy_list}'
+    PROXY_ALL_COOLDOWN = 'Все прокси списка {list_name} на паузе после ошибок'
+    PROXY_FAILURES_RESET = 'Сброшены ошибки прокси: {count}'
+    PROXY_PROBE_RESULT = 'Проверка прокси: рабочих {alive} из {total}'
+    PROXY_PROBE_EMPTY = (
+        'Ни один прокси не прошёл проверку, список сохранён без неё'
+    )
+    PROXY_REFRESH_ERROR = 'Ошибка обновления списка прокси: ({error})'
+    PROXY_LIST_EXTENDED = 'Продлён TTL старого списка прокси ({count} прокси)'
     PROXY_LIST_ADD_ERROR = 'Ошибка добавления списка прокси в кэш. Ошибка: ({error})'
     EMPTY_KEY = 'Пустой ключ'
     LIST_NOT_FOUND = 'Список с прокси не найден'
     PROCESSING_LIST = 'Список в процессе запроса'
 
 
+class ProxyHealth(Enum):
+    """Ключи и параметры оценки здоровья прокси."""
+
+    RECORD_KEY = '{list_name}:proxy:{proxy_id}'
+    SCORE_KEY = '{list_name}:score'
+    COOLDOWN_KEY = '{list_name}:cooldown'
+    INITIAL_SCORE = 1
+    EWMA_ALPHA = 0.3
+    LATENCY_NORM_MS = 1000
+    COOLDOWN_BASE = 30
+    COOLDOWN_MAX = 60 * 10
+    TOP_N = 10
+
+
+class ProxyRefresh(Enum):
+    """Параметры фонового обновления списка прокси."""
+
+    LOCK_KEY = '{list_name}:refresh_lock'
+    LOCK_TTL = 60 * 2
+    CHECK_INTERVAL = 30
+    REFRESH_BEFORE = 60 * 5
+    PROBE_URL = 'https://api64.ipify.org?format=json'
+    PROBE_TIMEOUT = 5
+    PROBE_CONCURRENCY = 20
+
+
 class WebshareProxy(Enum):
     TOKEN = settings.webshare_token
     URL_LIST = settings.webshare_url_list
@@ -55,6 +87,60 @@ class TTL(int, Enum):
     PROXY_LIST = 60 * 15
 
 
+class TaskField(str, Enum):
+    """Поля хэша задачи в Redis."""
+
+    DATA = 'data'
+    JOB_STATUS = 'job_status'
+    ACCOUNTS = 'accounts'
+    REMAINING = 'remaining'
+    ACCOUNT_PREFIX = 'account:'
+
+
+class TaskEvent(str, Enum):
+    """Каналы событий задач."""
+
+    COMPLETE_CHANNEL = 'task_complete:{task_id}'
+
+
+class ResultWait(int, Enum):
+    """Ограничения ожидания результата задачи."""
+
+    MAX_SECONDS = 60
+
+
+class ResultCacheKey(str, Enum):
+    """Ключи кэша, блокировки и канала результата парсинга."""
+
+    TEMPLATE = 'parse_result:{utility}:{account}:{city}'
+    LOCK_TEMPLATE = 'parse_lock:{utility}:{account}:{city}'
+    CHANNEL_TEMPLATE = 'parse_done:{utility}:{account}:{city}'
+
+
+class MetricPhase(str, Enum):
+    """Фазы парсинга для метрик."""
+
+    PROXY_PICK = 'proxy_pick'
+    HTTP_FAST_PATH = 'http_fast_path'
+    CONTEXT_ACQUIRE = 'context_acquire'
+    GOTO = 'goto'
+    FORM_FILL = 'form_fill'
+    RESULT_WAIT = 'result_wait'
+    EXTRACTION = 'extraction'
+    CACHE_LOOKUP = 'cache_lookup'
+    REDIS_PATCH = 'redis_patch'
+    TASK = 'task'
+
+
+class ParseOutcome(str, Enum):
+    """Итоги ввода и парсинга для метрик."""
+
+    COMPLETE = 'complete'
+    NOT_FOUND = 'not_found'
+    SELECTOR_ERROR = 'selector_error'
+    ERROR = 'error'
+
+
 class AccountType(Enum):
     CODE = 'code'
     PHONE = 'phone'
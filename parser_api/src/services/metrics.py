@@ -0,0 +1,95 @@
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+from core.logger_settings import logger
+
+PHASE_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1, 2.5, 5, 10, 20, 30, 60, 120,
+)
+
+PHASE_SECONDS = Histogram(
+    'parser_phase_seconds',
+    'Длительность фаз парсинга',
+    ['phase'],
+    buckets=PHASE_BUCKETS,
+)
+TASKS_TOTAL = Counter(
+    'parser_tasks_total',
+    'Обработанные подзадачи парсинга',
+    ['utility', 'status'],
+)
+ERRORS_TOTAL = Counter(
+    'parser_errors_total',
+    'Ошибки парсинга по классу исключения',
+    ['error'],
+)
+PROXY_FAILURES_TOTAL = Counter(
+    'parser_proxy_failures_total',
+    'Ошибки перехода через прокси',
+)
+INPUT_SECONDS = Histogram(
+    'parser_input_seconds',
+    'Длительность ввода в поле формы по стратегии',
+    ['strategy'],
+    buckets=PHASE_BUCKETS,
+)
+INPUT_OUTCOMES_TOTAL = Counter(
+    'parser_input_outcomes_total',
+    'Исходы парсинга по сайту и стратегии ввода',
+    ['site', 'strategy', 'outcome'],
+)
+
+
+@contextmanager
+def track_phase(phase: str) -> Iterator[None]:
+    """Замеряет длительность фазы и пишет её в гистограмму."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        PHASE_SECONDS.labels(phase=phase).observe(elapsed)
+        logger.debug(f'Фаза {phase}: {elapsed:.3f} с')
+
+
+def record_task(utility: str | None, status: str) -> None:
+    """Учитывает завершённую задачу по услуге и статусу."""
+    TASKS_TOTAL.labels(utility=utility or 'unknown', status=status).inc()
+
+
+def record_error(exception: BaseException) -> None:
+    """Учитывает ошибку по имени класса исключения."""
+    ERRORS_TOTAL.labels(error=exception.__class__.__name__).inc()
+
+
+def record_input_outcome(site: str, strategy: str, outcome: str) -> None:
+    """Учитывает итог ввода по сайту и стратегии."""
+    INPUT_OUTCOMES_TOTAL.labels(
+        site=site,
+        strategy=strategy,
+        outcome=outcome,
+    ).inc()
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Текущие метрики в формате Prometheus.
+    Если задан PROMETHEUS_MULTIPROC_DIR, собираются метрики всех
+    процессов (API и воркеры на одном хосте), иначе — текущего.
+    """
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
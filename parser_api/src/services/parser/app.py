@@ -1,38 +1,46 @@
+import asyncio
 import re
+import time
 from enum import Enum
 
-from playwright.async_api import async_playwright
+import aiohttp
 from tenacity import (
     RetryError,
     retry,
     stop_after_attempt,
 )
 
+import services.parser.config as conf
 from core.exceptions import (
-    ApiProcessingException,
     ApiProxyListError,
+    ITFUrl404,
     PageError,
     ProxyList404,
+    Selector404,
     UrlFlagError,
 )
 from core.logger_settings import logger
 from core.settings import settings
-from services.enums import ProxySettings, WebshareProxy
+from services.enums import MetricPhase, ProxySettings, WebshareProxy
+from services.metrics import track_phase
 from services.parser.base import InitParser
+from services.parser.browser_pool import browser_pool
 from services.parser.proxy import (
-    add_proxy_list_in_cash,
-    create_empty_proxy_list_in_cash,
-    get_api_proxy_list_with_retry,
     get_random_proxy_from_cash,
     increase_proxy_failures,
+    record_proxy_success,
+    reset_proxy_failures,
 )
 from services.parser.sites.ConverseBank.parser import (
     CONVERSE_BANK_FLAG,
     ParserConverseBank,
 )
+from services.parser.sites.ITF.http_parser import ParserITFHttp
 from services.parser.sites.ITF.parser import ITF_FLAG, ParserITF
 from services.parser.sites.ITF.urls import ITFUrl
 
+DIRECT_CONTEXT_KEY = 'direct'
+
 
 class Parser(InitParser):
     @staticmethod
@@ -62,6 +70,129 @@ class Parser(InitParser):
             raise ValueError(f'Нет обработчика для типа {parser_type}')
         return parser_class(data)
 
+    @property
+    def proxy_server(self) -> str | None:
+        """Адрес выбранного прокси или None."""
+        return self.proxy.get('server') if self.proxy else None
+
+    async def select_proxy(self) -> str | None:
+        """Выбирает случайный прокси из кэша и заполняет self.proxy.
+        Если списка прокси ещё нет, парсим без прокси: список
+        загружает фоновый ProxyRefresher.
+        Если все прокси на паузе, их ошибки сбрасываются для следующих
+        попыток, а текущая идёт без прокси.
+        Возвращает id выбранного прокси.
+        """
+        if not conf.PROXY_ENABLED:
+            self.proxy = None
+            return None
+        try:
+            raw_proxy = await get_random_proxy_from_cash(
+                WebshareProxy.LIST_NAME.value,
+            )
+        except ProxyList404 as e:
+            logger.info(e.__class__.__name__)
+            self.proxy = None
+            return None
+        except ApiProxyListError as e:
+            logger.info(e.__class__.__name__)
+            self.proxy = None
+            await reset_proxy_failures(WebshareProxy.LIST_NAME.value)
+            return None
+        self.proxy = {
+            'server': ProxySettings.PROXY_TEMPLATE.value.format(
+                proxy_address=raw_proxy.get('proxy_address'),
+                port=raw_proxy.get('port'),
+            ),
+            'username': settings.webshare_login,
+            'password': settings.webshare_password,
+        }
+        return raw_proxy.get('id')
+
+    async def run_http(self, message_data: dict = None) -> dict | None:
+        """Быстрый путь без браузера через HTTP-парсер ITF.
+        Возвращает None, если нужно перейти на Playwright.
+        Сетевые ошибки и ответы не 200 засчитываются прокси как сбой.
+        """
+        message_data = message_data or self.message_data
+        if not conf.ITF_HTTP_ENABLED:
+            return None
+        if message_data.get('utility') not in ParserITFHttp.form_fields:
+            return None
+        with track_phase(MetricPhase.PROXY_PICK.value):
+            proxy_id = await self.select_proxy()
+        http_parser = ParserITFHttp(message_data)
+        http_parser.proxy = self.proxy
+        started = time.monotonic()
+        try:
+            with track_phase(MetricPhase.HTTP_FAST_PATH.value):
+                data = await http_parser.get_data()
+            await record_proxy_success(
+                proxy_id,
+                WebshareProxy.LIST_NAME.value,
+                (time.monotonic() - started) * 1000,
+            )
+            return data
+        except (aiohttp.ClientError, asyncio.TimeoutError, PageError) as e:
+            logger.warning(
+                f'HTTP-парсер: ошибка сети ({e.__class__.__name__}: '
+                f'{str(e)}), переход на Playwright.',
+            )
+            await increase_proxy_failures(
+                proxy_id=proxy_id,
+                proxy_list_name=WebshareProxy.LIST_NAME.value,
+            )
+            return None
+        except Exception as e:
+            logger.warning(
+                f'HTTP-парсер не сработал ({e.__class__.__name__}: {str(e)}), '
+                f'переход на Playwright.',
+            )
+            return None
+
+    async def open_site(self, urls: list[str]) -> tuple[str, float]:
+        """Переходит на страницу сайта в текущей вкладке.
+        Возвращает url и время перехода в мс.
+        """
+        started = time.monotonic()
+        for url in urls:
+            try:
+                with track_phase(MetricPhase.GOTO.value):
+                    await self.retry_goto(url)
+                logger.info(f'Успешный переход по: {url}')
+                return url, (time.monotonic() - started) * 1000
+            except RetryError as e:
+                error_message = (
+                    f'(Proxy: {self.proxy_server}) '
+                    f'Не удалось перейти по {url} '
+                    f'после 3 попыток: {str(e)}',
+                )
+                logger.warning(error_message)
+                raise PageError(error_message)
+        raise PageError('Нет адресов для перехода.')
+
+    async def parse_in_session(self, message_data: dict) -> dict:
+        """Парсит один счёт в уже открытой вкладке:
+        переходит на форму услуги и передаёт вкладку парсеру сайта.
+        Selector404 повторяется с новым переходом, как в одиночном режиме.
+        """
+        urls = self.get_map_urls(
+            [ITFUrl],
+            'to_utility_url',
+            message_data.get('utility'),
+        )
+        for attempt in range(conf.BULK_SELECTOR_ATTEMPTS):
+            url, _ = await self.open_site(urls)
+            parser = self.get_parser(self.detect_url_flag(url), message_data)
+            parser.context = self.context
+            parser.page = self.page
+            try:
+                return await parser.get_data()
+            except Selector404:
+                if attempt + 1 == conf.BULK_SELECTOR_ATTEMPTS:
+                    raise
+        raise Selector404
+
     async def run(self):
         """Основная логика работы парсера."""
         urls = self.get_map_urls(
@@ -71,62 +202,25 @@ class Parser(InitParser):
             'to_utility_url',
             self.utility,
         )
+        http_data = await self.run_http()
+        if http_data is not None:
+            return http_data
         for attempt in range(ProxySettings.PROXY_ATTEMPT.value):
+            with track_phase(MetricPhase.PROXY_PICK.value):
+                proxy_id = await self.select_proxy()
+            logger.info(
+                f'Попытка №{attempt + 1} '
+                f'с прокси: {self.proxy_server}',
+            )
             try:
-                raw_proxy = await get_random_proxy_from_cash(
-                    WebshareProxy.LIST_NAME.value,
-                )
-                proxy_address = raw_proxy.get('proxy_address')
-                proxy_port = raw_proxy.get('port')
-                proxy_id = raw_proxy.get('id')
-                proxy_server = ProxySettings.PROXY_TEMPLATE.value.format(
-                    proxy_address=proxy_address,
-                    port=proxy_port,
-                )
-                logger.info(
-                    f'Попытка №{attempt + 1} '
-                    f'с прокси: {proxy_server}',
-                )
-            except ProxyList404 as e:
-                logger.info(e.__class__.__name__)
-                self.proxy = None
-                await create_empty_proxy_list_in_cash(
-                    WebshareProxy.LIST_NAME.value,
-                )
-                proxy_list = await get_api_proxy_list_with_retry()
-                if proxy_list:
-                    await add_proxy_list_in_cash(
-                        proxy_list,
-                        WebshareProxy.LIST_NAME.value,
-                    )
-            except (ApiProxyListError, ApiProcessingException) as e:
-                logger.info(e.__class__.__name__)
-                self.proxy = None
-            else:
-                self.proxy = {
-                    'server': proxy_server,
-                    'username': settings.webshare_login,
-                    'password': settings.webshare_password,
-                }
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=self.headless_config)
-                try:
-                    await self.init_header(browser)
+                async with browser_pool.context_lease(
+                        self.proxy_server or DIRECT_CONTEXT_KEY,
+                        self.init_header,
+                        self.headless_config,
+                ) as context:
+                    self.context = context
                     self.page = await self.context.new_page()
-
-                    for url in urls:
-                        try:
-                            await self.retry_goto(url)
-                            logger.info(f'Успешный переход по: {url}')
-                            break
-                        except RetryError as e:
-                            error_message = (
-                                f'(Proxy: {self.proxy['server']}) '
-                                f'Не удалось перейти по {url} '
-                                f'после 3 попыток: {str(e)}',
-                            )
-                            logger.warning(error_message)
-                            raise PageError(error_message)
+                    url, goto_latency = await self.open_site(urls)
                     try:
                         cookies = await self.context.cookies()
                         await self.context.add_cookies(cookies)
@@ -140,21 +234,120 @@ class Parser(InitParser):
                     parser.context = self.context
                     parser.page = self.page
                     data = await parser.get_data()
-                    await self.context.clear_cookies()
-                    await browser.close()
+                    await record_proxy_success(
+                        proxy_id,
+                        WebshareProxy.LIST_NAME.value,
+                        goto_latency,
+                    )
                     logger.info('Парсер завершил работу.')
                     return data
-                except PageError as e:
-                    logger.warning(f'Ошибка PageError: {str(e)}')
-                    await browser.close()
-                    await increase_proxy_failures(
-                        proxy_id=str(proxy_id),  # noqa
-                        proxy_list_name=WebshareProxy.LIST_NAME.value,
-                    )
-                    logger.info(f'Счётчик ошибок прокси {proxy_id} увеличен.')
-                    continue
+            except PageError as e:
+                logger.warning(f'Ошибка PageError: {str(e)}')
+                await increase_proxy_failures(
+                    proxy_id=proxy_id,
+                    proxy_list_name=WebshareProxy.LIST_NAME.value,
+                )
+                logger.info(f'Счётчик ошибок прокси {proxy_id} увеличен.')
+                continue
+            finally:
+                self.context = None
+                self.page = None
         raise PageError('Не удалось выполнить парсинг ни с одним из прокси')
 
+    async def run_bulk(
+            self,
+            accounts: list[dict],
+    ) -> list[dict | Exception]:
+        """Парсит несколько счетов одного сайта в одной сессии браузера:
+        один прокси, один контекст и одна вкладка на все счета,
+        между счетами меняется только форма услуги.
+        Сначала для каждого счёта пробуется HTTP-путь.
+        Возвращает результат или исключение для каждого счёта по порядку.
+        При ошибке перехода (PageError) необработанные счета
+        продолжаются со следующим прокси.
+        """
+        results: list[dict | Exception | None] = [
+            await self.run_http(message_data) for message_data in accounts
+        ]
+        pending = [
+            index for index, result in enumerate(results) if result is None
+        ]
+        for attempt in range(ProxySettings.PROXY_ATTEMPT.value):
+            if not pending:
+                break
+            with track_phase(MetricPhase.PROXY_PICK.value):
+                proxy_id = await self.select_proxy()
+            logger.info(
+                f'Пакетная попытка №{attempt + 1} '
+                f'({len(pending)} счетов) с прокси: {self.proxy_server}',
+            )
+            started = time.monotonic()
+            parsed = 0
+            try:
+                async with browser_pool.context_lease(
+                        self.proxy_server or DIRECT_CONTEXT_KEY,
+                        self.init_header,
+                        self.headless_config,
+                ) as context:
+                    self.context = context
+                    self.page = await self.context.new_page()
+                    while pending:
+                        index = pending[0]
+                        try:
+                            results[index] = await self.parse_in_session(
+                                accounts[index],
+                            )
+                        except PageError:
+                            raise
+                        except Exception as e:
+                            results[index] = e
+                        pending.pop(0)
+                        parsed += 1
+                    await record_proxy_success(
+                        proxy_id,
+                        WebshareProxy.LIST_NAME.value,
+                        (time.monotonic() - started) * 1000 / max(parsed, 1),
+                    )
+            except PageError as e:
+                logger.warning(f'Ошибка PageError: {str(e)}')
+                await increase_proxy_failures(
+                    proxy_id=proxy_id,
+                    proxy_list_name=WebshareProxy.LIST_NAME.value,
+                )
+                logger.info(f'Счётчик ошибок прокси {proxy_id} увеличен.')
+                continue
+            finally:
+                self.context = None
+                self.page = None
+        for index in pending:
+            results[index] = PageError(
+                'Не удалось выполнить парсинг ни с одним из прокси',
+            )
+        logger.info(f'Пакетный парсинг завершён: {len(accounts)} счетов.')
+        return results
+
+    @classmethod
+    def site_key(cls, message_data: dict) -> str:
+        """Флаг сайта, на котором парсится счёт.
+        Счета с неизвестной услугой получают собственный ключ.
+        """
+        try:
+            url = ITFUrl.to_utility_url(message_data.get('utility'))
+            return cls.detect_url_flag(url)
+        except (ITFUrl404, UrlFlagError):
+            utility = message_data.get('utility')
+            return f'{utility}:{message_data.get("account")}'
+
+    @classmethod
+    def group_by_site(cls, accounts: list[dict]) -> list[list[dict]]:
+        """Группирует счета задачи по сайту с сохранением порядка."""
+        groups: dict[str, list[dict]] = {}
+        for message_data in accounts:
+            groups.setdefault(cls.site_key(message_data), []).append(
+                message_data,
+            )
+        return list(groups.values())
+
 
 PARSER_CLASSES = {
     ITF_FLAG: ParserITF,
@@ -1,14 +1,23 @@
 import asyncio
-import json
 import random
+import time
 from dataclasses import dataclass
 
-import aiofiles
-from playwright.async_api import BrowserContext, Error, Page, TimeoutError
+from playwright.async_api import (
+    BrowserContext,
+    Error,
+    Page,
+    Route,
+    TimeoutError,
+)
 
 import services.parser.config as conf
 from core.exceptions import ParserError
 from core.logger_settings import logger
+from services.enums import InputStrategy
+from services.metrics import INPUT_SECONDS
+from services.parser.fingerprints import fingerprint_pool
+from services.parser.static_cache import static_asset_cache
 
 
 @dataclass
@@ -23,8 +32,8 @@ class InitParser:
     headless_config: bool = None
     context: BrowserContext = None
     page: Page = None
-    block_resource: list = None
     check_timeout: bool = conf.USUAL_CHECK_TIMEOUT
+    input_strategy: str = InputStrategy.TYPE.value
     playwright_errors: tuple = (Error, TimeoutError, Exception)
 
     def __post_init__(self):
@@ -33,7 +42,6 @@ class InitParser:
         self.account_type = self.message_data.get('account_type')
         self.utility = self.message_data.get('utility')
         self.viewport = random.choice(conf.BROWSER_VIEWPORT)
-        self.block_resource = conf.BLOCK_BROWSER_RESOURCES
         self.headless_config = True  # todo убрать в проде
         # self.headless_config = False if settings.debug else True
         if self.message_data.get('first_check'):
@@ -41,14 +49,28 @@ class InitParser:
 
     @staticmethod
     async def get_random_user_agent():
-        """Читаем файл 'user_agent.json' и выбираем рандомный юзер агент."""
-        async with aiofiles.open(
-                conf.USER_AGENT_PATH,
-                mode='r',
-                encoding='utf-8',
-        ) as file:
-            content = await file.read()
-            return random.choice(json.loads(content))
+        """Выбираем рандомный юзер агент из кэша 'user_agent.json'."""
+        return await fingerprint_pool.random_user_agent()
+
+    async def enter_text(self, selector: str, text: str) -> None:
+        """Вводит текст в поле по стратегии self.input_strategy:
+        type — посимвольно с задержкой, fill — одним событием input,
+        hybrid — fill без последних HYBRID_TYPED_CHARS символов,
+        которые затем набираются посимвольно.
+        """
+        started = time.perf_counter()
+        delay = random.randint(*conf.TYPE_DELAY_MS)
+        if self.input_strategy == InputStrategy.FILL.value:
+            await self.page.fill(selector, text)
+        elif self.input_strategy == InputStrategy.HYBRID.value:
+            split = max(len(text) - conf.HYBRID_TYPED_CHARS, 0)
+            await self.page.fill(selector, text[:split])
+            await self.page.type(selector, text[split:], delay=delay)
+        else:
+            await self.page.type(selector, text, delay=delay)
+        INPUT_SECONDS.labels(strategy=self.input_strategy).observe(
+            time.perf_counter() - started,
+        )
 
     async def random_move_mouse(self):
         """Рандомное поведение мышки с небольшой задержкой."""
@@ -57,39 +79,44 @@ class InitParser:
 
     @staticmethod
     def random_init_script():
-        """Задаем рандомные данные в строку скрипта для браузера, данные в config."""
-        script = """
-        Object.defineProperty(navigator, 'webdriver', {get: () => !webdriver!});
-        Object.defineProperty(navigator, 'plugins', {get: () => !plugins!});
-        Object.defineProperty(navigator, 'languages', {get: () => !languages!});
-        """
-        return (
-            script.replace(
-                '!webdriver!', random.choice(conf.WEBDRIVER),
-            ).replace(
-                '!plugins!', str(conf.PLUGINS[:random.randint(1, len(conf.PLUGINS))]),
-            ).replace(
-                '!languages!', str(random.sample(conf.LANGUAGES, k=2)),
-            )
-        )
+        """Рандомный вариант скрипта для браузера, данные в config."""
+        return fingerprint_pool.random_init_script()
 
-    async def block_resources(self, route, request):
-        """Блокирует загрузку определённых типов ресурсов на странице.
-        Если тип ресурса (например, 'image', 'stylesheet', 'font') содержится
-        в self.block_resource, то запрос будет отменён (abort), иначе продолжен.
+    @staticmethod
+    async def abort_route(route: Route) -> None:
+        """Отменяет запрос."""
+        await route.abort()
+
+    @staticmethod
+    async def continue_route(route: Route) -> None:
+        """Пропускает запрос в сеть."""
+        await route.continue_()
+
+    async def setup_routes(self) -> None:
+        """Регистрирует маршруты контекста без общего обработчика:
+        картинки, шрифты, медиа и трекеры отменяются по шаблонам,
+        статика сайта отдаётся из дискового кэша, allow-шаблоны
+        пропускают запрос в обход остальных правил.
+        Запросы без совпадений уходят в сеть без вызова Python.
+        Playwright проверяет маршруты в обратном порядке регистрации.
         """
-        if request.resource_type in self.block_resource:
-            await route.abort()
-        else:
-            await route.continue_()
+        await self.context.route(conf.ROUTE_BLOCK_PATTERN, self.abort_route)
+        for pattern in conf.ROUTE_DENY_PATTERNS:
+            await self.context.route(pattern, self.abort_route)
+        await self.context.route(
+            conf.STATIC_CACHE_PATTERN,
+            static_asset_cache.handle,
+        )
+        for pattern in conf.ROUTE_ALLOW_PATTERNS:
+            await self.context.route(pattern, self.continue_route)
 
-    async def init_header(self, browser):
+    async def init_header(self, browser) -> BrowserContext:
         """Инициализирует новый браузерный контекст со случайным user-agent
-        и параметрами прокси/размера экрана.
+        и параметрами прокси/размера экрана и возвращает его.
         Создаёт контекст с кастомным user-agent, размером окна
         и прокси (если указан).
         Добавляет скрипт для инициализации
-        и роутинг для блокировки лишних ресурсов.
+        и маршруты для блокировки лишних ресурсов и кэша статики.
         В случае ошибки логирует её и выбрасывает ParserError.
         """
         try:
@@ -99,7 +126,7 @@ class InitParser:
                 viewport=self.viewport,
                 proxy=self.proxy,
             )
-            await self.context.route('**/*', self.block_resources)
+            await self.setup_routes()
             await self.context.add_init_script(self.random_init_script())
         except self.playwright_errors as e:
             error_message = f'Ошибка при формировании контекста с заголовками: {str(e)}'
@@ -110,5 +137,6 @@ class InitParser:
                 f'Запущен парсер с параметрами: '
                 f'user_agent={user_agent}, '
                 f'viewport={self.viewport}, '
-                f'proxy={self.proxy.get('server') if self.proxy else None}',
+                f'proxy={self.proxy.get("server") if self.proxy else None}',
             )
+            return self.context
@@ -0,0 +1,257 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Awaitable, Callable
+
+from playwright.async_api import (
+    Browser,
+    BrowserContext,
+    Error,
+    Playwright,
+    async_playwright,
+)
+
+import services.parser.config as conf
+from core.exceptions import Account404
+from core.logger_settings import logger
+from services.enums import MetricPhase
+from services.metrics import track_phase
+
+
+@dataclass
+class PooledBrowser:
+    """Браузер из пула и его счётчики использования."""
+
+    browser: Browser
+    uses: int = 0
+    active: int = 0
+    retired: bool = False
+
+    @property
+    def is_alive(self) -> bool:
+        """Браузер подключён и не выведен из пула."""
+        return not self.retired and self.browser.is_connected()
+
+
+@dataclass
+class PooledContext:
+    """Контекст браузера, закреплённый за прокси, и его счётчики."""
+
+    context: BrowserContext
+    browser: PooledBrowser
+    key: str
+    uses: int = 1
+    created_at: float = field(default_factory=time.monotonic)
+
+    def is_usable(self, max_uses: int, max_age: int) -> bool:
+        """Контекст можно выдать повторно."""
+        return (
+            self.browser.is_alive
+            and self.uses < max_uses
+            and time.monotonic() - self.created_at < max_age
+        )
+
+
+@dataclass
+class BrowserPool:
+    """Долгоживущий пул браузеров Chromium в рамках процесса воркера.
+
+    Браузер запускается один раз и переиспользуется между задачами,
+    каждая задача получает на нём свой свежий BrowserContext.
+    Браузер выводится из пула после max_uses выдач или при падении
+    и закрывается, когда на нём не остаётся активных контекстов.
+
+    Контексты закреплены за прокси: после задачи контекст с очищенными
+    cookies возвращается в пул и выдаётся следующей задаче с тем же
+    прокси, пока не исчерпает context_max_uses или context_max_age.
+    """
+
+    size: int = conf.BROWSER_POOL_SIZE
+    max_uses: int = conf.BROWSER_MAX_USES
+    context_max_uses: int = conf.CONTEXT_MAX_USES
+    context_max_age: int = conf.CONTEXT_MAX_AGE
+    context_idle_limit: int = conf.CONTEXT_IDLE_LIMIT
+    playwright: Playwright = None
+    browsers: list[PooledBrowser] = field(default_factory=list)
+    idle_contexts: list[PooledContext] = field(default_factory=list)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    async def launch(self, headless: bool) -> PooledBrowser:
+        """Запускает новый браузер."""
+        if self.playwright is None:
+            self.playwright = await async_playwright().start()
+        browser = await self.playwright.chromium.launch(headless=headless)
+        logger.info('Запущен новый браузер в пуле.')
+        return PooledBrowser(browser=browser)
+
+    @staticmethod
+    async def close_browser(pooled: PooledBrowser) -> None:
+        """Закрывает браузер, ошибки только логируются."""
+        try:
+            await pooled.browser.close()
+        except Exception as e:
+            logger.warning(f'Ошибка при закрытии браузера: {str(e)}')
+        else:
+            logger.info(
+                f'Браузер выведен из пула после {pooled.uses} использований.',
+            )
+
+    async def retire_browsers(self) -> None:
+        """Помечает отработавшие и упавшие браузеры,
+        закрывает те из них, на которых нет активных контекстов.
+        """
+        for pooled in self.browsers:
+            if pooled.uses >= self.max_uses:
+                pooled.retired = True
+            elif not pooled.browser.is_connected():
+                logger.warning('Браузер в пуле потерял соединение.')
+                pooled.retired = True
+        self.idle_contexts = [
+            pooled_context for pooled_context in self.idle_contexts
+            if pooled_context.browser.is_alive
+        ]
+        for pooled in [b for b in self.browsers if b.retired]:
+            if pooled.active == 0:
+                self.browsers.remove(pooled)
+                await self.close_browser(pooled)
+
+    async def acquire(self, headless: bool) -> PooledBrowser:
+        """Выдаёт браузер из пула, при нехватке запускает новый."""
+        async with self.lock:
+            await self.retire_browsers()
+            alive = [b for b in self.browsers if b.is_alive]
+            if len(alive) < self.size:
+                pooled = await self.launch(headless)
+                self.browsers.append(pooled)
+            else:
+                pooled = min(alive, key=lambda b: b.active)
+            pooled.uses += 1
+            pooled.active += 1
+            return pooled
+
+    @staticmethod
+    async def close_context(pooled_context: PooledContext) -> None:
+        """Закрывает контекст, ошибки только логируются."""
+        try:
+            await pooled_context.context.close()
+        except Error as e:
+            logger.warning(f'Ошибка при закрытии контекста: {str(e)}')
+
+    async def take_context(self, key: str) -> PooledContext | None:
+        """Забирает из пула свободный контекст для прокси key.
+        Отработавшие контексты этого прокси закрываются.
+        """
+        stale = []
+        found = None
+        async with self.lock:
+            for pooled_context in list(self.idle_contexts):
+                if pooled_context.key != key:
+                    continue
+                self.idle_contexts.remove(pooled_context)
+                if pooled_context.is_usable(
+                        self.context_max_uses,
+                        self.context_max_age,
+                ):
+                    found = pooled_context
+                    break
+                stale.append(pooled_context)
+            if found is not None:
+                found.uses += 1
+                found.browser.uses += 1
+                found.browser.active += 1
+        for pooled_context in stale:
+            await self.close_context(pooled_context)
+        return found
+
+    async def put_context(
+            self,
+            pooled_context: PooledContext,
+            reusable: bool,
+    ) -> None:
+        """Возвращает контекст в пул после задачи: закрывает страницы
+        и очищает cookies. Контекст закрывается, если задача упала
+        или у него исчерпан лимит использований.
+        """
+        evicted = []
+        if reusable and pooled_context.is_usable(
+                self.context_max_uses,
+                self.context_max_age,
+        ):
+            try:
+                for page in pooled_context.context.pages:
+                    await page.close()
+                await pooled_context.context.clear_cookies()
+            except Error as e:
+                logger.warning(f'Ошибка при очистке контекста: {str(e)}')
+                reusable = False
+        else:
+            reusable = False
+        if not reusable:
+            await self.close_context(pooled_context)
+        async with self.lock:
+            if reusable:
+                self.idle_contexts.append(pooled_context)
+                evicted = self.idle_contexts[:-self.context_idle_limit]
+                del self.idle_contexts[:-self.context_idle_limit]
+            pooled_context.browser.active -= 1
+            await self.retire_browsers()
+        for pooled_context in evicted:
+            await self.close_context(pooled_context)
+
+    async def release(self, pooled: PooledBrowser) -> None:
+        """Возвращает браузер в пул."""
+        async with self.lock:
+            pooled.active -= 1
+            await self.retire_browsers()
+
+    @asynccontextmanager
+    async def context_lease(
+            self,
+            key: str,
+            factory: Callable[[Browser], Awaitable[BrowserContext]],
+            headless: bool = True,
+    ) -> AsyncIterator[BrowserContext]:
+        """Выдаёт контекст, закреплённый за прокси key, на время задачи.
+        Если свободного контекста нет, он создаётся через factory
+        на браузере из пула. Контекст переиспользуется, только если
+        задача завершилась без ошибки или счёт не найден.
+        """
+        with track_phase(MetricPhase.CONTEXT_ACQUIRE.value):
+            pooled_context = await self.take_context(key)
+            if pooled_context is None:
+                pooled = await self.acquire(headless)
+                try:
+                    context = await factory(pooled.browser)
+                except BaseException:
+                    await self.release(pooled)
+                    raise
+                pooled_context = PooledContext(
+                    context=context,
+                    browser=pooled,
+                    key=key,
+                )
+        reusable = True
+        try:
+            yield pooled_context.context
+        except Account404:
+            raise
+        except BaseException:
+            reusable = False
+            raise
+        finally:
+            await self.put_context(pooled_context, reusable)
+
+    async def close(self) -> None:
+        """Закрывает все браузеры пула и останавливает playwright."""
+        async with self.lock:
+            self.idle_contexts.clear()
+            for pooled in self.browsers:
+                await self.close_browser(pooled)
+            self.browsers.clear()
+            if self.playwright is not None:
+                await self.playwright.stop()
+                self.playwright = None
+
+
+browser_pool = BrowserPool()
@@ -1,16 +1,64 @@
+import re
+
 from core.settings import BASEDIR_PROJECT
 
 USER_AGENT_FILE_NAME = 'user_agent.json'
 USER_AGENT_PATH = BASEDIR_PROJECT / 'services/parser/data' / USER_AGENT_FILE_NAME
+FINGERPRINT_RELOAD_INTERVAL = 60
 
 BROWSER_VIEWPORT = [{'width': 1280, 'height': 720}]
 WEBDRIVER = ['undefined', 'null', 'false']
 PLUGINS = [1, 2, 3, 4, 5]
-BLOCK_BROWSER_RESOURCES = [
-    'image',
-    'font',
-    'media',
+# Картинки, шрифты и медиа не загружаются браузером: маршрут по
+# расширению пути отменяет их без обработчика на каждый запрос.
+ROUTE_BLOCK_EXTENSIONS = (
+    'png', 'jpg', 'jpeg', 'gif', 'webp', 'avif', 'svg', 'ico', 'bmp',
+    'woff', 'woff2', 'ttf', 'otf', 'eot',
+    'mp4', 'webm', 'mp3', 'ogg', 'wav',
+)
+ROUTE_BLOCK_PATTERN = re.compile(
+    r'^[^?#]*\.(' + '|'.join(ROUTE_BLOCK_EXTENSIONS) + r')([?#]|$)',
+    re.IGNORECASE,
+)
+# Glob-маршруты Playwright. Allow-шаблоны имеют приоритет над deny.
+ROUTE_DENY_PATTERNS = [
+    '**/*google-analytics.com/**',
+    '**/*googletagmanager.com/**',
+    '**/*doubleclick.net/**',
+    '**/*facebook.net/**',
+    '**/mc.yandex.ru/**',
 ]
+ROUTE_ALLOW_PATTERNS = []
+# Статика, которая отдаётся из дискового кэша: хост и расширение пути
+# до query-строки, поэтому ?v=... не мешает совпадению.
+STATIC_CACHE_HOSTS = ('itfllc.am',)
+STATIC_CACHE_EXTENSIONS = ('js', 'css')
+STATIC_CACHE_PATTERN = re.compile(
+    r'^https?://([^/?#]*\.)?('
+    + '|'.join(re.escape(host) for host in STATIC_CACHE_HOSTS)
+    + r')(:\d+)?/[^?#]*\.('
+    + '|'.join(STATIC_CACHE_EXTENSIONS)
+    + r')([?#]|$)',
+    re.IGNORECASE,
+)
+STATIC_CACHE_DIR = BASEDIR_PROJECT / 'services/parser/data/static_cache'
+STATIC_CACHE_TTL = 60 * 60 * 24
+
+PROXY_ENABLED = True
+ITF_HTTP_ENABLED = False
+HTTP_TIMEOUT = 15
+
+BULK_PARSING_ENABLED = True
+BULK_SELECTOR_ATTEMPTS = 3
+
+BROWSER_POOL_SIZE = 1
+BROWSER_MAX_USES = 100
+CONTEXT_MAX_USES = 20
+CONTEXT_MAX_AGE = 60 * 10
+CONTEXT_IDLE_LIMIT = 10
+
+TYPE_DELAY_MS = (50, 100)
+HYBRID_TYPED_CHARS = 3
 
 FIRST_CHECK_TIMEOUT = 3500
 USUAL_CHECK_TIMEOUT = 500
@@ -0,0 +1,85 @@
+import itertools
+import json
+import random
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import aiofiles
+import aiofiles.os
+
+import services.parser.config as conf
+
+INIT_SCRIPT_TEMPLATE = """
+Object.defineProperty(navigator, 'webdriver', {{get: () => {webdriver}}});
+Object.defineProperty(navigator, 'plugins', {{get: () => {plugins}}});
+Object.defineProperty(navigator, 'languages', {{get: () => {languages}}});
+"""
+
+
+def build_init_scripts() -> tuple[str, ...]:
+    """Все варианты скрипта инициализации из данных config."""
+    plugins_variants = [
+        conf.PLUGINS[:count] for count in range(1, len(conf.PLUGINS) + 1)
+    ]
+    return tuple(
+        INIT_SCRIPT_TEMPLATE.format(
+            webdriver=webdriver,
+            plugins=str(plugins),
+            languages=str(list(languages)),
+        )
+        for webdriver, plugins, languages in itertools.product(
+            conf.WEBDRIVER,
+            plugins_variants,
+            itertools.permutations(conf.LANGUAGES, 2),
+        )
+    )
+
+
+@dataclass
+class FingerprintPool:
+    """Кэш отпечатков браузера в памяти процесса.
+
+    User-agent'ы читаются из файла один раз и перечитываются, только
+    если изменилось время модификации файла (проверяется не чаще
+    reload_interval секунд). Варианты скрипта инициализации
+    собираются один раз при первом обращении.
+    """
+
+    path: Path = conf.USER_AGENT_PATH
+    reload_interval: int = conf.FINGERPRINT_RELOAD_INTERVAL
+    user_agents: tuple[str, ...] = ()
+    init_scripts: tuple[str, ...] = ()
+    mtime: float | None = None
+    checked_at: float = 0.0
+
+    async def load_user_agents(self) -> None:
+        """Перечитывает файл user-agent, если он изменился."""
+        now = time.monotonic()
+        if self.user_agents and now - self.checked_at < self.reload_interval:
+            return
+        self.checked_at = now
+        mtime = (await aiofiles.os.stat(self.path)).st_mtime
+        if self.user_agents and mtime == self.mtime:
+            return
+        async with aiofiles.open(
+                self.path,
+                mode='r',
+                encoding='utf-8',
+        ) as file:
+            self.user_agents = tuple(json.loads(await file.read()))
+        self.mtime = mtime
+
+    async def random_user_agent(self) -> str:
+        """Случайный user-agent из файла."""
+        await self.load_user_agents()
+        return random.choice(self.user_agents)
+
+    def random_init_script(self) -> str:
+        """Случайный скрипт инициализации браузера."""
+        if not self.init_scripts:
+            self.init_scripts = build_init_scripts()
+        return random.choice(self.init_scripts)
+
+
+fingerprint_pool = FingerprintPool()
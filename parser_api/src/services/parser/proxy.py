@@ -1,13 +1,18 @@
 import json
 import random
+import time
 
 import aiohttp
-from tenacity import retry, retry_if_exception_type, stop_after_attempt
+from tenacity import (
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_fixed,
+)
 
 from core.cache_settings import redis_client
 from core.exceptions import (
     ApiError,
-    ApiProcessingException,
     ApiProxyListError,
     ApiRateLimitedError,
     ApiResponseDataError,
@@ -17,11 +22,43 @@ from core.exceptions import (
 from core.logger_settings import logger
 from services.enums import (
     TTL,
+    ProxyHealth,
     ProxyMessage,
     ProxySettings,
-    StatusType,
     WebshareProxy,
 )
+from services.metrics import PROXY_FAILURES_TOTAL
+from services.scripts import (
+    EXTEND_PROXY_LIST_TTL,
+    MERGE_PROXY_LIST,
+    RECORD_PROXY_RESULT,
+    RESET_PROXY_HEALTH,
+    SELECT_PROXIES,
+)
+
+select_proxies_script = redis_client.register_script(SELECT_PROXIES)
+record_proxy_result_script = redis_client.register_script(RECORD_PROXY_RESULT)
+reset_proxy_health_script = redis_client.register_script(RESET_PROXY_HEALTH)
+extend_proxy_list_script = redis_client.register_script(EXTEND_PROXY_LIST_TTL)
+merge_proxy_list_script = redis_client.register_script(MERGE_PROXY_LIST)
+
+
+def proxy_record_key(proxy_list_name: str, proxy_id: str = '') -> str:
+    """Ключ хэша с данными и здоровьем прокси."""
+    return ProxyHealth.RECORD_KEY.value.format(
+        list_name=proxy_list_name,
+        proxy_id=proxy_id,
+    )
+
+
+def proxy_score_key(proxy_list_name: str) -> str:
+    """Ключ индекса прокси по оценке."""
+    return ProxyHealth.SCORE_KEY.value.format(list_name=proxy_list_name)
+
+
+def proxy_cooldown_key(proxy_list_name: str) -> str:
+    """Ключ индекса прокси на паузе."""
+    return ProxyHealth.COOLDOWN_KEY.value.format(list_name=proxy_list_name)
 
 
 async def get_api_proxy_list(
@@ -61,6 +98,12 @@ async def get_api_proxy_list(
                     logger.error(error_message)
                     raise ApiResponseDataError(error_message)
                 return data.get(required_key)
+    except (
+            ApiRateLimitedError,
+            ApiResponseStatusError,
+            ApiResponseDataError,
+    ):
+        raise
     except Exception as e:
         error_message = ProxyMessage.API_ERROR.value.format(e=e)
         logger.error(error_message)
@@ -73,7 +116,7 @@ async def get_api_proxy_list(
             ApiRateLimitedError,
     )),
     stop=stop_after_attempt(3),
-    sleep=ProxySettings.RETRY_TIMEOUT_PROXY_LIST.value,
+    wait=wait_fixed(ProxySettings.RETRY_TIMEOUT_PROXY_LIST.value),
 )
 async def get_api_proxy_list_with_retry() -> list:
     return await get_api_proxy_list(
@@ -84,41 +127,41 @@ async def get_api_proxy_list_with_retry() -> list:
     )
 
 
-async def create_empty_proxy_list_in_cash(proxy_list_name: str) -> None:
-    """Добавляем пустой список в кэш.
-    Чтобы не было повторных запросов от воркеров к API.
-    """
-    try:
-        await redis_client.set(
-            proxy_list_name,
-            json.dumps([]),
-            ex=TTL.PROXY_LIST.value,
-        )
-    except Exception as e:
-        logger.error(ProxyMessage.PROXY_LIST_ADD_ERROR.value.format(
-            error=str(e),
-        ))
-    else:
-        logger.info(ProxyMessage.PROXY_EMPTY_LIST_OK.value)
-
-
 async def add_proxy_list_in_cash(
         proxy_list: list[dict],
         proxy_list_name: str,
 ) -> None:
-    """Добавляет список прокси в кэш Redis с TTL.
-    Всем элементам проставляет статус OK и обнуляет failures.
+    """Сливает новый список прокси с кэшем Redis одним скриптом.
+    Прокси, оставшиеся в списке, сохраняют счётчики, score и паузу,
+    новые валидные прокси попадают в индекс с нейтральным score,
+    исчезнувшие и невалидные удаляются. TTL продлевается до PROXY_LIST.
     """
     for proxy in proxy_list:
-        proxy['status'] = StatusType.OK.value
-        proxy['failures'] = 0
         proxy.pop('username', None)
         proxy.pop('password', None)
+    valid_proxies = [
+        dict(
+            id=proxy.get('id'),
+            proxy_address=proxy.get('proxy_address'),
+            port=proxy.get('port'),
+        )
+        for proxy in proxy_list
+        if proxy.get('valid') is True
+    ]
     try:
-        await redis_client.set(
-            proxy_list_name,
-            json.dumps(proxy_list),
-            ex=TTL.PROXY_LIST.value,
+        await merge_proxy_list_script(
+            keys=[
+                proxy_list_name,
+                proxy_score_key(proxy_list_name),
+                proxy_cooldown_key(proxy_list_name),
+            ],
+            args=[
+                proxy_record_key(proxy_list_name),
+                TTL.PROXY_LIST.value,
+                ProxyHealth.INITIAL_SCORE.value,
+                json.dumps(proxy_list),
+                json.dumps(valid_proxies),
+            ],
         )
     except Exception as e:
         logger.error(ProxyMessage.PROXY_LIST_ADD_ERROR.value.format(
@@ -129,41 +172,104 @@ async def add_proxy_list_in_cash(
 
 
 async def get_random_proxy_from_cash(key: str) -> dict:
-    """Возвращает случайный валидный прокси из кэша Redis по заданному ключу.
-    Фильтрует по статусу OK и valid=True.
+    """Возвращает прокси из индекса здоровья для списка key.
+    Выбирает случайно среди TOP_N лучших с весом по score,
+    прокси на паузе после ошибок не выдаются.
     """
-    raw_data = await redis_client.get(key)
-    if not raw_data:
+    if not await redis_client.exists(key):
         raise ProxyList404(ProxyMessage.LIST_NOT_FOUND.value)
-    list_data = json.loads(raw_data)
-    if not list_data:
-        raise ApiProcessingException(ProxyMessage.PROCESSING_LIST.value)
-    valid_proxies = [
-        proxy for proxy in list_data
-        if proxy.get('status') == StatusType.OK.value
-           and proxy.get('valid') is True
-           and proxy.get('failures') < ProxySettings.GOOD_FAILURES.value
-    ]
-    if not valid_proxies:
+    top = await select_proxies_script(
+        keys=[proxy_score_key(key), proxy_cooldown_key(key)],
+        args=[time.time(), ProxyHealth.TOP_N.value, proxy_record_key(key)],
+    )
+    if not top:
         raise ApiProxyListError(
-            ProxyMessage.PROXY_LIST_VALID_ERROR.value.format(
-                proxy_list=list_data[:50],
-            ),
+            ProxyMessage.PROXY_ALL_COOLDOWN.value.format(list_name=key),
         )
-    return random.choice(valid_proxies)
+    proxy_ids = top[::2]
+    weights = [max(float(score), 0) + 0.01 for score in top[1::2]]
+    proxy_id = random.choices(proxy_ids, weights=weights)[0]
+    return await redis_client.hgetall(proxy_record_key(key, proxy_id))
+
+
+async def record_proxy_result(
+        proxy_id: str | None,
+        proxy_list_name: str,
+        success: bool,
+        latency_ms: float = 0,
+) -> None:
+    """Обновляет запись здоровья прокси и его место в индексе."""
+    if not proxy_id:
+        return
+    await record_proxy_result_script(
+        keys=[
+            proxy_record_key(proxy_list_name, proxy_id),
+            proxy_score_key(proxy_list_name),
+            proxy_cooldown_key(proxy_list_name),
+        ],
+        args=[
+            proxy_id,
+            int(success),
+            latency_ms,
+            time.time(),
+            ProxyHealth.EWMA_ALPHA.value,
+            ProxyHealth.LATENCY_NORM_MS.value,
+            ProxyHealth.COOLDOWN_BASE.value,
+            ProxyHealth.COOLDOWN_MAX.value,
+        ],
+    )
+
+
+async def record_proxy_success(
+        proxy_id: str | None,
+        proxy_list_name: str,
+        latency_ms: float,
+) -> None:
+    """Учитывает успешный запрос через прокси."""
+    await record_proxy_result(
+        proxy_id,
+        proxy_list_name,
+        success=True,
+        latency_ms=latency_ms,
+    )
 
 
 async def increase_proxy_failures(
         proxy_id: str,
         proxy_list_name: str,
 ) -> None:
-    """Увеличивает на 1 ключ 'failures' для прокси."""
-    raw_list = await redis_client.get(proxy_list_name)
-    if raw_list:
-        proxy_list = json.loads(raw_list)
-        for proxy in proxy_list:
-            if str(proxy.get('id')) == str(proxy_id):
-                proxy['failures'] = proxy.get('failures', 0) + 1
-                break
-        await redis_client.set(proxy_list_name, json.dumps(proxy_list))
-    return
+    """Атомарно (HINCRBY в записи прокси) увеличивает failures
+    и отправляет прокси на паузу. Список и TTL ключей не переписываются.
+    """
+    PROXY_FAILURES_TOTAL.inc()
+    await record_proxy_result(proxy_id, proxy_list_name, success=False)
+
+
+async def reset_proxy_failures(proxy_list_name: str) -> int:
+    """Сбрасывает ошибки и паузы всех прокси списка одним скриптом.
+    Возвращает число сброшенных прокси.
+    """
+    reset = await reset_proxy_health_script(
+        keys=[
+            proxy_score_key(proxy_list_name),
+            proxy_cooldown_key(proxy_list_name),
+        ],
+        args=[
+            proxy_record_key(proxy_list_name),
+            ProxyHealth.LATENCY_NORM_MS.value,
+        ],
+    )
+    logger.info(ProxyMessage.PROXY_FAILURES_RESET.value.format(count=reset))
+    return reset
+
+
+async def extend_proxy_list_ttl(proxy_list_name: str) -> int:
+    """Продлевает жизнь текущего списка прокси и всех его записей."""
+    return await extend_proxy_list_script(
+        keys=[
+            proxy_list_name,
+            proxy_score_key(proxy_list_name),
+            proxy_cooldown_key(proxy_list_name),
+        ],
+        args=[proxy_record_key(proxy_list_name), TTL.PROXY_LIST.value],
+    )
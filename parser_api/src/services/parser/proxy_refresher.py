@@ -0,0 +1,150 @@
+import asyncio
+import uuid
+from dataclasses import dataclass
+
+import aiohttp
+
+from core.cache_settings import redis_client
+from core.logger_settings import logger
+from core.settings import settings
+from services.enums import ProxyMessage, ProxyRefresh, ProxySettings
+from services.parser.proxy import (
+    add_proxy_list_in_cash,
+    extend_proxy_list_ttl,
+    get_api_proxy_list_with_retry,
+)
+from services.utils import release_lock_script
+
+
+@dataclass
+class ProxyRefresher:
+    """Фоновое обновление списка прокси по схеме stale-while-revalidate.
+
+    Запускается в каждом процессе воркера, но обновляет список только
+    владелец блокировки. Новый список запрашивается за REFRESH_BEFORE
+    секунд до истечения TTL, проверяется пробным запросом через каждый
+    прокси и сливается со старым: здоровье и паузы оставшихся прокси
+    сохраняются. Пока идёт обновление или если API недоступно,
+    воркеры продолжают брать прокси из старого списка,
+    а его TTL продлевается. Блокировка снимается только владельцем.
+    """
+
+    proxy_list_name: str
+    check_interval: int = ProxyRefresh.CHECK_INTERVAL.value
+    refresh_before: int = ProxyRefresh.REFRESH_BEFORE.value
+
+    @property
+    def lock_key(self) -> str:
+        """Ключ блокировки обновления списка."""
+        return ProxyRefresh.LOCK_KEY.value.format(
+            list_name=self.proxy_list_name,
+        )
+
+    async def needs_refresh(self) -> bool:
+        """Список отсутствует или скоро истечёт."""
+        ttl = await redis_client.ttl(self.proxy_list_name)
+        return ttl < self.refresh_before
+
+    @staticmethod
+    async def probe_proxy(
+            session: aiohttp.ClientSession,
+            proxy: dict,
+            semaphore: asyncio.Semaphore,
+    ) -> bool:
+        """Проверяет, что через прокси проходит запрос."""
+        proxy_server = ProxySettings.PROXY_TEMPLATE.value.format(
+            proxy_address=proxy.get('proxy_address'),
+            port=proxy.get('port'),
+        )
+        async with semaphore:
+            try:
+                async with session.get(
+                        ProxyRefresh.PROBE_URL.value,
+                        proxy=proxy_server,
+                        proxy_auth=aiohttp.BasicAuth(
+                            settings.webshare_login,
+                            settings.webshare_password,
+                        ),
+                ) as response:
+                    return response.status == 200
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                return False
+
+    async def probe_proxies(self, proxy_list: list[dict]) -> None:
+        """Проставляет valid=False прокси, не прошедшим пробный запрос.
+        Если не прошёл ни один, считаем проблему в пробе
+        и оставляем valid из ответа API.
+        """
+        candidates = [
+            proxy for proxy in proxy_list
+            if proxy.get('valid') is True
+        ]
+        semaphore = asyncio.Semaphore(ProxyRefresh.PROBE_CONCURRENCY.value)
+        timeout = aiohttp.ClientTimeout(total=ProxyRefresh.PROBE_TIMEOUT.value)
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            results = await asyncio.gather(*[
+                self.probe_proxy(session, proxy, semaphore)
+                for proxy in candidates
+            ])
+        alive = sum(results)
+        logger.info(ProxyMessage.PROXY_PROBE_RESULT.value.format(
+            alive=alive,
+            total=len(candidates),
+        ))
+        if not alive:
+            logger.warning(ProxyMessage.PROXY_PROBE_EMPTY.value)
+            return
+        for proxy, is_alive in zip(candidates, results):
+            proxy['valid'] = is_alive
+
+    async def refresh(self) -> None:
+        """Загружает, проверяет и сохраняет новый список прокси."""
+        try:
+            proxy_list = await get_api_proxy_list_with_retry()
+            if proxy_list:
+                await self.probe_proxies(proxy_list)
+                await add_proxy_list_in_cash(
+                    proxy_list,
+                    self.proxy_list_name,
+                )
+                return
+        except Exception as e:
+            logger.error(ProxyMessage.PROXY_REFRESH_ERROR.value.format(
+                error=str(e),
+            ))
+        count = await extend_proxy_list_ttl(self.proxy_list_name)
+        if count:
+            logger.warning(
+                ProxyMessage.PROXY_LIST_EXTENDED.value.format(count=count),
+            )
+
+    async def refresh_if_needed(self) -> None:
+        """Обновляет список, если он истекает и блокировка свободна."""
+        if not await self.needs_refresh():
+            return
+        token = str(uuid.uuid4())
+        is_owner = await redis_client.set(
+            self.lock_key,
+            token,
+            nx=True,
+            ex=ProxyRefresh.LOCK_TTL.value,
+        )
+        if not is_owner:
+            return
+        try:
+            await self.refresh()
+        finally:
+            await release_lock_script(keys=[self.lock_key], args=[token])
+
+    async def run(self) -> None:
+        """Периодически проверяет и обновляет список прокси."""
+        while True:
+            try:
+                await self.refresh_if_needed()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(ProxyMessage.PROXY_REFRESH_ERROR.value.format(
+                    error=str(e),
+                ))
+            await asyncio.sleep(self.check_interval)
@@ -0,0 +1,255 @@
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+import aiohttp
+
+import services.parser.config as conf
+from core.exceptions import Account404, PageError, Selector404
+from core.logger_settings import logger
+from core.settings import settings
+from services.enums import UtilityModelName
+from services.parser.base import InitParser
+from services.parser.sites.ITF.UI_text import ITFFormTextAreaName
+from services.parser.sites.ITF.parser import map_result_data
+from services.parser.sites.ITF.urls import ITFUrl
+
+HIDDEN_CLASSES = ('hide', 'd-none')
+VOID_ELEMENTS = frozenset((
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'param', 'source', 'track', 'wbr',
+))
+
+
+@dataclass
+class ITFForm:
+    """Форма страницы ITF: адрес отправки, поля и варианты
+    выпадающих списков.
+    """
+
+    action: str = ''
+    method: str = 'get'
+    inputs: dict[str, str] = field(default_factory=dict)
+    selects: dict[str, dict[str, str]] = field(default_factory=dict)
+
+
+class ITFPageParser(HTMLParser):
+    """Однопроходный разбор HTML страницы ITF.
+    Собирает формы, CSRF-токен, текст ошибки и пары подпись → значение
+    из карточек результата (p.text-black / h6.hint-text).
+    """
+
+    def __init__(self) -> None:
+        """Пустое состояние разбора."""
+        super().__init__(convert_charrefs=True)
+        self.forms: list[ITFForm] = []
+        self.csrf_token: str | None = None
+        self.alert_text: str = ''
+        self.result_hidden: bool = False
+        self.cards: dict[str, str] = {}
+        self._form: ITFForm | None = None
+        self._select: str | None = None
+        self._option: str | None = None
+        self._capture: str | None = None
+        self._text: list[str] = []
+        self._label: str | None = None
+        self._alert_depth: int = 0
+
+    @staticmethod
+    def classes(attrs: dict) -> list[str]:
+        """Список CSS-классов тега."""
+        return (attrs.get('class') or '').split()
+
+    @classmethod
+    def is_hidden(cls, attrs: dict) -> bool:
+        """Элемент скрыт классом или inline-стилем display: none."""
+        if any(name in cls.classes(attrs) for name in HIDDEN_CLASSES):
+            return True
+        style = (attrs.get('style') or '').replace(' ', '').lower()
+        return 'display:none' in style
+
+    def finish_option(self) -> None:
+        """Сохраняет вариант списка, в том числе без закрывающего тега."""
+        if self._capture != 'option':
+            return
+        text = ''.join(self._text).strip()
+        self._form.selects[self._select][text.lower()] = self._option
+        self._capture = None
+
+    def handle_form_tag(self, tag: str, attrs: dict) -> None:
+        """Формы, их поля и варианты выпадающих списков."""
+        if tag == 'form':
+            self._form = ITFForm(
+                action=attrs.get('action') or '',
+                method=(attrs.get('method') or 'get').lower(),
+            )
+            self.forms.append(self._form)
+        elif tag in ('input', 'textarea') and self._form and attrs.get('name'):
+            self._form.inputs[attrs['name']] = attrs.get('value') or ''
+        elif tag == 'select' and self._form and attrs.get('name'):
+            self._select = attrs['name']
+            self._form.selects[self._select] = {}
+        elif tag == 'option' and self._select:
+            self._option = attrs.get('value') or ''
+            self._capture, self._text = 'option', []
+
+    def handle_starttag(
+            self,
+            tag: str,
+            attrs: list[tuple[str, str | None]],
+    ) -> None:
+        """Открывающий тег: формы, поля, карточки и alert."""
+        attrs = dict(attrs)
+        classes = self.classes(attrs)
+        if self._alert_depth and tag not in VOID_ELEMENTS:
+            self._alert_depth += 1
+        if tag == 'option':
+            self.finish_option()
+        if tag == 'meta' and attrs.get('name') == 'csrf-token':
+            self.csrf_token = attrs.get('content')
+        elif tag == 'p' and 'text-black' in classes:
+            self._capture, self._text = 'label', []
+        elif tag == 'h6' and 'hint-text' in classes:
+            self._capture, self._text = 'value', []
+        else:
+            self.handle_form_tag(tag, attrs)
+        if attrs.get('id') == 'message' and 'alert-danger' in classes:
+            if not self.is_hidden(attrs):
+                self._alert_depth = 1
+        if attrs.get('id') in ('resultcard', 'result'):
+            self.result_hidden = self.is_hidden(attrs)
+
+    def handle_endtag(self, tag: str) -> None:
+        """Закрывающий тег: завершает захват текста."""
+        if self._alert_depth and tag not in VOID_ELEMENTS:
+            self._alert_depth -= 1
+        if tag in ('option', 'select'):
+            self.finish_option()
+        text = ''.join(self._text).strip()
+        if tag == 'form':
+            self._form = None
+        elif tag == 'select':
+            self._select = None
+        elif tag == 'p' and self._capture == 'label':
+            self._label, self._capture = text, None
+        elif tag == 'h6' and self._capture == 'value':
+            if self._label is not None:
+                self.cards[self._label] = text
+                self._label = None
+            self._capture = None
+
+    def handle_data(self, data: str) -> None:
+        """Текст внутри захватываемых тегов и alert."""
+        if self._capture:
+            self._text.append(data)
+        if self._alert_depth:
+            self.alert_text += data
+
+    def find_form(self, field_name: str) -> ITFForm | None:
+        """Форма с полем field_name или None."""
+        for form in self.forms:
+            if field_name in form.inputs:
+                return form
+        return None
+
+
+def parse_itf_page(html: str) -> ITFPageParser:
+    """Разбирает HTML страницы ITF."""
+    page = ITFPageParser()
+    page.feed(html)
+    page.close()
+    return page
+
+
+class ParserITFHttp(InitParser):
+    """Парсер ITF без браузера: повторяет отправку формы через aiohttp.
+    Используется как быстрый путь: при любой ошибке, в том числе
+    Account404, Parser перепроверяет счёт через Playwright.
+    """
+
+    form_fields = {
+        UtilityModelName.GAS.value: ITFFormTextAreaName.CUSTOMER_ID.value,
+        UtilityModelName.WATER.value: ITFFormTextAreaName.AGREEMENT.value,
+        UtilityModelName.ELECTRICITY.value: (
+            ITFFormTextAreaName.CUSTOMER_ID.value
+        ),
+    }
+
+    def proxy_kwargs(self) -> dict:
+        """Параметры прокси для запроса aiohttp."""
+        if not self.proxy:
+            return {}
+        return dict(
+            proxy=self.proxy.get('server'),
+            proxy_auth=aiohttp.BasicAuth(
+                settings.webshare_login,
+                settings.webshare_password,
+            ),
+        )
+
+    def build_form_data(self, form: ITFForm, field_name: str) -> dict:
+        """Поля формы с номером счёта и выбранным городом."""
+        data = dict(form.inputs)
+        data[field_name] = self.account
+        if self.utility == UtilityModelName.GAS.value:
+            city = (self.city or '').strip().lower()
+            for name, options in form.selects.items():
+                if 'city' not in name:
+                    continue
+                value = next(
+                    (value for text, value in options.items() if city in text),
+                    None,
+                )
+                if value is None:
+                    raise Selector404(f'Не найден город в списке: {self.city}')
+                data[name] = value
+        return data
+
+    async def get_data(self) -> dict:
+        """Отправляет форму услуги и разбирает страницу результата."""
+        field_name = self.form_fields.get(self.utility)
+        if field_name is None:
+            raise PageError(f'Нет HTTP-обработчика для {self.utility}')
+        url = ITFUrl.to_utility_url(self.utility)
+        headers = {'User-Agent': await self.get_random_user_agent()}
+        timeout = aiohttp.ClientTimeout(total=conf.HTTP_TIMEOUT)
+        async with aiohttp.ClientSession(
+                headers=headers,
+                timeout=timeout,
+        ) as session:
+            async with session.get(url, **self.proxy_kwargs()) as response:
+                if response.status != 200:
+                    raise PageError(f'ITF вернул статус {response.status}')
+                page = parse_itf_page(await response.text())
+            form = page.find_form(field_name)
+            if form is None:
+                raise Selector404(f'Не найдена форма с полем {field_name}')
+            request_headers = {'Referer': url}
+            if page.csrf_token:
+                request_headers['X-CSRF-TOKEN'] = page.csrf_token
+            form_data = self.build_form_data(form, field_name)
+            body_key = 'params' if form.method == 'get' else 'data'
+            async with session.request(
+                    form.method.upper(),
+                    urljoin(url, form.action),
+                    headers=request_headers,
+                    **{body_key: form_data},
+                    **self.proxy_kwargs(),
+            ) as response:
+                if response.status != 200:
+                    raise PageError(f'ITF вернул статус {response.status}')
+                result_page = parse_itf_page(await response.text())
+        return self.read_result(result_page)
+
+    def read_result(self, result_page: ITFPageParser) -> dict:
+        """Карточки результата важнее сообщения об ошибке:
+        Account404 только если карточек нет, а ошибка видна.
+        """
+        if result_page.cards and not result_page.result_hidden:
+            data = map_result_data(self.utility, result_page.cards)
+            logger.info(f'Результат парсинга (http): {data}')
+            return data
+        if result_page.alert_text.strip():
+            logger.info(f'Счёт ({self.account}) не найден (http).')
+            raise Account404
+        raise Selector404('Результат не найден в ответе ITF.')
@@ -1,10 +1,14 @@
-import random
-
-from playwright.async_api import TimeoutError
+from playwright.async_api import ElementHandle
 
 from core.exceptions import Account404, Selector404
 from core.logger_settings import logger
-from services.enums import UtilityModelName
+from core.settings import settings
+from services.enums import (
+    MetricPhase,
+    ParseOutcome,
+    UtilityModelName,
+)
+from services.metrics import record_input_outcome, track_phase
 from services.parser.base import InitParser
 from services.parser.sites.ITF.UI_text import (
     ITFDataElectricityNameSelector,
@@ -16,77 +20,127 @@ from services.parser.sites.ITF.UI_text import (
 )
 
 ITF_FLAG = 'itf'
+ACCOUNT_NOT_FOUND_SELECTORS = (
+    '#message.alert-danger',
+    '#message.alert.alert-danger',
+    '#message.alert-danger.alert-dismissible',
+)
+ITF_CARD_SELECTOR = 'div.col-md-4'
+EXTRACT_CARDS_SCRIPT = """
+(elements) => {
+    const cards = {};
+    for (const el of elements) {
+        const label = el.querySelector('p.text-black');
+        if (!label) continue;
+        const value = el.querySelector('h6.hint-text');
+        cards[label.textContent.trim()] = (
+            value ? value.textContent.trim() : null
+        );
+    }
+    return cards;
+}
+"""
+ITF_RESULT_SELECTORS = {
+    UtilityModelName.GAS.value: ITFDataGasNameSelector,
+    UtilityModelName.ELECTRICITY.value: ITFDataElectricityNameSelector,
+    UtilityModelName.WATER.value: ITFDataWaterNameSelector,
+}
+
+
+def map_result_data(selector_type: str, cards: dict[str, str]) -> dict:
+    """Сопоставляет подписи карточек ITF с ключами результата."""
+    return {
+        selector.name.lower(): cards.get(selector.value)
+        for selector in ITF_RESULT_SELECTORS.get(selector_type)
+    }
 
 
 class ParserITF(InitParser):
     """Логика парсера ITF."""
 
+    def __post_init__(self) -> None:
+        super().__post_init__()
+        self.input_strategy = settings.parser_itf_input_strategy.value
+
     async def get_data(self):
         mapping = {
             UtilityModelName.GAS.value: lambda: self.parse_gas(),
             UtilityModelName.WATER.value: lambda: self.parse_water(),
             UtilityModelName.ELECTRICITY.value: lambda: self.parse_electricity(),
         }
-        return await mapping.get(self.utility)()
-
-    async def try_wait_for_selector(self, selector: str) -> bool:
+        outcome = ParseOutcome.ERROR.value
+        try:
+            data = await mapping.get(self.utility)()
+            outcome = ParseOutcome.COMPLETE.value
+            return data
+        except Account404:
+            outcome = ParseOutcome.NOT_FOUND.value
+            raise
+        except Selector404:
+            outcome = ParseOutcome.SELECTOR_ERROR.value
+            raise
+        finally:
+            record_input_outcome(ITF_FLAG, self.input_strategy, outcome)
+
+    async def wait_for_result_or_alert(
+            self,
+            result_selector: str,
+            wait_ms: int,
+    ) -> ElementHandle:
+        """Одновременно ждёт карточку результата и сообщение об ошибке
+        одним селектором и возвращает элемент, появившийся первым.
+        Каждая альтернатива ограничена :visible: Playwright проверяет
+        видимость только первого совпадения, а скрытое сообщение
+        об ошибке стоит на странице перед карточкой результата.
+        Если первой появилась ошибка — счёт не найден.
+        """
+        alert_selector = ', '.join(ACCOUNT_NOT_FOUND_SELECTORS)
+        visible_selector = ', '.join(
+            f'{selector}:visible'
+            for selector in (*ACCOUNT_NOT_FOUND_SELECTORS, result_selector)
+        )
         try:
-            await self.page.wait_for_selector(
-                selector,
-                timeout=self.check_timeout,
+            with track_phase(MetricPhase.RESULT_WAIT.value):
+                element = await self.page.wait_for_selector(
+                    visible_selector,
+                    timeout=wait_ms + self.check_timeout,
+                )
+            is_alert = await element.evaluate(
+                '(el, selector) => el.matches(selector)',
+                alert_selector,
             )
-            return True
-        except TimeoutError:
-            return False
-
-    async def raise_if_account_not_found(self):
-        selectors = [
-            '#message.alert-danger',
-            '#message.alert.alert-danger',
-            '#message.alert-danger.alert-dismissible',
-        ]
-        for sel in selectors:
-            if await self.try_wait_for_selector(sel):
-                logger.info(f'Счёт ({self.account}) не найден.')
-                raise Account404
-
-    @staticmethod
-    async def get_result_data(selector_type: str, page_elements: list) -> dict:
-        result_dict = {}
-        mapping = {
-            'gas': ITFDataGasNameSelector,
-            'electricity': ITFDataElectricityNameSelector,
-            'water': ITFDataWaterNameSelector,
-        }
-        mapping_enum = mapping.get(selector_type)
-        for el in page_elements:
-            p_tag = await el.query_selector('p.text-black')
-            if not p_tag:
-                continue
-            p_text = (await p_tag.text_content()).strip()
-            h6_tag_name = 'h6.hint-text'
-            for selector in mapping_enum:
-                if p_text == selector.value:
-                    h6_tag = await el.query_selector(h6_tag_name)
-                    result_dict[selector.name.lower()] = (
-                        await h6_tag.text_content()
-                        if h6_tag else None
-                    ).strip()
-        return result_dict
+        except self.playwright_errors as e:
+            error = f'({e.__class__.__name__}): {str(e)}'
+            logger.error(error)
+            raise Selector404
+        if is_alert:
+            logger.info(f'Счёт ({self.account}) не найден.')
+            raise Account404
+        return element
+
+    async def get_result_data(self, selector_type: str) -> dict:
+        """Забирает все пары подпись → значение из карточек
+        одним вызовом в браузер и сопоставляет их с enum-ами в Python.
+        """
+        with track_phase(MetricPhase.EXTRACTION.value):
+            cards = await self.page.eval_on_selector_all(
+                ITF_CARD_SELECTOR,
+                EXTRACT_CARDS_SCRIPT,
+            )
+            return map_result_data(selector_type, cards)
 
-    async def parse_gas(self):
-        await self.page.type(
+    async def fill_gas_form(self) -> None:
+        """Заполняет форму газа: номер счёта и город."""
+        await self.enter_text(
             f'[name="{ITFFormTextAreaName.CUSTOMER_ID.value}"]',
             self.account,
-            delay=random.randint(50, 100),
         )
         await self.page.click(
             f'[class="{ITFGasFormClassSelect.SELECT_CITY_LIST.value}"]',
         )
-        await self.page.type(
+        await self.enter_text(
             'input.select2-search__field',
             self.city or '',
-            delay=random.randint(50, 100),
         )
         try:
             await self.page.locator(
@@ -98,23 +152,18 @@ class ParserITF(InitParser):
             logger.error(error)
             raise Selector404
         await self.page.click(f'[class="{ITFSiteButton.SEARCH_BTN.value}"]')
-        await self.raise_if_account_not_found()
 
-        try:
-            await self.page.wait_for_selector('#resultcard', timeout=5_000)
-            elem = await self.page.query_selector('#resultcard')
-            class_attr = await elem.get_attribute('class')
-            if 'hide' in class_attr:
-                raise Selector404(
-                    'Элемент #resultcard скрыт, результат не выведен.',
-                )
-            page_elements = await self.page.query_selector_all('div.col-md-4')
-        except self.playwright_errors as e:
-            error = f'({e.__class__.__name__}): {str(e)}'
-            logger.error(error)
-            raise Selector404
+    async def parse_gas(self):
+        with track_phase(MetricPhase.FORM_FILL.value):
+            await self.fill_gas_form()
+        elem = await self.wait_for_result_or_alert('#resultcard', 5_000)
+        class_attr = await elem.get_attribute('class')
+        if 'hide' in (class_attr or ''):
+            raise Selector404(
+                'Элемент #resultcard скрыт, результат не выведен.',
+            )
 
-        parsing_data = await self.get_result_data('gas', page_elements)
+        parsing_data = await self.get_result_data('gas')
         address = parsing_data.get('address')
         consumption = parsing_data.get('consumption')
         debit_consumption = parsing_data.get('debit_consumption')
@@ -137,25 +186,17 @@ class ParserITF(InitParser):
         )
 
     async def parse_water(self):
+        with track_phase(MetricPhase.FORM_FILL.value):
+            await self.enter_text(
+                f'[name="{ITFFormTextAreaName.AGREEMENT.value}"]',
+                self.account,
+            )
+            await self.page.click(
+                f'[class="{ITFSiteButton.SEARCH_BTN.value}"]',
+            )
+        await self.wait_for_result_or_alert('#result', 6_000)
 
-        await self.page.type(
-            f'[name="{ITFFormTextAreaName.AGREEMENT.value}"]',
-            self.account,
-            delay=random.randint(50, 100),
-        )
-        await self.page.click(
-            f'[class="{ITFSiteButton.SEARCH_BTN.value}"]',
-        )
-        await self.raise_if_account_not_found()
-        try:
-            await self.page.wait_for_selector('#result', timeout=6_000)
-            page_elements = await self.page.query_selector_all('div.col-md-4')
-        except self.playwright_errors as e:
-            error = f'({e.__class__.__name__})'
-            logger.error(error)
-            raise Selector404
-
-        parsing_data = await self.get_result_data('water', page_elements)
+        parsing_data = await self.get_result_data('water')
         address = parsing_data.get('address')
         consumption = parsing_data.get('consumption')
         debit_full = parsing_data.get('debit_full')
@@ -172,25 +213,17 @@ class ParserITF(InitParser):
         )
 
     async def parse_electricity(self):
-        await self.page.type(
-            f'[name="{ITFFormTextAreaName.CUSTOMER_ID.value}"]',
-            self.account,
-            delay=random.randint(50, 100),
-        )
-        await self.page.click(
-            f'[class="{ITFSiteButton.SEARCH_BTN.value}"]',
-        )
-        await self.raise_if_account_not_found()
-
-        try:
-            await self.page.wait_for_selector('#resultcard', timeout=5000)
-            page_elements = await self.page.query_selector_all('div.col-md-4')
-        except self.playwright_errors as e:
-            error = f'({e.__class__.__name__})'
-            logger.error(error)
-            raise Selector404
+        with track_phase(MetricPhase.FORM_FILL.value):
+            await self.enter_text(
+                f'[name="{ITFFormTextAreaName.CUSTOMER_ID.value}"]',
+                self.account,
+            )
+            await self.page.click(
+                f'[class="{ITFSiteButton.SEARCH_BTN.value}"]',
+            )
+        await self.wait_for_result_or_alert('#resultcard', 5_000)
 
-        parsing_data = await self.get_result_data('electricity', page_elements)
+        parsing_data = await self.get_result_data('electricity')
         address = parsing_data.get('address')
         consumption = parsing_data.get('consumption')
         debit_full = parsing_data.get('debit_full')
@@ -0,0 +1,112 @@
+import hashlib
+import json
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+
+import aiofiles
+import aiofiles.os
+from playwright.async_api import Error, Route
+
+import services.parser.config as conf
+from core.logger_settings import logger
+
+CACHED_HEADERS = ('content-type',)
+
+
+@dataclass
+class StaticAssetCache:
+    """Дисковый кэш статических JS/CSS сайта.
+
+    Повторные запросы одного и того же файла отдаются с диска
+    без похода через прокси. Запись живёт ttl секунд, ключ — sha256 URL.
+    Кэшируются только успешные GET-ответы. Файлы пишутся во временный
+    файл и переименовываются, поэтому читатель не видит частичную запись.
+    """
+
+    directory: Path = conf.STATIC_CACHE_DIR
+    ttl: int = conf.STATIC_CACHE_TTL
+
+    @staticmethod
+    def is_cacheable(url: str) -> bool:
+        """Статика сайта: совпадение с STATIC_CACHE_PATTERN, тем же
+        шаблоном, по которому регистрируется маршрут кэша.
+        """
+        return bool(conf.STATIC_CACHE_PATTERN.match(url))
+
+    def paths(self, url: str) -> tuple[Path, Path]:
+        """Пути к телу и метаданным ресурса по хэшу url."""
+        key = hashlib.sha256(url.encode()).hexdigest()
+        return self.directory / key, self.directory / f'{key}.json'
+
+    async def read(self, url: str) -> tuple[bytes, dict] | None:
+        """Тело и метаданные ресурса или None, если кэш устарел."""
+        body_path, meta_path = self.paths(url)
+        try:
+            stat = await aiofiles.os.stat(body_path)
+            if time.time() - stat.st_mtime > self.ttl:
+                return None
+            async with aiofiles.open(body_path, mode='rb') as file:
+                body = await file.read()
+            async with aiofiles.open(meta_path, mode='r') as file:
+                headers = json.loads(await file.read())
+        except (OSError, ValueError):
+            return None
+        return body, headers
+
+    @staticmethod
+    async def replace_file(path: Path, data: bytes) -> None:
+        """Пишет data во временный файл рядом с path и переименовывает его."""
+        temp_path = path.with_name(f'{path.name}.{uuid.uuid4().hex}.tmp')
+        try:
+            async with aiofiles.open(temp_path, mode='wb') as file:
+                await file.write(data)
+            await aiofiles.os.replace(temp_path, path)
+        except OSError:
+            try:
+                await aiofiles.os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+    async def write(self, url: str, body: bytes, headers: dict) -> None:
+        """Сохраняет тело, затем заголовки: запись без заголовков
+        при чтении считается промахом.
+        """
+        body_path, meta_path = self.paths(url)
+        try:
+            await aiofiles.os.makedirs(self.directory, exist_ok=True)
+            await self.replace_file(body_path, body)
+            await self.replace_file(meta_path, json.dumps(headers).encode())
+        except OSError as e:
+            logger.warning(f'Не удалось сохранить статику в кэш: {str(e)}')
+
+    async def handle(self, route: Route) -> None:
+        """Обработчик route: отдаёт файл из кэша или скачивает
+        его через контекст (с прокси) и сохраняет на диск.
+        """
+        request = route.request
+        if request.method != 'GET':
+            await route.fallback()
+            return
+        cached = await self.read(request.url)
+        if cached is not None:
+            body, headers = cached
+            await route.fulfill(status=200, headers=headers, body=body)
+            return
+        try:
+            response = await route.fetch()
+        except Error:
+            await route.abort()
+            return
+        if response.ok:
+            headers = {
+                name: value for name, value in response.headers.items()
+                if name in CACHED_HEADERS
+            }
+            await self.write(request.url, await response.body(), headers)
+        await route.fulfill(response=response)
+
+
+static_asset_cache = StaticAssetCache()
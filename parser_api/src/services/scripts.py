@@ -0,0 +1,208 @@
+# Атомарно обновляет данные одного аккаунта в хэше задачи.
+# Уменьшает счётчик remaining, когда аккаунт впервые получает
+# итоговый status_response. Возвращает остаток или nil,
+# если задачи нет в Redis.
+# KEYS: task_id
+# ARGV: account_field, key, value_json, status_response, ttl,
+#       remaining_field, new_status
+PATCH_ACCOUNT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return nil
+end
+local function is_pending(status)
+    return status == nil or status == cjson.null or status == ARGV[7]
+end
+local raw = redis.call('HGET', KEYS[1], ARGV[1])
+if raw then
+    local account = cjson.decode(raw)
+    local was_pending = is_pending(account['status_response'])
+    account[ARGV[2]] = cjson.decode(ARGV[3])
+    if ARGV[4] ~= '' then
+        account['status_response'] = ARGV[4]
+    end
+    redis.call('HSET', KEYS[1], ARGV[1], cjson.encode(account))
+    if was_pending and not is_pending(account['status_response']) then
+        redis.call('HINCRBY', KEYS[1], ARGV[6], -1)
+    end
+end
+redis.call('EXPIRE', KEYS[1], ARGV[5])
+return tonumber(redis.call('HGET', KEYS[1], ARGV[6]))
+"""
+
+# Снимает блокировку, только если она принадлежит текущему владельцу.
+# KEYS: lock_key
+# ARGV: token
+RELEASE_LOCK = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# Возвращает прокси с истёкшей паузой в индекс и отдаёт
+# top_n лучших прокси со значениями score.
+# KEYS: score, cooldown
+# ARGV: now, top_n, record_prefix
+SELECT_PROXIES = """
+local ready = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', ARGV[1])
+for _, proxy_id in ipairs(ready) do
+    redis.call('ZREM', KEYS[2], proxy_id)
+    local score = redis.call('HGET', ARGV[3] .. proxy_id, 'score')
+    if score then
+        redis.call('ZADD', KEYS[1], score, proxy_id)
+    end
+end
+return redis.call(
+    'ZREVRANGE', KEYS[1], 0, tonumber(ARGV[2]) - 1, 'WITHSCORES'
+)
+"""
+
+# Учитывает результат работы через прокси: EWMA успешности и задержки,
+# счётчики и пауза с экспоненциальным ростом после ошибки.
+# KEYS: record, score, cooldown
+# ARGV: proxy_id, ok, latency_ms, now, alpha, latency_norm,
+#       cooldown_base, cooldown_max
+RECORD_PROXY_RESULT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return nil
+end
+local ok = tonumber(ARGV[2])
+local alpha = tonumber(ARGV[5])
+local health = tonumber(redis.call('HGET', KEYS[1], 'health') or '1')
+local latency = tonumber(redis.call('HGET', KEYS[1], 'latency_ewma') or '0')
+health = alpha * ok + (1 - alpha) * health
+if ok == 1 then
+    local sample = tonumber(ARGV[3])
+    if latency == 0 then
+        latency = sample
+    else
+        latency = alpha * sample + (1 - alpha) * latency
+    end
+    redis.call('HINCRBY', KEYS[1], 'successes', 1)
+    redis.call('HSET', KEYS[1], 'consecutive_failures', 0)
+else
+    redis.call('HINCRBY', KEYS[1], 'failures', 1)
+    local streak = redis.call('HINCRBY', KEYS[1], 'consecutive_failures', 1)
+    local cooldown = math.min(
+        tonumber(ARGV[7]) * 2 ^ (streak - 1), tonumber(ARGV[8])
+    )
+    redis.call('HSET', KEYS[1], 'last_failure', ARGV[4])
+    redis.call('ZREM', KEYS[2], ARGV[1])
+    redis.call('ZADD', KEYS[3], tonumber(ARGV[4]) + cooldown, ARGV[1])
+    local ttl = redis.call('PTTL', KEYS[1])
+    if ttl > 0 then
+        redis.call('PEXPIRE', KEYS[3], ttl)
+    end
+end
+local score = health / (1 + latency / tonumber(ARGV[6]))
+redis.call(
+    'HSET', KEYS[1], 'health', health, 'latency_ewma', latency,
+    'score', score
+)
+if not redis.call('ZSCORE', KEYS[3], ARGV[1]) then
+    redis.call('ZADD', KEYS[2], score, ARGV[1])
+end
+return tostring(score)
+"""
+
+# Сбрасывает ошибки всех прокси списка за один проход: снимает паузу,
+# обнуляет счётчики ошибок и возвращает прокси в индекс.
+# TTL записей не меняется.
+# KEYS: score, cooldown
+# ARGV: record_prefix, latency_norm
+RESET_PROXY_HEALTH = """
+local proxy_ids = redis.call('ZRANGE', KEYS[2], 0, -1)
+for _, proxy_id in ipairs(redis.call('ZRANGE', KEYS[1], 0, -1)) do
+    table.insert(proxy_ids, proxy_id)
+end
+local reset = 0
+for _, proxy_id in ipairs(proxy_ids) do
+    local record = ARGV[1] .. proxy_id
+    if redis.call('EXISTS', record) == 1 then
+        local latency = tonumber(
+            redis.call('HGET', record, 'latency_ewma') or '0'
+        )
+        local score = 1 / (1 + latency / tonumber(ARGV[2]))
+        redis.call(
+            'HSET', record, 'failures', 0, 'consecutive_failures', 0,
+            'health', 1, 'score', score
+        )
+        redis.call('ZADD', KEYS[1], score, proxy_id)
+        reset = reset + 1
+    end
+end
+redis.call('DEL', KEYS[2])
+return reset
+"""
+
+# Продлевает TTL списка прокси, индекса и всех записей,
+# чтобы продолжать отдавать старый список, пока новый не получен.
+# KEYS: list, score, cooldown
+# ARGV: record_prefix, ttl
+EXTEND_PROXY_LIST_TTL = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+local proxy_ids = redis.call('ZRANGE', KEYS[3], 0, -1)
+for _, proxy_id in ipairs(redis.call('ZRANGE', KEYS[2], 0, -1)) do
+    table.insert(proxy_ids, proxy_id)
+end
+for _, proxy_id in ipairs(proxy_ids) do
+    redis.call('EXPIRE', ARGV[1] .. proxy_id, ARGV[2])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+redis.call('EXPIRE', KEYS[2], ARGV[2])
+redis.call('EXPIRE', KEYS[3], ARGV[2])
+return #proxy_ids
+"""
+
+# Сливает новый список прокси с текущим, не теряя накопленного здоровья:
+# записи и паузы оставшихся прокси сохраняются, новые прокси получают
+# нейтральный score, исчезнувшие и невалидные удаляются из индекса.
+# KEYS: list, score, cooldown
+# ARGV: record_prefix, ttl, initial_score, list_json, valid_proxies_json
+MERGE_PROXY_LIST = """
+local ttl = tonumber(ARGV[2])
+local proxies = cjson.decode(ARGV[5])
+local valid = {}
+for _, proxy in ipairs(proxies) do
+    valid[tostring(proxy['id'])] = true
+end
+local current = redis.call('ZRANGE', KEYS[3], 0, -1)
+for _, proxy_id in ipairs(redis.call('ZRANGE', KEYS[2], 0, -1)) do
+    table.insert(current, proxy_id)
+end
+for _, proxy_id in ipairs(current) do
+    if not valid[proxy_id] then
+        redis.call('ZREM', KEYS[2], proxy_id)
+        redis.call('ZREM', KEYS[3], proxy_id)
+        redis.call('DEL', ARGV[1] .. proxy_id)
+    end
+end
+for _, proxy in ipairs(proxies) do
+    local proxy_id = tostring(proxy['id'])
+    local record = ARGV[1] .. proxy_id
+    redis.call(
+        'HSET', record, 'id', proxy_id,
+        'proxy_address', proxy['proxy_address'], 'port', proxy['port']
+    )
+    local defaults = {
+        successes = 0, failures = 0, consecutive_failures = 0,
+        health = 1, latency_ewma = 0, score = ARGV[3], last_failure = '',
+    }
+    for field, value in pairs(defaults) do
+        redis.call('HSETNX', record, field, value)
+    end
+    redis.call('EXPIRE', record, ttl)
+    if not redis.call('ZSCORE', KEYS[3], proxy_id) then
+        redis.call(
+            'ZADD', KEYS[2], 'NX',
+            redis.call('HGET', record, 'score'), proxy_id
+        )
+    end
+end
+redis.call('SET', KEYS[1], ARGV[4], 'EX', ttl)
+redis.call('EXPIRE', KEYS[2], ttl)
+redis.call('EXPIRE', KEYS[3], ttl)
+return #proxies
+"""
@@ -1,37 +1,111 @@
+import asyncio
 import json
 
 from core.cache_settings import redis_client
 from core.exceptions import RedisTaskNotFound
 from core.logger_settings import logger
-from services.enums import TTL, StatusType
+from services.enums import (
+    TTL,
+    ResultCacheKey,
+    StatusType,
+    TaskEvent,
+    TaskField,
+    UtilityModelName,
+)
+from services.scripts import PATCH_ACCOUNT, RELEASE_LOCK
+
+# Максимальный возраст результата парсинга в кэше по типу услуги.
+RESULT_CACHE_DEFAULT_TTL = 60 * 10
+RESULT_CACHE_TTL = {
+    UtilityModelName.ELECTRICITY.value: 60 * 30,
+    UtilityModelName.GAS.value: 60 * 30,
+    UtilityModelName.WATER.value: 60 * 30,
+}
+# Single-flight блокировка одинаковых задач парсинга.
+PARSE_LOCK_TTL = 60 * 3
+PARSE_LOCK_WAIT = 60 * 3
+
+patch_account_script = redis_client.register_script(PATCH_ACCOUNT)
+release_lock_script = redis_client.register_script(RELEASE_LOCK)
+
+
+def account_field(account: str) -> str:
+    """Поле хэша задачи для аккаунта."""
+    return TaskField.ACCOUNT_PREFIX.value + account
+
+
+def is_pending_status(status_response: str | None) -> bool:
+    """Аккаунт ещё без итогового статуса."""
+    return status_response in (StatusType.NEW.value, None)
 
 
 async def create_new_task(task_id: str, data: dict) -> None:
-    return await redis_client.set(
-        task_id,
-        json.dumps(data),
-        ex=TTL.REDIS_KEY.value,
+    """Сохраняет задачу в Redis хэшем: одно поле на каждый аккаунт,
+    остальные ключи сообщения отдельными полями.
+    Счётчик remaining хранит число аккаунтов без итогового статуса.
+    """
+    accounts = data.get(TaskField.DATA.value) or []
+    mapping = {
+        key: json.dumps(value)
+        for key, value in data.items()
+        if key != TaskField.DATA.value
+    }
+    for account_data in accounts:
+        mapping[account_field(account_data.get('account'))] = json.dumps(
+            account_data,
+        )
+    mapping[TaskField.ACCOUNTS.value] = json.dumps(
+        [account_data.get('account') for account_data in accounts],
     )
+    mapping[TaskField.REMAINING.value] = sum(
+        is_pending_status(account_data.get('status_response'))
+        for account_data in accounts
+    )
+    async with redis_client.pipeline(transaction=True) as pipe:
+        pipe.delete(task_id)
+        pipe.hset(task_id, mapping=mapping)
+        pipe.expire(task_id, TTL.REDIS_KEY.value)
+        await pipe.execute()
 
 
-async def get_redis_task(task_id: str) -> str:
-    redis_task = await redis_client.get(task_id)
-    if redis_task is None:
+async def get_redis_task(task_id: str) -> dict:
+    """Собирает задачу из хэша в исходный формат сообщения."""
+    redis_task = await redis_client.hgetall(task_id)
+    if not redis_task:
         msg = f'Задача с task_id={task_id} не найдена.'
         logger.debug(msg)
         raise RedisTaskNotFound(msg)
-    return redis_task
+    redis_task.pop(TaskField.REMAINING.value, None)
+    accounts = json.loads(redis_task.pop(TaskField.ACCOUNTS.value, '[]'))
+    task_data = {
+        key: json.loads(value)
+        for key, value in redis_task.items()
+        if not key.startswith(TaskField.ACCOUNT_PREFIX.value)
+    }
+    task_data[TaskField.DATA.value] = [
+        json.loads(redis_task[account_field(account)])
+        for account in accounts
+    ]
+    return task_data
+
+
+async def get_remaining_accounts(task_id: str) -> int:
+    """Возвращает число аккаунтов задачи, ещё не получивших результат."""
+    remaining = await redis_client.hget(task_id, TaskField.REMAINING.value)
+    if remaining is None:
+        msg = f'Задача с task_id={task_id} не найдена.'
+        logger.debug(msg)
+        raise RedisTaskNotFound(msg)
+    return int(remaining)
 
 
 async def change_job_status(task_id: str, status: StatusType) -> None:
-    redis_raw = await get_redis_task(task_id)
-    redis_task = json.loads(redis_raw)
-    redis_task['job_status'] = status
-    await redis_client.set(
-        task_id,
-        json.dumps(redis_task),
-        ex=TTL.REDIS_KEY.value,
-    )
+    if not await redis_client.exists(task_id):
+        raise RedisTaskNotFound(f'Задача с task_id={task_id} не найдена.')
+    async with redis_client.pipeline(transaction=True) as pipe:
+        pipe.hset(task_id, TaskField.JOB_STATUS.value, json.dumps(status))
+        pipe.expire(task_id, TTL.REDIS_KEY.value)
+        await pipe.execute()
 
 
 async def patch_account_data_by_id(
@@ -40,18 +114,149 @@ async def patch_account_data_by_id(
         key: str,
         value: str,
         status_response: StatusType = None,
-) -> None:
-    redis_raw = await get_redis_task(task_id)
-    full_data = json.loads(redis_raw)
-    data_list = full_data.get('data')
-    for data in data_list:
-        if data.get('account') == account:
-            if status_response:
-                data['status_response'] = status_response
-            data[key] = value
-            break
+) -> int:
+    """Атомарно обновляет поле одного аккаунта задачи.
+    Возвращает число аккаунтов, оставшихся без результата.
+    """
+    remaining = await patch_account_script(
+        keys=[task_id],
+        args=[
+            account_field(account),
+            key,
+            json.dumps(value),
+            status_response or '',
+            TTL.REDIS_KEY.value,
+            TaskField.REMAINING.value,
+            StatusType.NEW.value,
+        ],
+    )
+    if remaining is None:
+        msg = f'Задача с task_id={task_id} не найдена.'
+        logger.debug(msg)
+        raise RedisTaskNotFound(msg)
+    return remaining
+
+
+def task_complete_channel(task_id: str) -> str:
+    """Канал события о завершении задачи."""
+    return TaskEvent.COMPLETE_CHANNEL.value.format(task_id=task_id)
+
+
+async def publish_task_complete(task_id: str) -> None:
+    """Оповещает ожидающих клиентов о завершении всех подзадач."""
+    await redis_client.publish(task_complete_channel(task_id), task_id)
+
+
+async def wait_for_task_completion(
+        task_id: str,
+        wait_seconds: float,
+) -> bool:
+    """Ждёт до wait_seconds секунд события о завершении задачи.
+    Подписка оформляется до проверки счётчика, поэтому событие,
+    опубликованное между проверкой и ожиданием, не теряется.
+    """
+    channel = task_complete_channel(task_id)
+    pubsub = redis_client.pubsub()
+    try:
+        await pubsub.subscribe(channel)
+        if await get_remaining_accounts(task_id) == 0:
+            return True
+        async with asyncio.timeout(wait_seconds):
+            async for message in pubsub.listen():
+                if message.get('type') == 'message':
+                    return True
+    except TimeoutError:
+        return False
+    finally:
+        await pubsub.unsubscribe(channel)
+        await pubsub.aclose()
+    return False
+
+
+def result_cache_key(
+        data: dict,
+        template: ResultCacheKey = ResultCacheKey.TEMPLATE,
+) -> str:
+    """Ключ кэша результата по нормализованным utility, account и city."""
+    return template.value.format(
+        utility=(data.get('utility') or '').strip().lower(),
+        account=''.join((data.get('account') or '').split()).lower(),
+        city=(data.get('city') or '').strip().lower(),
+    )
+
+
+async def get_cached_result(data: dict) -> dict | None:
+    """Результат парсинга из кэша или None."""
+    raw = await redis_client.get(result_cache_key(data))
+    if raw is None:
+        return None
+    return json.loads(raw)
+
+
+async def set_cached_result(data: dict, result: dict) -> None:
+    """Кэширует результат парсинга на TTL услуги."""
     await redis_client.set(
-        task_id,
-        json.dumps(full_data),
-        ex=TTL.REDIS_KEY.value,
+        result_cache_key(data),
+        json.dumps(result),
+        ex=RESULT_CACHE_TTL.get(
+            data.get('utility'),
+            RESULT_CACHE_DEFAULT_TTL,
+        ),
     )
+
+
+async def acquire_parse_lock(data: dict, token: str) -> bool:
+    """Пытается стать единственным исполнителем парсинга аккаунта."""
+    return bool(await redis_client.set(
+        result_cache_key(data, ResultCacheKey.LOCK_TEMPLATE),
+        token,
+        nx=True,
+        ex=PARSE_LOCK_TTL,
+    ))
+
+
+async def release_parse_lock(data: dict, token: str) -> None:
+    """Снимает блокировку парсинга, если она ещё наша."""
+    await release_lock_script(
+        keys=[result_cache_key(data, ResultCacheKey.LOCK_TEMPLATE)],
+        args=[token],
+    )
+
+
+async def publish_parse_result(data: dict, result: dict | None) -> None:
+    """Передаёт результат задачам, ожидающим тот же аккаунт.
+    None означает, что парсинг завершился ошибкой.
+    """
+    await redis_client.publish(
+        result_cache_key(data, ResultCacheKey.CHANNEL_TEMPLATE),
+        json.dumps(dict(result=result)),
+    )
+
+
+async def wait_for_parse_result(
+        data: dict,
+        wait_seconds: float,
+) -> dict | None:
+    """Ждёт результат парсинга, который выполняет другая задача.
+    Возвращает None, если исполнитель упал или не уложился в wait_seconds.
+    """
+    channel = result_cache_key(data, ResultCacheKey.CHANNEL_TEMPLATE)
+    pubsub = redis_client.pubsub()
+    try:
+        await pubsub.subscribe(channel)
+        cached = await get_cached_result(data)
+        if cached is not None:
+            return cached
+        lock_key = result_cache_key(data, ResultCacheKey.LOCK_TEMPLATE)
+        if not await redis_client.exists(lock_key):
+            return None
+        async with asyncio.timeout(wait_seconds):
+            async for message in pubsub.listen():
+                if message.get('type') == 'message':
+                    return json.loads(message.get('data')).get('result')
+    except TimeoutError:
+        return None
+    finally:
+        await pubsub.unsubscribe(channel)
+        await pubsub.aclose()
+    return None
@@ -0,0 +1,55 @@
+"""Общие настройки тестов parser_api.
+
+Переменные окружения задаются до импорта core.settings, URL сайтов ITF
+указывают на локальную заглушку, которая отдаёт сохранённые страницы
+из tests/fixtures/itf, URL списка прокси — на заглушку API Webshare.
+"""
+import os
+import socket
+import sys
+from pathlib import Path
+
+SRC_PATH = Path(__file__).resolve().parents[1]
+FIXTURES_PATH = Path(__file__).resolve().parent / 'fixtures' / 'itf'
+
+
+def free_port() -> int:
+    """Свободный локальный порт для заглушки."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+ITF_STUB_PORT = free_port()
+ITF_STUB_URL = f'http://127.0.0.1:{ITF_STUB_PORT}/itfllc/{{utility}}'
+WEBSHARE_STUB_PORT = free_port()
+WEBSHARE_STUB_URL = f'http://127.0.0.1:{WEBSHARE_STUB_PORT}/proxy/list/'
+
+TEST_ENV = dict(
+    REDIS_TEST_HOST='127.0.0.1',
+    REDIS_HOST='127.0.0.1',
+    REDIS_PORT='6379',
+    REDIS_PARSER_DB='15',
+    WEBSHARE_TOKEN='test',
+    WEBSHARE_LOGIN='test',
+    WEBSHARE_PASSWORD='test',
+    WEBSHARE_URL_LIST=WEBSHARE_STUB_URL,
+    CONVERSE_BANK_URL_GAS='http://127.0.0.1:1/converse/gas',
+    CONVERSE_BANK_URL_GAS_SERVICE='http://127.0.0.1:1/converse/gas_service',
+    CONVERSE_BANK_URL_WATER='http://127.0.0.1:1/converse/water',
+    CONVERSE_BANK_URL_ELECTRICITY='http://127.0.0.1:1/converse/electricity',
+    ITF_URL_GAS=ITF_STUB_URL.format(utility='gas'),
+    ITF_URL_WATER=ITF_STUB_URL.format(utility='water'),
+    ITF_URL_ELECTRICITY=ITF_STUB_URL.format(utility='electricity'),
+    API_PARSER_TOKEN='test',
+    DEBUG='false',
+)
+for name, value in TEST_ENV.items():
+    os.environ.setdefault(name, value)
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+
+def read_fixture(name: str) -> str:
+    """Текст сохранённой страницы ITF."""
+    return (FIXTURES_PATH / name).read_text(encoding='utf-8')
@@ -0,0 +1,8 @@
+/* Заглушка jQuery для бенчмарка: только $(selector).select2(). */
+window.$ = function (selector) {
+  return {
+    select2: function () {
+      document.querySelectorAll(selector).forEach(window.select2Stub);
+    },
+  };
+};
@@ -0,0 +1,36 @@
+/* Заглушка select2 для бенчмарка: та же разметка выпадающего списка,
+   по которой ParserITF выбирает город. */
+window.select2Stub = function (select) {
+  select.classList.add('d-none');
+  const rendered = document.createElement('span');
+  rendered.className = 'select2-selection__rendered';
+  rendered.textContent = select.options[select.selectedIndex].text;
+  const dropdown = document.createElement('div');
+  dropdown.className = 'd-none';
+  const search = document.createElement('input');
+  search.type = 'text';
+  search.className = 'select2-search__field';
+  const option = document.createElement('li');
+  option.className = (
+    'select2-results__option select2-results__option--highlighted'
+  );
+  dropdown.append(search, option);
+  select.after(rendered, dropdown);
+  rendered.addEventListener('click', function () {
+    dropdown.classList.remove('d-none');
+    search.focus();
+  });
+  search.addEventListener('input', function () {
+    const text = search.value.trim().toLowerCase();
+    const match = Array.from(select.options).find(function (item) {
+      return item.value && item.text.trim().toLowerCase().includes(text);
+    });
+    option.textContent = match ? match.text : '';
+    option.dataset.value = match ? match.value : '';
+  });
+  option.addEventListener('click', function () {
+    select.value = option.dataset.value;
+    rendered.textContent = option.textContent;
+    dropdown.classList.add('d-none');
+  });
+};
@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+
+from benchmarks.itf_stub import HIDDEN_PREFIX, NOT_FOUND_PREFIX, start_stub
+from core.exceptions import Account404, Selector404
+from services.parser.sites.ITF.http_parser import (
+    ParserITFHttp,
+    parse_itf_page,
+)
+from tests.conftest import ITF_STUB_PORT, read_fixture
+
+NOT_FOUND_ACCOUNT = f'{NOT_FOUND_PREFIX}000'
+HIDDEN_ACCOUNT = f'{HIDDEN_PREFIX}000'
+
+
+async def parse_on_fixture_site(message_data: dict) -> tuple[dict, list]:
+    """Запускает заглушку и парсит счёт через ParserITFHttp."""
+    requests = []
+    runner = await start_stub(ITF_STUB_PORT, requests=requests)
+    try:
+        return await ParserITFHttp(message_data).get_data(), requests
+    finally:
+        await runner.cleanup()
+
+
+def test_page_with_hidden_alert_returns_cards() -> None:
+    """Скрытое inline-стилем сообщение об ошибке не мешает карточкам."""
+    page = parse_itf_page(read_fixture('gas_result.html'))
+
+    assert page.alert_text == ''
+    assert page.cards['Պարտք'] == '1 550'
+
+
+def test_void_tags_do_not_leak_page_text_into_alert() -> None:
+    """Пустые теги внутри ошибки не захватывают остаток страницы."""
+    page = parse_itf_page(read_fixture('not_found.html'))
+
+    assert 'Абонент не найден' in page.alert_text
+    assert '©' not in page.alert_text
+
+
+def test_options_without_closing_tag_are_collected() -> None:
+    """Варианты без </option> попадают в список городов."""
+    form = parse_itf_page(read_fixture('gas_form.html')).find_form(
+        'customer_id',
+    )
+
+    assert form.selects['city']['ереван'] == '6522'
+    assert form.selects['city']['гюмри'] == '6543'
+    assert form.selects['city']['алаверди'] == '6537'
+
+
+def test_gas_result_from_fixture_site() -> None:
+    """Газ: форма с CSRF и городом отправляется, карточки разбираются."""
+    data, requests = asyncio.run(parse_on_fixture_site(dict(
+        account='100200', utility='gas', city='ереван',
+    )))
+
+    assert requests == [dict(
+        _token='FIXTURE-CSRF-TOKEN', customer_id='100200', city='6522',
+    )]
+    assert data == dict(
+        address='Ք. ԵՐԵՎԱՆ, ՓՈՂՈՑ 1, ՏՈՒՆ 1',
+        consumption='12.5',
+        debit_consumption='1 250',
+        debit_service='300',
+        debit_full='1 550',
+    )
+
+
+@pytest.mark.parametrize(('utility', 'debit_full'), [
+    ('water', '2 100'),
+    ('electricity', '9 000'),
+])
+def test_result_from_fixture_site(utility: str, debit_full: str) -> None:
+    """Вода и электричество разбираются по сохранённым страницам."""
+    data, _ = asyncio.run(parse_on_fixture_site(dict(
+        account='100200', utility=utility,
+    )))
+
+    assert data['debit_full'] == debit_full
+
+
+def test_visible_alert_without_cards_is_account404() -> None:
+    """Видимая ошибка без карточек — счёт не найден."""
+    with pytest.raises(Account404):
+        asyncio.run(parse_on_fixture_site(dict(
+            account=NOT_FOUND_ACCOUNT, utility='water',
+        )))
+
+
+def test_hidden_result_card_is_selector404() -> None:
+    """Скрытая карточка результата — Selector404."""
+    with pytest.raises(Selector404):
+        asyncio.run(parse_on_fixture_site(dict(
+            account=HIDDEN_ACCOUNT, utility='electricity',
+        )))
+
+
+def test_unknown_city_is_selector404() -> None:
+    """Города нет в списке — Selector404."""
+    with pytest.raises(Selector404):
+        asyncio.run(parse_on_fixture_site(dict(
+            account='100200', utility='gas', city='москва',
+        )))
@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+from playwright.async_api import Error, async_playwright
+
+from core.exceptions import Account404
+from services.parser.sites.ITF.parser import ParserITF
+from tests.conftest import read_fixture
+
+
+async def wait_on_fixture_page(name: str) -> str:
+    """Открывает сохранённую страницу ITF в Chromium и ждёт
+    карточку результата или сообщение об ошибке.
+    """
+    async with async_playwright() as playwright:
+        try:
+            browser = await playwright.chromium.launch(headless=True)
+        except Error as e:
+            pytest.skip(f'Chromium недоступен: {e.message.splitlines()[0]}')
+        try:
+            parser = ParserITF(message_data=dict(
+                account='100200', utility='gas', city='ереван',
+            ))
+            parser.page = await browser.new_page()
+            await parser.page.set_content(read_fixture(name))
+            element = await parser.wait_for_result_or_alert(
+                '#resultcard',
+                1_000,
+            )
+            return await element.get_attribute('id')
+        finally:
+            await browser.close()
+
+
+def test_hidden_alert_does_not_block_result() -> None:
+    """Скрытое сообщение об ошибке перед карточкой не мешает ожиданию."""
+    assert asyncio.run(wait_on_fixture_page('gas_result.html')) == (
+        'resultcard'
+    )
+
+
+def test_visible_alert_means_account_not_found() -> None:
+    """Видимое сообщение об ошибке — счёт не найден."""
+    with pytest.raises(Account404):
+        asyncio.run(wait_on_fixture_page('not_found.html'))
@@ -0,0 +1,59 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+import services.parser.config as conf
+from services.parser.static_cache import StaticAssetCache
+
+
+@pytest.mark.parametrize(
+    ('url', 'expected'),
+    [
+        ('https://www.itfllc.am/assets/app.js', True),
+        ('https://itfllc.am/assets/app.css?v=20240101', True),
+        ('https://www.itfllc.am/assets/APP.JS?v=2#top', True),
+        ('https://www.itfllc.am/itfllc/gas', False),
+        ('https://www.itfllc.am/page?file=app.js', False),
+        ('https://cdn.example.com/app.js', False),
+        ('https://notitfllc.am/app.js', False),
+    ],
+)
+def test_is_cacheable_matches_url_path(url: str, expected: bool) -> None:
+    """Совпадение по хосту и расширению пути, query не учитывается."""
+    assert StaticAssetCache.is_cacheable(url) is expected
+
+
+@pytest.mark.parametrize(
+    ('url', 'expected'),
+    [
+        ('https://www.itfllc.am/img/logo.PNG', True),
+        ('https://www.itfllc.am/fonts/main.woff2?v=3', True),
+        ('https://cdn.example.com/video.mp4#t=10', True),
+        ('https://www.itfllc.am/assets/app.js', False),
+        ('https://www.itfllc.am/page?image=logo.png', False),
+    ],
+)
+def test_block_pattern_matches_media_by_path(
+        url: str,
+        expected: bool,
+) -> None:
+    """Картинки, шрифты и медиа отменяются по расширению пути."""
+    assert bool(conf.ROUTE_BLOCK_PATTERN.match(url)) is expected
+
+
+def test_write_then_read_leaves_no_temp_files(tmp_path: Path) -> None:
+    """Запись атомарна: после неё остаются только тело и заголовки."""
+    cache = StaticAssetCache(directory=tmp_path / 'static')
+    url = 'https://www.itfllc.am/assets/app.js?v=1'
+    headers = {'content-type': 'application/javascript'}
+
+    async def write_and_read() -> tuple[bytes, dict] | None:
+        await cache.write(url, b'console.log(1);', headers)
+        return await cache.read(url)
+
+    assert asyncio.run(write_and_read()) == (b'console.log(1);', headers)
+    assert sorted(path.suffix for path in cache.directory.iterdir()) == [
+        '',
+        '.json',
+    ]
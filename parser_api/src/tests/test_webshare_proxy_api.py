@@ -0,0 +1,109 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+
+import pytest
+from aiohttp import web
+
+from core.exceptions import (
+    ApiRateLimitedError,
+    ApiResponseDataError,
+    ApiResponseStatusError,
+)
+from services.enums import WebshareProxy
+from services.parser.proxy import (
+    get_api_proxy_list,
+    get_api_proxy_list_with_retry,
+)
+from tests.conftest import WEBSHARE_STUB_PORT, WEBSHARE_STUB_URL
+
+PROXY_LIST = [
+    dict(
+        id='d-1',
+        username='user',
+        password='secret',
+        proxy_address='10.0.0.1',
+        port=8001,
+        valid=True,
+    ),
+    dict(
+        id='d-2',
+        username='user',
+        password='secret',
+        proxy_address='10.0.0.2',
+        port=8002,
+        valid=False,
+    ),
+]
+
+
+def build_webshare_stub(
+        status: int,
+        payload: object,
+        requests: list,
+) -> web.Application:
+    """Заглушка API Webshare: отдаёт заданные статус и тело ответа."""
+
+    async def proxy_list(request: web.Request) -> web.Response:
+        requests.append(request)
+        return web.json_response(payload, status=status)
+
+    app = web.Application()
+    app.router.add_get('/proxy/list/', proxy_list)
+    return app
+
+
+async def fetch_from_stub(
+        status: int,
+        payload: object,
+        fetch: Callable[[], Awaitable[object]],
+) -> tuple[object, list]:
+    """Запускает заглушку Webshare и запрашивает через неё список."""
+    requests = []
+    runner = web.AppRunner(build_webshare_stub(status, payload, requests))
+    await runner.setup()
+    await web.TCPSite(runner, '127.0.0.1', WEBSHARE_STUB_PORT).start()
+    try:
+        return await fetch(), requests
+    finally:
+        await runner.cleanup()
+
+
+def fetch_once() -> Awaitable[list]:
+    """Один запрос к заглушке без повторов."""
+    return get_api_proxy_list(
+        url=WEBSHARE_STUB_URL,
+        headers=WebshareProxy.HEADERS.value,
+        params=WebshareProxy.PARAMS_URL_LIST.value,
+        required_key=WebshareProxy.RESULT_KEY.value,
+    )
+
+
+def test_proxy_list_from_webshare_stub() -> None:
+    """Список берётся из results, в запросе токен и режим direct."""
+    proxy_list, requests = asyncio.run(fetch_from_stub(
+        200,
+        dict(count=len(PROXY_LIST), results=PROXY_LIST),
+        get_api_proxy_list_with_retry,
+    ))
+    assert proxy_list == PROXY_LIST
+    assert len(requests) == 1
+    assert requests[0].headers['Authorization'] == 'Token test'
+    assert requests[0].query['mode'] == 'direct'
+
+
+@pytest.mark.parametrize(
+    ('status', 'payload', 'error'),
+    [
+        (429, dict(detail='throttled'), ApiRateLimitedError),
+        (500, dict(detail='error'), ApiResponseStatusError),
+        (200, PROXY_LIST, ApiResponseDataError),
+    ],
+)
+def test_webshare_stub_errors(
+        status: int,
+        payload: object,
+        error: type[Exception],
+) -> None:
+    """Ошибки API Webshare поднимаются своими исключениями."""
+    with pytest.raises(error):
+        asyncio.run(fetch_from_stub(status, payload, fetch_once))
@@ -6,6 +6,9 @@ class QueueStatus(str, Enum):
     RESULT = ':result'
     FAILED = ':failed'
     RETRY = ':retry'
+    IN_FLIGHT = ':in_flight'
+    LEASE = ':lease'
+    WORKERS = ':workers'
 
 
 class FieldLength(int, Enum):
@@ -13,6 +16,14 @@ class FieldLength(int, Enum):
     ERROR = 60
 
 
+class ReliableQueueSettings(int, Enum):
+    """Параметры надёжной очереди."""
+
+    VISIBILITY_TIMEOUT = 300
+    MAX_DELIVERIES = 3
+    BLOCK_TIMEOUT = 5
+
+
 class WorkerMessage(str, Enum):
     TASK_RECEIVED = 'Получена задача: func({function}) data: {data}'
     TASK_SENT = 'Передана задача: queue({queue}) task_id: {task_id} data: {data}'
@@ -21,7 +32,15 @@ class WorkerMessage(str, Enum):
     JSON_DECODE_ERROR = 'Ошибка декодирования JSON: {error}'
     DATA_RECEIVED = 'Получена data: {data} -> func: {function}'
     WORKER_STOPPED = 'Worker остановлен вручную.'
+    WORKER_DRAINING = 'Ожидание завершения запущенных задач: {count}'
+    WORKER_DRAIN_TIMEOUT = 'Не дождались завершения задач, отменены: {count}'
     PROCESSING_ERROR = (
         'Ошибка во время обработки задачи: func: {function} error: {error}'
     )
+    TASK_REQUEUED = (
+        'Возвращено в очередь {queue} задач: {count} (worker {worker_id})'
+    )
+    TASK_RETRY = 'Задача возвращена в очередь {queue} после ошибки'
+    TASK_FAILED = 'Задача перенесена в {queue}:failed после ошибки'
+    LEASE_ERROR = 'Ошибка продления аренды задач: {error}'
     QUEUE_VALIDATION_ERROR = 'Ошибка валидации конфигурации очереди: {error}'
@@ -2,7 +2,7 @@ import asyncio
 import json
 import logging
 import uuid
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from json import JSONDecodeError
 from typing import Any, Awaitable, Callable, Optional
 
@@ -12,8 +12,13 @@ from redis.asyncio import Redis
 from workers.async_rq_worker.enums import (
     FieldLength,
     QueueStatus,
+    ReliableQueueSettings,
     WorkerMessage,
 )
+from workers.async_rq_worker.scripts import (
+    REJECT_TASK,
+    REQUEUE_EXPIRED_LEASE,
+)
 
 
 class QueueValidator(BaseModel):
@@ -34,6 +39,15 @@ class AsyncRQWorker:
         task_id (str | None): Идентификатор текущей задачи.
         function (Callable[[dict], Awaitable[None]] | None): Обрабатывающая функция.
         logger (logging.Logger | None): Пользовательский или дефолтный логгер.
+        concurrency (int): Сколько задач воркер выполняет одновременно.
+        drain_timeout (int): Сколько секунд при остановке ждать
+            завершения уже запущенных задач.
+        reliable (bool): Режим at-least-once: задача переносится
+            в in-flight список воркера и удаляется только после выполнения.
+        visibility_timeout (int): TTL аренды воркера в секундах. Если воркер
+            не продлил аренду, его задачи возвращаются в очередь.
+        max_deliveries (int): После стольких выдач задача уходит в :failed.
+        worker_id (str): Идентификатор воркера для in-flight списков.
 
     Методы:
         init_queues():
@@ -44,13 +58,35 @@ class AsyncRQWorker:
 
         get_task_from_queue():
             Блокирующее получение задачи из одной из очередей.
+            В режиме reliable задача атомарно переносится (BLMOVE)
+            в in-flight список воркера.
+
+        ack_task(queue_name, raw_data):
+            Подтверждает выполнение задачи и убирает её из in-flight списка.
+
+        reject_task(queue_name, raw_data):
+            Убирает упавшую задачу из in-flight списка: возвращает её
+            в конец очереди или переносит в :failed, если лимит доставок
+            исчерпан.
+            В in-flight остаются только задачи, прерванные падением
+            или отменой воркера.
+
+        requeue_expired():
+            Возвращает в очередь задачи воркеров с истёкшей арендой.
 
         set_task_in_queue(data, queue_name=None, task_id=None):
             Сериализует и помещает задачу в очередь (по умолчанию — первая в списке).
 
+        process_task(raw_data):
+            Десериализует задачу и передаёт её в функцию обработки.
+
+        drain():
+            Дожидается завершения запущенных задач при остановке воркера.
+
         run():
-            Основной цикл обработки: получает задачи, десериализует и передаёт в функцию.
-            Обрабатывает ошибки, включая отмену и ошибки сериализации/логики.
+            Основной цикл обработки: под семафором забирает до concurrency
+            задач и выполняет их параллельно.
+            При отмене перестаёт брать новые задачи и дожидается текущих.
 
     Исключения:
         - ValueError: При ошибке валидации очередей или JSON-декодировании.
@@ -62,6 +98,15 @@ class AsyncRQWorker:
     task_id: str = None
     function: Optional[Callable[[dict], Awaitable[None]]] = None
     logger: Optional[logging.Logger] = None
+    concurrency: int = 1
+    drain_timeout: int = 60
+    running_tasks: set[asyncio.Task] = field(default_factory=set)
+    reliable: bool = False
+    visibility_timeout: int = ReliableQueueSettings.VISIBILITY_TIMEOUT.value
+    max_deliveries: int = ReliableQueueSettings.MAX_DELIVERIES.value
+    worker_id: str = field(
+        default_factory=lambda: str(uuid.uuid4())[:FieldLength.TASK_ID.value],
+    )
 
     def __post_init__(self):
         self.queue_names = self.init_queues()
@@ -91,8 +136,46 @@ class AsyncRQWorker:
             return logging.getLogger(__name__)
         return self.logger
 
+    def in_flight_key(self, queue_name: str, worker_id: str = None) -> str:
+        """Список задач, взятых воркером в работу."""
+        return (
+            f'{queue_name}{QueueStatus.IN_FLIGHT.value}'
+            f':{worker_id or self.worker_id}'
+        )
+
+    def lease_key(self, queue_name: str, worker_id: str = None) -> str:
+        """Ключ аренды задач воркера."""
+        return (
+            f'{queue_name}{QueueStatus.LEASE.value}'
+            f':{worker_id or self.worker_id}'
+        )
+
+    async def fetch_reliable(self) -> tuple[str, str] | None:
+        """Переносит задачу из очереди в список in-flight."""
+        for queue_name in self.queue_names:
+            raw_data = await self.redis_client.blmove(
+                queue_name,
+                self.in_flight_key(queue_name),
+                ReliableQueueSettings.BLOCK_TIMEOUT.value,
+                'LEFT',
+                'LEFT',
+            )
+            if raw_data is not None:
+                await self.redis_client.hincrby(
+                    queue_name + QueueStatus.RETRY.value,
+                    raw_data,
+                    1,
+                )
+                return queue_name, raw_data
+        return None
+
     async def get_task_from_queue(self) -> Any:
-        task = await self.redis_client.blpop(self.queue_names)
+        if self.reliable:
+            task = await self.fetch_reliable()
+            if task is None:
+                return None
+        else:
+            task = await self.redis_client.blpop(self.queue_names)
         self.logger.info(
             WorkerMessage.TASK_RECEIVED.value.format(
                 function=self.function_name,
@@ -101,6 +184,125 @@ class AsyncRQWorker:
         )
         return task
 
+    async def ack_task(self, queue_name: str, raw_data: str) -> None:
+        """Подтверждает выполнение задачи."""
+        if not self.reliable:
+            return
+        async with self.redis_client.pipeline(transaction=True) as pipe:
+            pipe.lrem(self.in_flight_key(queue_name), 1, raw_data)
+            pipe.hdel(queue_name + QueueStatus.RETRY.value, raw_data)
+            await pipe.execute()
+
+    async def reject_task(self, queue_name: str, raw_data: str) -> None:
+        """Снимает упавшую задачу с in-flight списка: возвращает её
+        в очередь или, если лимит доставок исчерпан, переносит в :failed.
+        """
+        if not self.reliable:
+            return
+        result = await self.redis_client.eval(
+            REJECT_TASK,
+            4,
+            self.in_flight_key(queue_name),
+            queue_name + QueueStatus.FAILED.value,
+            queue_name + QueueStatus.RETRY.value,
+            queue_name,
+            raw_data,
+            self.max_deliveries,
+        )
+        if result == 1:
+            self.logger.warning(
+                WorkerMessage.TASK_RETRY.value.format(queue=queue_name),
+            )
+        elif result == 2:
+            self.logger.warning(
+                WorkerMessage.TASK_FAILED.value.format(queue=queue_name),
+            )
+
+    async def renew_lease(self) -> None:
+        """Продлевает аренду задач воркера."""
+        async with self.redis_client.pipeline(transaction=True) as pipe:
+            for queue_name in self.queue_names:
+                pipe.set(
+                    self.lease_key(queue_name),
+                    self.worker_id,
+                    ex=self.visibility_timeout,
+                )
+                pipe.sadd(
+                    queue_name + QueueStatus.WORKERS.value,
+                    self.worker_id,
+                )
+            await pipe.execute()
+
+    async def requeue_worker_tasks(
+            self,
+            queue_name: str,
+            worker_id: str,
+    ) -> int:
+        """Возвращает в очередь задачи воркера с истёкшей арендой."""
+        return await self.redis_client.eval(
+            REQUEUE_EXPIRED_LEASE,
+            6,
+            self.in_flight_key(queue_name, worker_id),
+            self.lease_key(queue_name, worker_id),
+            queue_name,
+            queue_name + QueueStatus.FAILED.value,
+            queue_name + QueueStatus.RETRY.value,
+            queue_name + QueueStatus.WORKERS.value,
+            worker_id,
+            self.max_deliveries,
+        )
+
+    async def requeue_expired(self) -> None:
+        """Возвращает в очередь задачи упавших воркеров."""
+        for queue_name in self.queue_names:
+            worker_ids = await self.redis_client.smembers(
+                queue_name + QueueStatus.WORKERS.value,
+            )
+            for worker_id in worker_ids:
+                count = await self.requeue_worker_tasks(queue_name, worker_id)
+                if count > 0:
+                    self.logger.warning(
+                        WorkerMessage.TASK_REQUEUED.value.format(
+                            queue=queue_name,
+                            count=count,
+                            worker_id=worker_id,
+                        ),
+                    )
+
+    async def keep_lease(self) -> None:
+        """Продлевает аренду воркера и запускает возврат задач
+        упавших воркеров, пока воркер работает.
+        """
+        while True:
+            try:
+                await self.renew_lease()
+                await self.requeue_expired()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(
+                    WorkerMessage.LEASE_ERROR.value.format(
+                        error=str(e)[:FieldLength.ERROR.value],
+                    ),
+                )
+            await asyncio.sleep(self.visibility_timeout / 3)
+
+    async def release_lease(self) -> None:
+        """Снимает аренду при остановке и сразу возвращает
+        невыполненные задачи воркера в очередь.
+        """
+        for queue_name in self.queue_names:
+            await self.redis_client.delete(self.lease_key(queue_name))
+            count = await self.requeue_worker_tasks(queue_name, self.worker_id)
+            if count > 0:
+                self.logger.info(
+                    WorkerMessage.TASK_REQUEUED.value.format(
+                        queue=queue_name,
+                        count=count,
+                        worker_id=self.worker_id,
+                    ),
+                )
+
     async def set_task_in_queue(
             self,
             data: dict,
@@ -129,6 +331,78 @@ class AsyncRQWorker:
             json.dumps(task_template, ensure_ascii=False),
         )
 
+    async def process_task(self, raw_data: str) -> None:
+        """Декодирует задачу и вызывает функцию обработки."""
+        try:
+            data = json.loads(raw_data)
+        except JSONDecodeError as e:
+            raise ValueError(
+                WorkerMessage.JSON_DECODE_ERROR.value.format(
+                    error=str(e)[:FieldLength.ERROR.value],
+                ),
+            )
+        self.logger.info(
+            WorkerMessage.DATA_RECEIVED.value.format(
+                data=data,
+                function=self.function_name,
+            ),
+        )
+        task_id = list(data.keys())[0]
+        cleaned_data = list(data.values())[0]
+        await self.function(task_id, cleaned_data)
+
+    async def run_task(
+            self,
+            queue_name: str,
+            raw_data: str,
+            semaphore: asyncio.Semaphore,
+    ) -> None:
+        """Выполняет задачу и подтверждает её или переносит в failed."""
+        try:
+            await self.process_task(raw_data)
+            await self.ack_task(queue_name, raw_data)
+        except Exception as e:
+            self.logger.error(
+                WorkerMessage.PROCESSING_ERROR.value.format(
+                    function=self.function_name,
+                    error=str(e)[:FieldLength.ERROR.value],
+                ),
+            )
+            try:
+                await self.reject_task(queue_name, raw_data)
+            except Exception as reject_error:
+                self.logger.error(
+                    WorkerMessage.PROCESSING_ERROR.value.format(
+                        function=self.function_name,
+                        error=str(reject_error)[:FieldLength.ERROR.value],
+                    ),
+                )
+        finally:
+            semaphore.release()
+
+    async def drain(self) -> None:
+        """Ждёт завершения запущенных задач перед остановкой."""
+        if not self.running_tasks:
+            return
+        self.logger.info(
+            WorkerMessage.WORKER_DRAINING.value.format(
+                count=len(self.running_tasks),
+            ),
+        )
+        _, pending = await asyncio.wait(
+            self.running_tasks,
+            timeout=self.drain_timeout,
+        )
+        for task in pending:
+            task.cancel()
+        if pending:
+            self.logger.warning(
+                WorkerMessage.WORKER_DRAIN_TIMEOUT.value.format(
+                    count=len(pending),
+                ),
+            )
+            await asyncio.gather(*pending, return_exceptions=True)
+
     async def run(self):
         self.logger.info(
             WorkerMessage.WORKER_STARTED.value.format(worker=self),
@@ -136,31 +410,35 @@ class AsyncRQWorker:
         if not self.function:
             self.logger.debug(WorkerMessage.NO_FUNCTION.value)
             raise RuntimeError(WorkerMessage.NO_FUNCTION.value)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        lease_task = None
+        if self.reliable:
+            await self.renew_lease()
+            lease_task = asyncio.create_task(self.keep_lease())
         while True:
             try:
-                item = await self.get_task_from_queue()
-                if item:
-                    queue_name, raw_data = item
-                    try:
-                        data = json.loads(raw_data)
-                    except JSONDecodeError as e:
-                        raise ValueError(
-                            WorkerMessage.JSON_DECODE_ERROR.value.format(
-                                error=str(e)[:FieldLength.ERROR.value],
-                            ),
-                        )
-                    else:
-                        self.logger.info(
-                            WorkerMessage.DATA_RECEIVED.value.format(
-                                data=data,
-                                function=self.function_name,
-                            ),
-                        )
-                        task_id = list(data.keys())[0]
-                        cleaned_data = list(data.values())[0]
-                        await self.function(task_id, cleaned_data)
+                await semaphore.acquire()
+                try:
+                    item = await self.get_task_from_queue()
+                except BaseException:
+                    semaphore.release()
+                    raise
+                if not item:
+                    semaphore.release()
+                    continue
+                queue_name, raw_data = item
+                task = asyncio.create_task(
+                    self.run_task(queue_name, raw_data, semaphore),
+                )
+                self.running_tasks.add(task)
+                task.add_done_callback(self.running_tasks.discard)
             except asyncio.CancelledError:
                 self.logger.info(WorkerMessage.WORKER_STOPPED.value)
+                await self.drain()
+                if lease_task is not None:
+                    lease_task.cancel()
+                    await asyncio.gather(lease_task, return_exceptions=True)
+                    await self.release_lease()
                 break
             except Exception as e:
                 self.logger.error(
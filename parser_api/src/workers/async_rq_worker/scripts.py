@@ -0,0 +1,44 @@
+# Возвращает в очередь задачи воркера, чья аренда истекла.
+# Задачи, превысившие лимит доставок, уходят в список :failed.
+# KEYS: in_flight, lease, queue, failed, deliveries, workers
+# ARGV: worker_id, max_deliveries
+REQUEUE_EXPIRED_LEASE = """
+if redis.call('EXISTS', KEYS[2]) == 1 then
+    return -1
+end
+local moved = 0
+local task = redis.call('RPOP', KEYS[1])
+while task do
+    local deliveries = tonumber(redis.call('HGET', KEYS[5], task) or '0')
+    if deliveries >= tonumber(ARGV[2]) then
+        redis.call('HDEL', KEYS[5], task)
+        redis.call('LPUSH', KEYS[4], task)
+    else
+        redis.call('LPUSH', KEYS[3], task)
+    end
+    moved = moved + 1
+    task = redis.call('RPOP', KEYS[1])
+end
+redis.call('SREM', KEYS[6], ARGV[1])
+return moved
+"""
+
+
+# Снимает упавшую задачу с in-flight списка воркера.
+# Пока лимит доставок не исчерпан, задача возвращается в конец очереди
+# со счётчиком доставок, после этого уходит в :failed.
+# KEYS: in_flight, failed, deliveries, queue
+# ARGV: task, max_deliveries
+REJECT_TASK = """
+if redis.call('LREM', KEYS[1], 1, ARGV[1]) == 0 then
+    return 0
+end
+local deliveries = tonumber(redis.call('HGET', KEYS[3], ARGV[1]) or '0')
+if deliveries >= tonumber(ARGV[2]) then
+    redis.call('HDEL', KEYS[3], ARGV[1])
+    redis.call('LPUSH', KEYS[2], ARGV[1])
+    return 2
+end
+redis.call('RPUSH', KEYS[4], ARGV[1])
+return 1
+"""
@@ -1,4 +1,5 @@
-import json
+import asyncio
+import uuid
 
 from tenacity import (
     RetryError,
@@ -10,36 +11,34 @@ from tenacity import (
 from core.exceptions import (
     Account404,
     CustomBaseException,
-    JsonError,
+    ParserError,
     Selector404,
     StatusError,
     ValidationError,
 )
 from core.logger_settings import logger
-from services.enums import StatusType
+from services.enums import MetricPhase, StatusType
+from services.metrics import record_error, record_task, track_phase
 from services.parser.app import Parser
 from services.utils import (
+    PARSE_LOCK_WAIT,
+    acquire_parse_lock,
     change_job_status,
-    get_redis_task,
+    get_cached_result,
+    get_remaining_accounts,
     patch_account_data_by_id,
+    publish_parse_result,
+    publish_task_complete,
+    release_parse_lock,
+    set_cached_result,
+    wait_for_parse_result,
 )
 
 ERROR_LEN_MSG = 100
 
 
 async def check_all_task_for_completion(task_id: str) -> bool:
-    raw = await get_redis_task(task_id)
-    try:
-        task_data = json.loads(raw)
-    except json.JSONDecodeError:
-        msg = f'Ошибка при декодировании JSON для task_id={task_id}'
-        logger.error(msg)
-        raise JsonError(msg)
-    list_tasks = task_data.get('data')
-    for task in list_tasks:
-        if task.get('status_response') in (StatusType.NEW.value, None):
-            return False
-    return True
+    return await get_remaining_accounts(task_id) == 0
 
 
 async def forming_error_response(
@@ -53,22 +52,51 @@ async def forming_error_response(
         error_class_name = original_exception.__class__.__name__
         error_message = str(original_exception)[:ERROR_LEN_MSG]
         logger.error(f'{error_message}')
+        record_error(original_exception)
     else:
         error_class_name = _exception.__class__.__name__
         error_message = str(_exception)[:ERROR_LEN_MSG]
         logger.error(f'{error_message}')
-    return (
+        record_error(_exception)
+    record_task(data.get('utility'), StatusType.ERROR.value)
+    with track_phase(MetricPhase.REDIS_PATCH.value):
+        return (
+            await patch_account_data_by_id(
+                task_id=task_id,
+                account=data.get('account'),
+                status_response=StatusType.ERROR.value,
+                key='response',
+                value=dict(
+                    error=error_class_name,
+                    message=error_message,
+                ),
+            )
+        )
+
+
+async def save_account_result(
+        task_id: str,
+        data: dict,
+        result_data: dict,
+) -> None:
+    """Сохраняет результат аккаунта в задаче."""
+    record_task(data.get('utility'), StatusType.COMPLETE.value)
+    with track_phase(MetricPhase.REDIS_PATCH.value):
         await patch_account_data_by_id(
             task_id=task_id,
             account=data.get('account'),
-            status_response=StatusType.ERROR.value,
+            status_response=StatusType.COMPLETE.value,
             key='response',
-            value=dict(
-                error=error_class_name,
-                message=error_message,
-            ),
+            value=result_data,
         )
-    )
+
+
+async def load_cached_result(data: dict) -> dict | None:
+    """Результат из кэша, если не запрошено обновление."""
+    if data.get('force_refresh'):
+        return None
+    with track_phase(MetricPhase.CACHE_LOOKUP.value):
+        return await get_cached_result(data)
 
 
 @retry(
@@ -80,18 +108,199 @@ async def parser_run_with_retry(parser: Parser) -> dict:
     return await parser.run()
 
 
-async def start_parsing(task_id: str, data: dict) -> dict:
-    logger.info(f'Worker выполняет: task_id: {task_id}, data: {data}')
+async def run_parser(data: dict) -> dict:
+    """Парсит аккаунт и кэширует результат."""
+    parser = Parser(message_data=data)
+    result_data = await parser_run_with_retry(parser)
+    await set_cached_result(data, result_data)
+    return result_data
+
+
+async def run_parser_single_flight(data: dict) -> dict:
+    """Запускает парсинг аккаунта не более одного раза одновременно.
+    Параллельные задачи с тем же аккаунтом дожидаются результата
+    первой, а при её ошибке запускают парсинг сами.
+    """
+    token = str(uuid.uuid4())
+    if not await acquire_parse_lock(data, token):
+        result_data = await wait_for_parse_result(data, PARSE_LOCK_WAIT)
+        if result_data is not None:
+            logger.info(
+                f'Результат получен от параллельной задачи: '
+                f'{data.get("utility")}, {data.get("account")}',
+            )
+            return result_data
+        return await run_parser(data)
+    result_data = None
     try:
-        parser = Parser(message_data=data)
-        result_data = await parser_run_with_retry(parser)
-        await patch_account_data_by_id(
-            task_id=task_id,
-            account=data.get('account'),
-            status_response=StatusType.COMPLETE.value,
-            key='response',
-            value=result_data,
+        result_data = await run_parser(data)
+        return result_data
+    finally:
+        await release_parse_lock(data, token)
+        await publish_parse_result(data, result_data)
+
+
+async def finish_task_if_complete(task_id: str) -> None:
+    """Завершает задачу, если все аккаунты обработаны."""
+    if await check_all_task_for_completion(task_id):
+        await change_job_status(task_id, StatusType.COMPLETE.value)
+        await publish_task_complete(task_id)
+        logger.info(
+            f'Все подзадачи по task_id={task_id} завершены.',
         )
+
+
+async def run_parser_bulk(
+        accounts: list[dict],
+        tokens: list[str],
+) -> list[dict | Exception]:
+    """Парсит счета одного сайта в одной сессии браузера.
+    По каждому счёту уже взята single-flight блокировка с токеном из tokens.
+    Блокировки снимаются, а результаты публикуются ожидающим задачам
+    так же, как в одиночном режиме.
+    """
+    if not accounts:
+        return []
+    results = []
+    try:
+        try:
+            results = await Parser(message_data=accounts[0]).run_bulk(
+                accounts,
+            )
+        except Exception as e:
+            results = [e] * len(accounts)
+        return results
+    finally:
+        for index, (data, token) in enumerate(zip(accounts, tokens)):
+            result_data = results[index] if index < len(results) else None
+            if isinstance(result_data, Exception):
+                result_data = None
+            if result_data is not None:
+                await set_cached_result(data, result_data)
+            await release_parse_lock(data, token)
+            await publish_parse_result(data, result_data)
+
+
+async def fail_unresolved_accounts(
+        task_id: str,
+        accounts: list[dict],
+        error: Exception,
+) -> None:
+    """Сохраняет ошибку для счетов пакета, оставшихся без результата."""
+    for account_data in accounts:
+        try:
+            await forming_error_response(
+                task_id=task_id,
+                data=account_data,
+                _exception=error,
+            )
+        except Exception as e:
+            logger.error(
+                f'Не удалось сохранить ошибку счёта: '
+                f'task_id: {task_id}, ошибка: {str(e)}',
+            )
+
+
+async def save_bulk_results(
+        task_id: str,
+        parsed: list[tuple[int, dict, str]],
+        results: list[dict | Exception],
+        unresolved: dict[int, dict],
+) -> None:
+    """Сохраняет результат или ошибку каждого счёта пакетного парсинга
+    и убирает сохранённые счета из unresolved.
+    """
+    for (index, account_data, _), result_data in zip(parsed, results):
+        if isinstance(result_data, Exception):
+            await forming_error_response(
+                task_id=task_id,
+                data=account_data,
+                _exception=result_data,
+            )
+        else:
+            await save_account_result(task_id, account_data, result_data)
+        unresolved.pop(index)
+
+
+async def start_bulk_parsing(task_id: str, data: dict) -> None:
+    """Обрабатывает пакет счетов одной задачи на одном сайте.
+    Счета из кэша и счета, которые уже парсит другая задача,
+    обрабатываются по одному, остальные — одной сессией браузера.
+    При сбое снимаются все взятые блокировки, а счета без результата
+    получают ошибку. Завершение задачи проверяется один раз.
+    При отмене воркером блокировки снимаются, а счета остаются
+    без результата: надёжная очередь выдаст пакет повторно.
+    """
+    accounts = [
+        dict(account_data, force_refresh=data.get('force_refresh'))
+        for account_data in data.get('accounts')
+    ]
+    logger.info(
+        f'Worker выполняет пакет: task_id: {task_id}, '
+        f'счетов: {len(accounts)}',
+    )
+    unresolved = dict(enumerate(accounts))
+    locked, delegated = [], []
+    error = None
+    is_cancelled = False
+    try:
+        for index, account_data in enumerate(accounts):
+            result_data = await load_cached_result(account_data)
+            if result_data is not None:
+                logger.info(f'Результат взят из кэша: task_id: {task_id}')
+                await save_account_result(task_id, account_data, result_data)
+                unresolved.pop(index)
+                continue
+            token = str(uuid.uuid4())
+            if await acquire_parse_lock(account_data, token):
+                locked.append((index, account_data, token))
+            else:
+                delegated.append(index)
+        to_parse, locked = locked, []
+        results = await run_parser_bulk(
+            [account_data for _, account_data, _ in to_parse],
+            [token for _, _, token in to_parse],
+        )
+        await save_bulk_results(task_id, to_parse, results, unresolved)
+        for index in delegated:
+            await process_account(task_id, accounts[index])
+            unresolved.pop(index)
+    except asyncio.CancelledError:
+        logger.warning(
+            f'Обработка пакета отменена: task_id: {task_id}, '
+            f'счетов без результата: {len(unresolved)}',
+        )
+        is_cancelled = True
+        raise
+    except Exception as e:
+        logger.error(
+            f'Ошибка обработки пакета: task_id: {task_id}, '
+            f'ошибка: {str(e)}',
+        )
+        error = e
+    finally:
+        for _, account_data, token in locked:
+            await release_parse_lock(account_data, token)
+            await publish_parse_result(account_data, None)
+        if not is_cancelled:
+            await fail_unresolved_accounts(
+                task_id,
+                list(unresolved.values()),
+                error or ParserError('Пакетная обработка прервана'),
+            )
+            await finish_task_if_complete(task_id)
+
+
+async def process_account(task_id: str, data: dict) -> None:
+    """Парсит один счёт и сохраняет результат или ошибку в задачу."""
+    logger.info(f'Worker выполняет: task_id: {task_id}, data: {data}')
+    try:
+        result_data = await load_cached_result(data)
+        if result_data is not None:
+            logger.info(f'Результат взят из кэша: task_id: {task_id}')
+        else:
+            result_data = await run_parser_single_flight(data)
+        await save_account_result(task_id, data, result_data)
     except Account404 as e:
         await forming_error_response(
             task_id=task_id,
@@ -117,9 +326,18 @@ async def start_parsing(task_id: str, data: dict) -> dict:
             data=data,
             _exception=e,
         )
+
+
+async def start_account_parsing(task_id: str, data: dict) -> None:
+    """Обрабатывает одиночный счёт и проверяет завершение задачи."""
+    try:
+        await process_account(task_id, data)
     finally:
-        if await check_all_task_for_completion(task_id):
-            await change_job_status(task_id, StatusType.COMPLETE.value)
-            logger.info(
-                f'Все подзадачи по task_id={task_id} завершены.',
-            )
+        await finish_task_if_complete(task_id)
+
+
+async def start_parsing(task_id: str, data: dict) -> None:
+    with track_phase(MetricPhase.TASK.value):
+        if data.get('accounts'):
+            return await start_bulk_parsing(task_id, data)
+        return await start_account_parsing(task_id, data)
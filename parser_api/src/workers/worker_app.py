@@ -1,7 +1,14 @@
 import asyncio
+import signal
+
+from prometheus_client import start_http_server
 
 from core.cache_settings import redis_client
 from core.logger_settings import logger
+from core.settings import settings
+from services.enums import WebshareProxy
+from services.parser.browser_pool import browser_pool
+from services.parser.proxy_refresher import ProxyRefresher
 from workers.async_rq_worker.init_worker import AsyncRQWorker
 from workers.tasks import start_parsing
 
@@ -10,7 +17,31 @@ rq_worker = AsyncRQWorker(
         queue_names=['parsing_queue'],
         function=start_parsing,
         logger=logger,
+        concurrency=settings.parser_worker_concurrency,
+        reliable=settings.parser_worker_reliable_queue,
     )
 
+proxy_refresher = ProxyRefresher(
+    proxy_list_name=WebshareProxy.LIST_NAME.value,
+)
+
+
+async def main() -> None:
+    """Запускает воркер, метрики и обновление прокси."""
+    worker_task = asyncio.current_task()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker_task.cancel)
+    if settings.parser_worker_metrics_port:
+        start_http_server(settings.parser_worker_metrics_port)
+    refresher_task = asyncio.create_task(proxy_refresher.run())
+    try:
+        await rq_worker.run()
+    finally:
+        refresher_task.cancel()
+        await asyncio.gather(refresher_task, return_exceptions=True)
+        await browser_pool.close()
+
+
 if __name__ == '__main__':
-    asyncio.run(rq_worker.run())
+    asyncio.run(main())